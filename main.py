@@ -1,14 +1,181 @@
-# Driver code to start the dashboard
+# Driver code to start the dashboard, or to run its pipelines headlessly
+#
+#     python main.py                               # dashboard and JSON API
+#     python main.py ingest saves/ exports/        # import saves and exports
+#     python main.py fit-degradation
+#     python main.py simulate --season 2025
+#     python main.py export --format parquet
 
 # Imports
-import subprocess
+import argparse
+import os
+import sys
+import threading
 
 from loguru import logger
 
+# The utility modules live next to the pages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+
+def serve(args: argparse.Namespace) -> None:
+    from streamlit.web import bootstrap
+
+    from utils.api import serve_api
+    from utils.warmup import start_warmup
+
+    # Everything runs in this process, so the warm-up fills the caches the pages read:
+    # it starts with the server and reports readiness in the log and on /api/health
+    start_warmup()
+
+    # JSON API for other tools, on its own event loop next to the dashboard
+    threading.Thread(target=serve_api, name="json-api", daemon=True).start()
+
+    # The Streamlit server blocks the main thread until it is stopped
+    flag_options: dict[str, int] = {"server.port": 8080}
+    bootstrap.load_config_options(flag_options)
+    bootstrap.run(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "index.py"),
+        False,
+        [],
+        flag_options,
+    )
+
+
+def ingest(args: argparse.Namespace) -> None:
+    from utils.batch import ingest_paths
+
+    summary: dict[str, int] = ingest_paths(args.paths, args.season, args.workers)
+    logger.info(
+        f"{summary['files']} files: {summary['written']} partitions written, "
+        f"{summary['unchanged']} unchanged, {summary['seasons']} seasons refreshed, "
+        f"{summary['failed']} tasks failed."
+    )
+    if summary["failed"]:
+        sys.exit(1)
+
+
+def fit_degradation(args: argparse.Namespace) -> None:
+    from utils.batch import fit_degradation_models
+
+    fit_degradation_models()
+
+
+def simulate(args: argparse.Namespace) -> None:
+    from utils.batch import simulate_schedule
+    from utils.f1_utils import get_schedule
+
+    grands_prix: list[str] = args.grand_prix or list(get_schedule(args.season).keys())
+    results = simulate_schedule(
+        grands_prix,
+        args.workers,
+        n_races=args.races,
+        seed=args.seed,
+        pit_loss=args.pit_loss,
+    )
+    if not results.empty:
+        best = results.sort_values("expected_points", ascending=False).drop_duplicates(
+            "grand_prix"
+        )
+        for row in best.itertuples():
+            logger.info(
+                f"{row.grand_prix}: {row.strategy}, {row.expected_points:.2f} points expected"
+            )
+
+    # Failed Grands Prix are missing from the results
+    simulated: set[str] = set(results.get("grand_prix", []))
+    failed: list[str] = [gp for gp in grands_prix if gp not in simulated]
+    if failed:
+        logger.error(f"{len(failed)} simulations failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+def export(args: argparse.Namespace) -> None:
+    from utils.batch import export_seasons
+
+    summary: dict[str, list[str] | int] = export_seasons(
+        args.season or None, args.out, args.format, args.workers
+    )
+    logger.info(
+        f"Wrote {len(summary['paths'])} files to {args.out}, "
+        f"{summary['failed']} seasons failed."
+    )
+    if summary["failed"]:
+        sys.exit(1)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    from utils.batch import EXPORT_DIR, EXPORT_FORMATS, SIMULATION_DEFAULTS
+
+    parser = argparse.ArgumentParser(description="F1 Manager Data & Strategy Hub")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for batch commands (default: CPU count)",
+    )
+    parser.set_defaults(command=serve)
+    commands = parser.add_subparsers(title="commands")
+
+    commands.add_parser(
+        "serve", help="Start the dashboard and the JSON API"
+    ).set_defaults(command=serve)
+
+    parser_ingest = commands.add_parser(
+        "ingest", help="Import saves and CSV exports, then refresh the derived data"
+    )
+    parser_ingest.add_argument("paths", nargs="+", help="Files or folders")
+    parser_ingest.add_argument(
+        "--season",
+        type=int,
+        action="append",
+        help="Only import this season (repeatable)",
+    )
+    parser_ingest.set_defaults(command=ingest)
+
+    commands.add_parser(
+        "fit-degradation", help="Refit the tyre degradation curves"
+    ).set_defaults(command=fit_degradation)
+
+    parser_simulate = commands.add_parser(
+        "simulate", help="Precompute strategy simulations for a calendar"
+    )
+    parser_simulate.add_argument(
+        "--season", type=int, default=2025, help="Calendar to simulate (default: 2025)"
+    )
+    parser_simulate.add_argument(
+        "--grand-prix", action="append", help="Only this Grand Prix (repeatable)"
+    )
+    parser_simulate.add_argument(
+        "--races", type=int, default=SIMULATION_DEFAULTS["n_races"]
+    )
+    parser_simulate.add_argument(
+        "--seed", type=int, default=SIMULATION_DEFAULTS["seed"]
+    )
+    parser_simulate.add_argument(
+        "--pit-loss", type=float, default=SIMULATION_DEFAULTS["pit_loss"]
+    )
+    parser_simulate.set_defaults(command=simulate)
+
+    parser_export = commands.add_parser(
+        "export", help="Write standings, aggregates and pit stop data to files"
+    )
+    parser_export.add_argument(
+        "--season", type=int, action="append", help="Season to export (repeatable)"
+    )
+    parser_export.add_argument("--out", default=EXPORT_DIR, help="Output folder")
+    parser_export.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser_export.set_defaults(command=export)
+
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    args: argparse.Namespace = parse_args()
     try:
-        subprocess.run(["streamlit", "run", "src/index.py", "--server.port", "8080"])
+        args.command(args)
     except KeyboardInterrupt:
-        logger.warning("Dashboard stopped by user.")
+        logger.warning("Stopped by user.")
     except Exception as e:
-        logger.error(f"Error starting dashboard: {e}")
+        logger.error(f"Error running {args.command.__name__}: {e}")
+        sys.exit(1)
@@ -0,0 +1,171 @@
+"""Measure the cold import cost of the dashboard's modules."""
+
+#
+# Every module is imported in a fresh interpreter, so each figure is a true cold start.
+# Run from the repository root:
+#
+#     python scripts/import_benchmark.py
+#     python scripts/import_benchmark.py --budget 800 --repeat 5
+
+# Imports
+import argparse
+import os
+import subprocess
+import sys
+import statistics
+
+SRC_DIR: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+# Modules a page run can import, from the facades down to the heaviest submodules
+MODULES: list[str] = [
+    "utils",
+    "styles",
+    "components",
+    "utils.paths",
+    "utils.utils",
+    "utils.f1_utils",
+    "utils.ingest",
+    "utils.race_store",
+    "utils.save_extractor",
+    "utils.strategy",
+    "utils.simulator",
+    "utils.degradation",
+    "utils.pit_index",
+    "utils.assets",
+]
+
+# Third-party modules that must stay out of a bare `import utils`
+HEAVY_MODULES: list[str] = ["matplotlib", "PIL", "scipy", "sklearn", "mplsoccer"]
+
+_PROBE: str = """
+import sys, time
+sys.path.insert(0, {src!r})
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+heavy = sorted(name for name in {heavy!r} if name in sys.modules)
+print(elapsed * 1000, len(sys.modules), ",".join(heavy))
+"""
+
+
+def measure(module: str, repeat: int = 3) -> dict:
+    """
+    Cold import time of a module, in a fresh interpreter per run.
+
+    Args:
+        module (str): Dotted module name, importable from `src`.
+        repeat (int, optional): Number of runs; the median is reported. Defaults to 3.
+
+    Returns:
+        (dict): `module`, `ms` (median), `modules` (size of `sys.modules` afterwards) and
+            the `heavy` dependencies that got loaded.
+    """
+    runs: list[float] = []
+    for _ in range(repeat):
+        output: subprocess.CompletedProcess = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                _PROBE.format(src=SRC_DIR, module=module, heavy=HEAVY_MODULES),
+            ],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(SRC_DIR),
+        )
+        if output.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{output.stderr}")
+        ms, modules, heavy = (output.stdout.strip().split(" ") + [""])[:3]
+        runs.append(float(ms))
+
+    return {
+        "module": module,
+        "ms": statistics.median(runs),
+        "modules": int(modules),
+        "heavy": heavy,
+    }
+
+
+def import_time_tree(module: str, top: int = 15) -> list[tuple[int, str]]:
+    """
+    Slowest imports pulled in by a module, from `python -X importtime`.
+
+    Args:
+        module (str): Dotted module name, importable from `src`.
+        top (int, optional): Number of entries to return. Defaults to 15.
+
+    Returns:
+        (list[tuple[int, str]]): Cumulative microseconds and name of each import.
+    """
+    output: subprocess.CompletedProcess = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import sys; sys.path.insert(0, {SRC_DIR!r}); import {module}",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(SRC_DIR),
+    )
+
+    entries: list[tuple[int, str]] = []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        entries.append((int(cumulative), name.strip()))
+
+    return sorted(entries, reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "modules", nargs="*", default=MODULES, help="Modules to measure (default: all)."
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module.")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=None,
+        help="Fail if importing the `utils` facade takes longer than this (ms).",
+    )
+    parser.add_argument(
+        "--tree", metavar="MODULE", help="Also list the slowest imports of a module."
+    )
+    args = parser.parse_args()
+
+    results: list[dict] = [measure(module, args.repeat) for module in args.modules]
+    width: int = max(len(result["module"]) for result in results)
+    print(f"{'module':<{width}}  {'ms':>8}  {'modules':>7}  heavy dependencies")
+    for result in sorted(results, key=lambda result: result["ms"], reverse=True):
+        print(
+            f"{result['module']:<{width}}  {result['ms']:>8.1f}  "
+            f"{result['modules']:>7}  {result['heavy'] or '-'}"
+        )
+
+    if args.tree:
+        print(f"\nSlowest imports of {args.tree}:")
+        for cumulative, name in import_time_tree(args.tree):
+            print(f"{cumulative / 1000:>8.1f} ms  {name}")
+
+    if args.budget is not None:
+        facade: dict = next(
+            (result for result in results if result["module"] == "utils"), None
+        ) or measure("utils", args.repeat)
+        if facade["ms"] > args.budget or facade["heavy"]:
+            print(
+                f"\nOver budget: `import utils` took {facade['ms']:.1f} ms "
+                f"(budget {args.budget:.0f} ms), heavy: {facade['heavy'] or '-'}"
+            )
+            return 1
+        print(f"\nWithin budget: `import utils` took {facade['ms']:.1f} ms.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,7 +20,7 @@ def title_header(
         page_title (str): Page title on the nav bar.
         text_1 (str): The first line of the title.
         text_2 (str, optional): The second line of the title.
-        image_path (str | None): Path to an optional image to display alongside the title. Defaults to None.
+        image_path (str | None): URL of an optional image to display alongside the title, e.g. from `utils.asset_url`. Defaults to None.
         image_width (int): Width of the image in rem if provided. Defaults to 150.
 
     Returns:
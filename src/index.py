@@ -3,12 +3,20 @@
 # Imports
 import streamlit as st
 
-# Set default theme
-if "theme" not in st.session_state:
-    st.session_state.theme = "dark"
-
 # Custom modules
 from components import navigation
+from utils import init_state, get_state, set_state, start_watcher, data_version
+
+# Set default theme and the other shared state keys
+init_state()
+
+# Ingest exports as they land; the watcher reruns open sessions after each import
+start_watcher()
+if get_state("data_version") is not None and data_version() > get_state(
+    "data_version"
+):
+    st.toast("New race data has been imported.", icon=":material/sync:")
+set_state("data_version", data_version())
 
 # Setup navigation
 navigation()
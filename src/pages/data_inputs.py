@@ -1,12 +1,34 @@
 # Inputting relevant F1 data
 
 # Imports
+import pandas as pd
 import streamlit as st
 
 # Custom modules
 from styles import Styles
 from components import title_header
-from utils import get_team_colours, get_schedule
+from utils import (
+    get_team_colours,
+    get_schedule,
+    schedule_frame,
+    validate_schedule,
+    schedule_from_frame,
+    MAX_RACES,
+    init_state,
+    get_state,
+    set_state,
+    list_partitions,
+    load_table,
+    write_session,
+    save_results,
+    load_results,
+    set_input,
+    get_node,
+    recompute_trace,
+)
+
+# Shared session state (see `utils.state`)
+init_state()
 
 # Get colour palette
 styles: Styles = Styles()
@@ -27,165 +49,87 @@ st.html(
 
 # ----------------------------------------------------------------------------------
 
-# Data form
-## Set up column forms
-data_col_1, data_col_2 = st.columns([0.6, 0.4], border=True)
+# Every section below is a fragment: its widgets only rerun that section. Sections
+# talk to each other and to other pages through the shared state keys only.
+
 
 # Column 1: Races
-with data_col_1:
+@st.fragment
+def schedule_section() -> None:
     st.markdown("### Race schedule")
 
     # Allow the user to choose the schedule and retain it in the session storage
-    if "selected_year" not in st.session_state:
-        st.session_state.selected_year = "2024"
+    years: list[str] = ["2024", "2025", "Custom"]
     selected_year: str = st.selectbox(
         label="Schedule year",
-        options=["2024", "2025"],  # , "Custom"],
-        index=["2024", "2025"].index(st.session_state.selected_year),
+        options=years,
+        index=years.index(get_state("selected_year")),
         key="schedule_year",
     )
-    st.session_state.selected_year = selected_year
+    set_state("selected_year", selected_year)
+    is_custom: bool = selected_year == "Custom"
+
+    # Custom calendars start from the latest season until the user saves their own
+    schedule: dict = (
+        (get_state("custom_schedule") or get_schedule(2025))
+        if is_custom
+        else get_schedule(int(selected_year))
+    )
 
     with st.expander(
         f"{selected_year} schedule", expanded=True, icon=":material/event:"
     ):
-        # Layout
-        rows: list = [
-            st.columns([0.7, 0.3], border=True, gap="small") for _ in range(25)
-        ]
-        # Prefilled schedule (assuming that `schedule` is a prefilled dict)
-        if selected_year in ["2024", "2025"]:
-            # Get the schedule
-            schedule: dict = get_schedule(int(selected_year))
-            # Fill in the schedule
-            for i, (gp, is_sprint) in enumerate(schedule.items()):
-                with rows[i][0]:
-                    st.text_input(
-                        label=f"Race {i+1}",
-                        value=gp,
-                        disabled=True,
-                    )
-                with rows[i][1]:
-                    if is_sprint:
-                        st.html("<br />")
-                        st.markdown("- [x] Sprint")
-
-        # Custom schedule (assuming that `schedule` is just a list of grand prixes)
-        # else:
-        #     selected_races: dict = {}  # Structure: grand_prix (str) - is_sprint (bool)
-
-        #     # Initialise it in the app's session storage if it doesn't exist
-        #     if "selected_races" not in st.session_state:
-        #         st.session_state.selected_races = selected_races
-        #     else:
-        #         selected_races = st.session_state.selected_races
-
-        #     # Button to clear custom schedule
-        #     clear_schedule: bool = st.button(
-        #         label="Clear",
-        #         on_click=(lambda: st.session_state.update({"selected_races": {}})),
-        #     )
-        #     if clear_schedule:
-        #         selected_races = {}
-
-        #     # Check if the user has already prefilled a dict of races or not
-        #     if (len(selected_races) == 24) and ("" not in selected_races.keys()):
-        #         for i, (gp, is_sprint) in enumerate(selected_races.items()):
-        #             with rows[i][0]:
-        #                 st.text_input(
-        #                     label=f"Race {i+1}",
-        #                     value=gp,
-        #                 )
-        #             with rows[i][1]:
-        #                 st.checkbox(
-        #                     label="Sprint",
-        #                     value=is_sprint,
-        #                     key=f"custom_sprint_{i}",
-        #                 )
-        #     # If there is no prefilled custom schedule
-        #     else:
-        #         # Get all grand prix locations
-        #         grand_prixes: list[str] = get_schedule(0)
-        #         # Loop through the options
-        #         for i in range(24):
-        #             # Declare empty variables
-        #             single_race: str = ""
-        #             single_sprint: bool = False
-
-        #             # Create empty widgets
-        #             with rows[i][0]:
-        #                 single_race = st.selectbox(
-        #                     label=f"Race {i + 1}",
-        #                     options=[""] + grand_prixes,
-        #                     index=0,
-        #                     placeholder="Select a GP...",
-        #                 )
-        #                 # If there is no race selected
-        #                 if single_race == "":
-        #                     # Display a warning
-        #                     st.warning(
-        #                         f"No race is selected for race {i + 1}! Please choose a race from the dropdown."
-        #                     )
-        #                 # Check if the race is already in the list
-        #                 elif single_race in selected_races.keys():
-        #                     # Check if the race is in the same or different position
-        #                     race_position: int = 0
-        #                     try:
-        #                         race_position = list(selected_races.keys()).index(
-        #                             single_race
-        #                         )
-        #                     except ValueError:
-        #                         race_position = 0
-
-        #                     if i == race_position + 1:
-        #                         # Display a warning
-        #                         st.warning(
-        #                             f"{single_race} GP is already selected for race {race_position + 1}. Please select another race for race {i + 1}!"
-        #                         )
-        #                         # Reset the selectbox
-        #                         single_race = ""
-        #             with rows[i][1]:
-        #                 single_sprint = st.checkbox(
-        #                     label="Sprint",
-        #                     value=single_sprint,
-        #                     key=f"custom_sprint_{i}",
-        #                 )
-
-        #             # Add it to the prefilled list
-        #             if single_race != "":
-        #                 selected_races[single_race] = single_sprint
-
-        #         # Write the custom schedule into the session storage
-        #         st.session_state.selected_races = selected_races
+        # The whole calendar is a single grid, editable for custom schedules only
+        edited: pd.DataFrame = st.data_editor(
+            schedule_frame(schedule),
+            column_config={
+                "round": st.column_config.NumberColumn(
+                    "Round", min_value=1, max_value=MAX_RACES, step=1, required=True
+                ),
+                "grand_prix": st.column_config.SelectboxColumn(
+                    "Grand Prix", options=get_schedule(0), required=True
+                ),
+                "sprint": st.column_config.CheckboxColumn("Sprint", default=False),
+            },
+            disabled=not is_custom,
+            hide_index=True,
+            num_rows="dynamic" if is_custom else "fixed",
+            use_container_width=True,
+            height=(MAX_RACES + 1) * 35 + 3,
+            key=f"schedule_editor_{selected_year}",
+        )
+
+        if is_custom:
+            issues: list[str] = validate_schedule(edited)
+            if issues:
+                st.warning("\n".join(f"- {issue}" for issue in issues))
+            else:
+                set_state("custom_schedule", schedule_from_frame(edited))
+                st.caption(
+                    f"{len(edited)} races, {int(edited['sprint'].sum())} sprint weekends."
+                )
 
 
 # Column 2: Team colours
-with data_col_2:
+@st.fragment
+def team_colours_section() -> None:
     st.markdown("### Team colours")
     team_selections: list = list(get_team_colours("all").keys()) + ["Custom"]
 
-    if "selected_team" not in st.session_state:
-        st.session_state.selected_team = team_selections[0]
     selected_team: str = st.selectbox(
         label="Team",
         options=team_selections,
-        index=team_selections.index(st.session_state.selected_team),
+        index=team_selections.index(get_state("selected_team")),
         key="team_selected",
     )
-    st.session_state.selected_team = selected_team
+    set_state("selected_team", selected_team)
 
-    if "team_colours" not in st.session_state:
-        st.session_state.team_colours = {}
     team_colours: dict = (
         get_team_colours(team=selected_team)
         if selected_team != "Custom"
-        else (
-            st.session_state.team_colours
-            if "team_colours" in st.session_state
-            else {"primary": "#808080", "secondary": "#ffffff"}
-        )
+        else get_state("team_colours")
     )
-    st.session_state.team_colours = team_colours
+    set_state("team_colours", team_colours)
 
     # Layout
     teamcolours_row_1 = st.columns([0.09, 0.91], border=False, gap="small")
@@ -213,7 +157,107 @@ with data_col_2:
         unsafe_allow_html=True,
     )
 
-    # Check to see if it is necessary to save the new team colours
-    temp_colours: dict = {"primary": primary, "secondary": secondary}
-    if temp_colours != team_colours:
-        st.session_state.team_colours = temp_colours
+    # Save the new team colours (only written if they changed)
+    set_state("team_colours", {"primary": primary, "secondary": secondary})
+
+
+# Round results
+def same_results(left: pd.DataFrame, right: pd.DataFrame) -> bool:
+    # Compared as text, the career database and the store type the columns differently
+    if list(left.columns) != list(right.columns):
+        return False
+    left_text, right_text = (
+        frame.astype("string").fillna("").reset_index(drop=True)
+        for frame in (left, right)
+    )
+    return left_text.equals(right_text)
+
+
+@st.fragment
+def round_results_section() -> None:
+    st.markdown("### Race results")
+    sessions: pd.DataFrame = list_partitions("results")
+    sessions = sessions[sessions["session"] == "race"]
+    if sessions.empty:
+        st.info("No race results have been imported yet.", icon=":material/info:")
+        return
+
+    results_col_1, results_col_2 = st.columns([0.25, 0.75])
+    season: int = results_col_1.selectbox(
+        label="Season",
+        options=sorted(sessions["season"].unique())[::-1],
+        key="results_season",
+    )
+    round_no: int = results_col_1.selectbox(
+        label="Round",
+        options=sorted(sessions[sessions["season"] == season]["round"].unique()),
+        key="results_round",
+    )
+
+    # Partition columns live in the store's folder names, not in the editable grid
+    career_id: int = get_state("career_id")
+    results: pd.DataFrame = load_table(
+        "results", season=season, round_no=round_no, session="race"
+    ).drop(columns=["season", "round", "session"], errors="ignore")
+    saved: pd.DataFrame = load_results(career_id, season, round_no, "race").drop(
+        columns=["season", "round", "session"]
+    )
+
+    # The store holds one copy of each round, the career database one per career
+    if saved.empty:
+        save_results(career_id, season, round_no, "race", results)
+    elif not same_results(saved, results):
+        # Another career wrote this round since, put this career's back
+        write_session(saved, "results", season, round_no, "race")
+        set_input("results", season, round_no, saved)
+        results = load_table(
+            "results", season=season, round_no=round_no, session="race"
+        ).drop(columns=["season", "round", "session"], errors="ignore")
+
+    with results_col_2:
+        edited: pd.DataFrame = st.data_editor(
+            results,
+            hide_index=True,
+            use_container_width=True,
+            key=f"results_editor_{season}_{round_no}",
+        )
+
+    # Save the round and recompute only what is derived from it
+    if not pd.util.hash_pandas_object(edited, index=False).equals(
+        pd.util.hash_pandas_object(results, index=False)
+    ):
+        save_results(career_id, season, round_no, "race", edited)
+        write_session(edited, "results", season, round_no, "race")
+        updates: list[dict] = set_input("results", season, round_no, edited)
+        results_col_1.caption(
+            f"Saved. {len(updates)} derived datasets updated in "
+            f"{sum(update['seconds'] for update in updates):.2f}s."
+        )
+    else:
+        # Materialise the round so later edits know what to refresh
+        get_node("aggregates", season, round_no)
+        get_node("points_figure", season)
+
+    with st.expander("Recompute log", icon=":material/account_tree:"):
+        st.dataframe(
+            recompute_trace(limit=50),
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "seconds": st.column_config.NumberColumn("Time (s)", format="%.3f"),
+                "at": st.column_config.DatetimeColumn("At", format="HH:mm:ss"),
+            },
+        )
+
+
+# Data form
+## Set up column forms
+data_col_1, data_col_2 = st.columns([0.6, 0.4], border=True)
+
+with data_col_1:
+    schedule_section()
+
+with data_col_2:
+    team_colours_section()
+
+round_results_section()
@@ -4,7 +4,7 @@ import streamlit as st
 # Custom modules
 from styles import Styles
 from components import title_header
-from utils import display_markdown
+from utils import display_markdown, asset_url
 
 # Get colour palette
 styles: Styles = Styles()
@@ -16,7 +16,7 @@ title_header(
     "F1M Data & Strategy Hub",
     "F1 Manager 24",
     "Data & Strategy Hub",
-    image_path="data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAlUAAACNCAYAAACe9I/ZAAAAxHpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4aWYAAHjabVBBDgMhCLzzij4BQVl4ju1uk/6gzy8Km6xtJ2FA0MkIHO/XE24DVCrUtqmYCDqqVaPuhWKgTy5YJ0+0hpTdpQ+65yPyFnvmOKpELmc/H5y5dK/aVeiRg/s6sJr6+iUUfpCHo1GnEbAUYopBSYEe30Ix3a5fuB+4QiNgUNXV9s958+3tYzlMdHBhdGaWMMAjGnD3ATmPS26YzWtimR1JMV/Ivz2dgA86R1lUYZ8fiQAAAYNpQ0NQSUNDIHByb2ZpbGUAAHicfZE9SMNAHMVfU8UPqg4WEXHIUJ3soiKOtQpFqBBqhVYdTC79giYNSYqLo+BacPBjserg4qyrg6sgCH6AuAtOii5S4v+SQosYD4778e7e4+4dINTLTLM6YoCm22YqERcz2VWx6xUhCOjBEPplZhlzkpSE7/i6R4Cvd1Ge5X/uz9Gn5iwGBETiGDNMm3iDeGbTNjjvE4dZUVaJz4knTLog8SPXFY/fOBdcFnhm2Eyn5onDxGKhjZU2ZkVTI54mjqiaTvlCxmOV8xZnrVxlzXvyF4Zy+soy12mOIoFFLEGCCAVVlFCGjSitOikWUrQf9/GPuH6JXAq5SmDkWEAFGmTXD/4Hv7u18lOTXlIoDnS+OM7HGNC1CzRqjvN97DiNEyD4DFzpLX+lDsx+kl5raZEjYGAbuLhuacoecLkDDD8Zsim7UpCmkM8D72f0TVlg8BboXfN6a+7j9AFIU1fJG+DgEBgvUPa6z7u723v790yzvx8zvXKNIb21EwAADXhpVFh0WE1MOmNvbS5hZG9iZS54bXAAAAAAADw/eHBhY2tldCBiZWdpbj0i77u/IiBpZD0iVzVNME1wQ2VoaUh6cmVTek5UY3prYzlkIj8+Cjx4OnhtcG1ldGEgeG1sbnM6eD0iYWRvYmU6bnM6bWV0YS8iIHg6eG1wdGs9IlhNUCBDb3JlIDQuNC4wLUV4aXYyIj4KIDxyZGY6UkRGIHhtbG5zOnJkZj0iaHR0cDovL3d3dy53My5vcmcvMTk5OS8wMi8yMi1yZGYtc3ludGF4LW5zIyI+CiAgPHJkZjpEZXNjcmlwdGlvbiByZGY6YWJvdXQ9IiIKICAgIHhtbG5zOnhtcE1NPSJodHRwOi8vbnMuYWRvYmUuY29tL3hhcC8xLjAvbW0vIgogICAgeG1sbnM6c3RFdnQ9Imh0dHA6Ly9ucy5hZG9iZS5jb20veGFwLzEuMC9zVHlwZS9SZXNvdXJjZUV2ZW50IyIKICAgIHhtbG5zOmRjPSJodHRwOi8vcHVybC5vcmcvZGMvZWxlbWVudHMvMS4xLyIKICAgIHhtbG5zOkdJTVA9Imh0dHA6Ly93d3cuZ2ltcC5vcmcveG1wLyIKICAgIHhtbG5zOnRpZmY9Imh0dHA6Ly9ucy5hZG9iZS5jb20vdGlmZi8xLjAvIgogICAgeG1sbnM6eG1wPSJodHRwOi8vbnMuYWRvYmUuY29tL3hhcC8xLjAvIgogICB4bXBNTTpEb2N1bWVudElEPSJnaW1wOmRvY2lkOmdpbXA6ZmY5NjQ5OGItZjU1Yi00Zjc1LWI3NmMtZDdjMzE3N2YwZmUyIgogICB4bXBNTTpJbnN0YW5jZUlEPSJ4bXAuaWlkOmQzODg5MTc0LTg2MDAtNDE0Zi1hODVkLWRkYzI5ODBhYjJhZSIKICAgeG1wTU06T3JpZ2luYWxEb2N1bWVudElEPSJ4bXAuZGlkOjljZTAwZDQxLTk2NzMtNDdiNy05MGE5LTEzYTJmMzc4MmVkMiIKICAgZGM6Rm9ybWF0PSJpbWFnZS9wbmciCiAgIEdJTVA6QVBJPSIyLjAiCiAgIEdJTVA6UGxhdGZvcm09IkxpbnV4IgogICBHSU1QOlRpbWVTdGFtcD0iMTc2NDY2NzU2NjUxNjA0NiIKICAgR0lNUDpWZXJzaW9uPSIyLjEwLjM2IgogICB0aWZmOk9yaWVudGF0aW9uPSIxIgogICB4bXA6Q3JlYXRvclRvb2w9IkdJTVAgMi4xMCIKICAgeG1wOk1ldGFkYXRhRGF0ZT0iMjAyNToxMjowMlQxOToyNjowNisxMDowMCIKICAgeG1wOk1vZGlmeURhdGU9IjIwMjU6MTI6MDJUMTk6MjY6MDYrMTA6MDAiPgogICA8eG1wTU06SGlzdG9yeT4KICAgIDxyZGY6U2VxPgogICAgIDxyZGY6bGkKICAgICAgc3RFdnQ6YWN0aW9uPSJzYXZlZCIKICAgICAgc3RFdnQ6Y2hhbmdlZD0iLyIKICAgICAgc3RFdnQ6aW5zdGFuY2VJRD0ieG1wLmlpZDpiNWJkZDViNy1hZjk5LTQ1MzUtOTc5ZC1lYTE2YTdlODVkMzciCiAgICAgIHN0RXZ0OnNvZnR3YXJlQWdlbnQ9IkdpbXAgMi4xMCAoTGludXgpIgogICAgICBzdEV2dDp3aGVuPSIyMDI1LTEyLTAyVDE5OjI2OjA2KzEwOjAwIi8+CiAgICA8L3JkZjpTZXE+CiAgIDwveG1wTU06SGlzdG9yeT4KICA8L3JkZjpEZXNjcmlwdGlvbj4KIDwvcmRmOlJERj4KPC94OnhtcG1ldGE+CiAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAKICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgIAogICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgCiAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAKICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgIAogICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgCiAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAKICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgIAogICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgCiAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAKICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgIAogICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgCiAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAKICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgIAogICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgCiAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAKICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgIAogICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgCiAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAKICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgICAgIAogICAgICAgICAgICAgICAgICAgICAgICAgICAKPD94cGFja2V0IGVuZD0idyI/PrmmclkAAAAGYktHRAD/AP8A/6C9p5MAAAAJcEhZcwAACxMAAAsTAQCanBgAAAAHdElNRQfpDAIJGgbE+aEBAAAX7UlEQVR42u3df/xfc6HA8dd75sMY8zsyc0RUMvSD/IqWuJfRplEJt5Akoptl8jsq+VnkV3TJrySKoW7qDpe4Fkpc7kJ9GjXZyJYZZ7Zz/zjnm6/5fL/7fD8/zzmf1/Px2GPs+/1u57zP+XzO63N+BiQVSrXCSGAM8BZgTWANYC1gdWAlYBQwElgx+33l7EdHAMtl/z3KkVQLTQd2iWLmLrGubgTcCaxb8PlbCEyKYqa6qDWY4BBIuQyn4cAmwFhgM2BjIMp+re4IyaAyqGRUSaodUWsC2wE7AtsDmwPLOjLKuTuBCQaVZFRJ3Q6pzYC9gIlZRElFcgcwPop52aCSjCqpGyG1HnAQsD/wNkdEBpVBJaNKUv0hFYDdgEOz34c5KiqwW4BPGFSSUSV1OqY+CpwEbOGIqCRBNSmKiQ0qyaiSOhVUuwKnG1MyqAwqGVWSGouptwHnAns6GiqRa4FPRzELSxpUMbC3QSWjSspHTA0HjgOO5fUbbEplCaoDophFJQ2qBaQn3U9zUcuokrofVJsCPwDe62jIoDKo1Lu8CklqPKZCtcLRwIMGlUroYmA/g0qqn3uqpMaCalXgCjx3SuUNqsOimMSgkowqqZ1BtSVwA968U+V0IXC4QSUZVVK7g2o/4DI8GV3l9K0oZkqN9d6gkowqqWUxFYBTgBMcDRlUBpVkVEmNBdUI4HLg446GSurrUczxBpVkVEntDKrVgFuBbRwNldSxUczpBpVkVEntDKrRwH8CmzoaMqgMKsmokhoLqk2A24ExjoZK6ugo5myDSjKqpHYG1fuBnwFrOBoqqcOimItqrPvvyj5MGFSSUSU1HVRbZxuVlR0N9VhQbQZMK8GHCYNKXeNjaqTXNyrjDCqV2GLgYINKah/3VEmvB9WtwAhHQyUNqgOimGsMKql93FMlg6rCnsBtBpUMKoNKaoZ7qmRQpc/xW9bRUAktBPaNYm4wqCSjSjKopMaDalIUM9WgkowqyaCSDCqDSkaVZFBJXYuNCVHM7QaVZFRJBpXU4tgoUVDNA3aNYv7HxS2jSjKoOuE14K/AX4BngReyX3OB+cA/gFey/+7zMhAv8ffMJz2UpGJ4IYqZWfKg2iWKud9FLaNK6l5QfQz4YQmDahHwO2A68L/AY8AMYFYUk7jkZVBJRpXUyo3Kp4ArKc992f4ETCV9PuGvo/gNe5skg0oyqiSDahDzgeuA70cx97lkZVBJRpVkUA3NC8D5wHlRzAtdGsdRvlfk0uIoZp5BJeXHcIdABlUuvQZ8FzglinlxiPO+CvB2YHT2a11gtezXqsAqwPLAisDIJd4HRrn2FMZhUOqHIxtUKhw/fcqgyp/7gc9EMY/XGVDbA9sCWwGbAmu7FpQ/qKLYoJKMKsmgGshC4Hjg7Chm0SDzuDqwL7BXFlTucTaoDCrJqJIMqszTwD6D3dCwWuHdwBRgb6DiEjeoDCrJqJLaEVQHA5cUNKimZUH1/ADztgFwNjDRJW1QGVSSUSW1M6g+D1xY0Mm/BDgiit981/JqheGke6aOIz2xXAaVQSUZVZJBVcPkKOasAeZrI+BqYGuXskFlUElGlWRQ1bYQODCKuXqA+RqfBZW3N5BBJRXIMIdABlVHLQD2GCSojiV9BI1BJYNKKhj3VMmg6uxGZHwUc3eNeVomm6dDXMIyqCSjSjKoBjYH2D2KmV5jnirAj4E9XcIyqCSjSjKoBg+qcVHMIzXmaQXgVuBDLmEZVFKxeU6VihJUXyloUP0F2HGAoBqVbSgNKhlUUgm4p0pFCKopwDcLGlQ7RTFPDhBUt5M+r08yqKQScE+VDKr2eAr4oEElg4o5pHtrDSqVnnuqZFC1J6h2imKeMahkUNU+n1AqI/dUyaBqrUezT+UGlQwqg0o9xj1VMqhaG1TjopjZBpUMKoNKvcc9VTKoWmO6QSWDyqBSb3NPlfIUVMcC3yhoUO0Sxcw1qGRQGVTqXe6pUl6C6vSCBtWdBpUMKoNKAvdUKT9BdUwBJ/0O0mf5vWxQyaAyqCT3VMmgasxtBpUMKoNK6s89VTKohu4WYFIUExtUMqgMKqmPe6pkUA3NdQaVDCqDSqrFPVUyqOp3LXBAFLPIoJJBZVBJS3JPlQyq+lxqUMmgMqikwbinSp2KqQCcCXy5gJN/cbahTAwqGVSNB1W1wsrAK7UOn0tGlVR/UF0IHFrAyT8bmFzCoHqJ9LE6M4FngFnAAmA+MA9Y3O9758Kb519vMi+KecigesO8jwE+C+wObApUsi89D9wF/Ai4sdYeYMmoksoVVN+KYqYMMF9FDKpfk55ofzfwqBuyjqz/PRlU2ev+K8ApwPAsoO4CngVGAO/IQms94LfAJ6OYGa4xMqqkcgbViVHMqSUJqluA46OY37tWGlQdCqq+1/3twBdrBVO1wnDgQNLTAhYBO9fa0ycZVXKDUuygOjaKOb0EQfU34OAo5lbXSIOqE0GVzfvRWShdBhxCujeq/0VRrwF/jeL0EHM2VncCrwJjo5g5rkEyqqRyBNWRUcx5JQiqu4F9ophnXSMNqg4G1RhgBvAQsFMUs7Ba4UVg1BLfOhf4DnByFJNUK+wM/BK4OIr5vGuRispbKsiget1hJQmq60gPpRhUBlXHgipzMLA86SG/hUt87aukV/9eCCwHnAjsDxDF/Ar4KXBQdoWgZFTJoCpoUC0GPlPrUvgCBtWlwH5esm5QNeEvwAcbvG3CHsDDUcyDNb52URRzThTzBeBr2Z9tv8S6uyyws2uTjCr1+gZlGeD7BQ2qA6KYK0oQVOcAn/OqPoOqyaDaKYp5vMGf35T0Kr+leSn7fUG/P7sn+32sa5SKarhDoBYF1ZXAvgWb9IWkl3LfWIKgGvD2DzKohhhUTzY4DqNI9zT9bYBv2b1aYT7piet9T1X4Td8Xo5h/VCu8DLzFtUpGlQyq4gXVpChmqkElg6q5oMr07XUaOcDXr17i/y8nPf+vbywD6flYL7lmqag8/KdeDKoFwB4GlQyqlgUV2Xl8s4GNB/iWPYAPAU9n/39hFPNav6+/PdsmeYGFjCoZVAUKqvFRzC8MKhlUrQmqfu4Adq5WGFHja/dEMXcC38j+//glvj6+398hGVUyqHJuHrBLFDPNoJJB1fKggvRw3ijgqEG+53LSvVEfrVbYMhvTFYDJwJOkj62RjCoZVAUIqnsMKhlUbQkqgJuA+4CTqxW2zv7sNuBm0vMYiWJeBY7O/mzb7HsuA9YGTqj18HKpKLyjunohqOYAuw70XDGDSgZVS8dpA2B6tn3ZO4oHPpxXrbAc6b3tDgR+EMV82jVNRpV6YYNSAX4ETChgUA14Z2iDSgZV28brNtLbJ1xLemPPe/pOTK9WWAf4KDAFWD/7sPZZb1oro0q9ElQ3kF69U7QNyEcGupGhQSWDqq3jtipwGnAQ6WNpFpNeHTgSWLHv24ATo5irXNNkVKlXNiqTeP3KnKJIgK8PtgGpVjgU+EAB5uWRKOZs18SurPvLkl6ttmbBZ2Wpr4c2juFKwIeBzUhv7LmA9ET1u4CHopjFrmmSJEmSJEmSJEmSJEmSJEmSJEmSJEmSJEmSJEmSJEmSJEmSJEmSJEmSJEmSJEmSJEmSJEmSJEmSJEmSJEmSJEmSJEkqqFCUCU2SZHXgHcCawCvATGBGCGFRjqZxGLAxsD4wApgD/CGE8FyXpmc0sBGwSof+ybYtlyRJKtnyXxeoAM8Bj4cQXuzwmE5o4McWhhBua9P0RNkyHtmhIXgZ+DPwRAhhcYvnZXngncBbgWUL9l46N4RwRwPzvD6wIbByAbcf94cQZg1xflcA3gWsDQwv4Dy/mr3HPRZCSJr5i6oVRgEfKtC8LwBmATOimFfzOIHVCsOBTfttJ+rxAvBEFDOrFdOQ66hKkmQkcAhwALB5jW+ZB9wEnBdCeLCL07klcAQwAVi1xrc8CvwA+F4IYV6bp2Ud4DDgU8AGXRqSecAt2XKZ3uT87AR8AdgNWGHJLwPTgf8ArgghxB1Y1o28kc4NIazSwmkYAxwF7A2M7tIyfgH4CXBuCOGxJuYlAP+aLeMPA8sV9APqwyGELeqc53WBLwKfAMYU+EP5xBDCTXV+2JyUvZd/sIDBXMtfgW8D54cQXmkwALYAflvQsLwbuBr4YRQTd3uCqhXeB3wJ2LOJD5gzgKuAC6KYhj+s5zaqkiTZC7gg+0RTj6uAI0IIczs4jStlL6wD6/yR2cDhIYTr2zAtATgSOLWDey3qcU22XP4+xPlZG7gUGF/nj/wROLiRvQVFiaokSZYBTgCOHcKnsLa/DICLgckhhPlDnJ8NgMuBHUuwkV1qVGVxMRk4iXRPdtEtNaqSJBmbLeP3UE6/AcY3cjSiwFHV30zg36OYG7sUUyOB7wxhG1yPvwNHRjFXlSaqkiT5WrbxGKongJ1DCDM7MI2jgdtJD1cM1bdCCFNaOC0V4Erg4zl94T0J/EsI4ak652cz4BfAOkP8dxYDXwwhXFC2qMoOm/wU2CWvUQF8JIQwu8752QGYSucOTXc1qrLX6HXAxBIFxaBRlSTJeOD6kgTk0sLqg0PdY1WSqOpzGfCFTu61qlZYM9tObNmmf+I7wJeimCG95w/LYVCd3mBQAbwdmJYkyWodCKo7GwwqgGOSJDmxhUF1Q46DCtJzfn6ZJMkadcxPBPxXA0HVtz5/N0mSKZRIFlS35jioID08/6vskP3S5mfzbH5WoQdke5GvLVlQLW2edyQ9PDyiB2b3/cDh9LaDgZ9UK53Zg54F1bQ2BhWkR35OaWQjlLegOqbJv2bDrJrbHVQbNvlXnZydL9SKoNqjAC+6DUjPfRpsfoZlG581m/y3vlmWsOoXVEU4oXUs6eHwweZn+Wzvxcr0jiOBj/VQUK1Guldu2V5axlk897LdSU/Z6VRQvbsD83RCtTK0995hOXohtiKo+kxMkuTDOQ4qSA+9nt/oC7FgQdVnjyRJdh3k6wcA27To3yp8WBUsqPoclF24MVhgbNxDgbEGcHKPbVxPpP5zYctiNLAJOrhaad8HiA4HVZ9zq5X6T5XKRVS1OKj6fDnHQdXn3cBHeiSo+kzu1DIrclgVNKj6HD3APC2TRVUvOQgY1UMRuTLw2R4NivVtKgDOacdhwC4FFaSnNtS9k2ZYDl6E7QgqgF2TJBnVomlsR1D12aeHggpgXK1z3pIk2aRNL5bChVXBgwpgQraeLml7GjtXrsj26bH5rXXrk17xsj0FpLcJ+WRJgqrPXoWIqjYGVd+8bZXzoALYtoeCCtLDnrUO8W3Xxn+zMGFVgqAi26iOrfHn29BDsmW5Bb1lO3rXE/bUP+1XoqAC+EC939i1O9q2Oaj6bAj8MsdBBfC2DgXV49Cyy12Hk15p2egu3lo3JW33rvNvJklCCOH0EgfV74GkRZOzXLaMl2liGT/QyLo+yF6Ap0hvm5FHM2r82VrAIyXecNa6J+Bi0ttrFMm6wBpN/h33hhCeHeLPLMj5WDUzLjtUKyzX7J3XWxhUf8t+f0uDP1/3TXq7ElUdCiqA5XMeVH0br3YHVUvvi5VN0xjg1zR2R+9a610nzjvJbVi1IKgOCyFc1OJpehdwb4PLZsUaf9ZohN8H7NbpRxI1K4RQpcf2VIUQCnXOXJIkW5Peb7BZQ770PoqZkef1o1phGOl5rmc0uF3bJPug1+2gehQYR/rYuNOAr7Zom1XTsC6sxJ0KqmamsVNBVc+05C6osjfPmaR3Si6a3B0KzGNQZcv4MeDHORiic4sWVCpUUDV7e4+zQgi3l218opjFUcyZ2YeaRjR8/mSrgyqKmZ3dxPM0oK3PCx7W4ZXYoBq6C/MWVP28UND3i9yEVXZLjevzFlT9zM/BMM1GymdQXQx8peTD9VSDP9fQjV/bEVT9QnEB8FIposqgamh69iG9JDuPQVV0eQmrw0lvmpfHoJIMqsGD6rAQQlLWsapWWIkGbvuTeT5PQdUpwzu0EhtUQ5+eCnBWgz9+C3BdkiTtPl6/bgnCqmvnWGX39Dm1wR+/BLivA8t4zZy+XjciXw8OXxBCmLHENI6gODeEnBtC+FMJl8uSRpM+5L0QQZXd72kDuvO4nw2A42j85O4/91pQdSSqDKqG7Qms1+DP7kGxb7vQK2G1P42foP+57FevugzYMUfT8zBvPul4E4rzwNybgQklXC7t0NagqlYYAfwbsC/ppfxFfNzPrChmZq8FFbT58F+LgmoBcFMBguoO4NkWTlrPPCusST+j+cvsu3UocKKLTzKo+sXFx0jPYboI2IHiPj/xll4MqrZGVQuDajxwVwGCajw0d0+OJWyF6vFj0mcGFjGstnbxSQZVtUKoVjiL9ErvdUoyVj0XVG2LqlYGVQhhWhGCKoTQ6kcUjEF1CSFcU7Swyh6hNNKlJ/V2UGXOoPXPPu2WqVG89MPeZQyqtkSVQdUyw9FQw2ovYGFBwmoVl5pkUFUrTGCAh5AX0DzqeGh6WYOq5VFlUKnLYXUzMKkgYRVcYlLPB1UFOK8kY7UY2C+KqS5lnlckfXxc6YKqpVFlUCknYTW1QGElqUeDKvMpGr/KO08WAvtHcV0nqF8AbF7GoIIWHWIyqJS3sEqSZBLpSZ/NXD2T+4cwSypsUAF8sgRj9TSwbxRzz9K+sVrhnaTnvzZrJnBmtbGnia7QyM9UK1zRkagyqGRYSTKohiZ7YPF2BR6nF0kPXZ4RxXU/zurjtObUh906PK/Lkt47rL1RZVDlTkJ6omCnLAcsb1h11GLgHx3890YAlRwu3peAue1YbWj+btvNWkSbn09Ww/wcLM9mHnTbqveiy+jco2fWobG9Jn1eBV7p4DKaS3ovxt+TnhN1S/YsvaEYW/YibziqihBUpI8k6JWgApgZQog6VnBJchRwbp4HpNVhlQOPhBC26OAy/jZ1XM3TheU6vk3zuwrw9y7P3j0hhJ3oLTuEEH7XxHJr1dVkY7OontuBeW7mCuAjgIuiuKkQ7YZRZV+RhzW4AhchqCC974eH/HpcK09edzSlXL7GZwPjSE9gbsZWwO3ZfeTardEPeY9FMd8tYFABzDKqihtUrWBQGVatkLgEJMOqRWYXeDH9t1GVj6DqRpEbVIZVq7zo6DflHSX9twYyOkkS72NmWJXR9XTm0GrX1H1OVZf3UP3ZoFKrwqpF51gNxdOOfFNOSpLkmRZsKJfmraT30Om2DYHzkiS5MHvPzKvn8vgeGUKYnSTJOJo/x6ovrHYJIeQpBJavVogK8Lp9Lop5w/oRxbxYrTAZ+F5PR1UODvk9ZFCpwGH1kKMONH7V4toM4an3XVLrar1mDtMcnv3Ks4nATTl9jZc5rLYG/lSA13vN9SOKuTSLwq+W8U1uqYf/8nAOVQjhGeARg0qtDCs6dyjw5444AI/32LzNovu3Kujl17iHAnMqijkOmAA8UbZ5G573oOrncuAcg0qtDKsO7LF6GviVo/3P11hZTauxfi1OkuROYHcXfffCquSHAoscVjdXK0wF3gO8F1iLFj3lZSmmkN7XbCheBeq6T+HwggQVwKXZYKxlUKlAYXVaCGGRIw0hhMeTJHkAeF/JZm0uAx+evNKoMqw0YFglwIPZr46oVjiqgah6JYo5uZ5vHFaQoCKE8BLtuQmhQeWbbrsOBT4AfN8RfoNTSzhP52TvT7X8BPg/F3v3wwoPBaoDhhUhqPq9MK4j3WNlUCnvYTUH+IR7qWqO809LNEuPAWcOMr+vAYeQPl5IhpV6KaoKcmPPz5Pe66JZPzeoNEBYvdrkX/U8sHsI4SlHtabP0JkLT9ptDjAxhLBgKevV3cBRLnbDSj0UVUW5U3r2yX9f4GtNfPo7B9jToNIAYTWOxu8t9TCwTQhhuqM54BjPzcb47gLPxh+BHUMIf6hzns8HDqU7d/SXYaVORlXRHj0TQlgUQjiJ9H4dQ7mi6F5guxDCl7Pd8lKt9ete0hNaz6D+S+KfByYD7w8hPOEoLnWM52QbtmOBeQWa9IWkNwh9TwjhsSHO8yXAB4D7XAMMK5U0qor8LL8QwgMhhHHA5sA3smjq/0iQecD9pOc8vC+EsF22wZSWtm7NCyEcA6xHek7MjUCV15/j9xrpPVauId1zul4I4awQgnsi6h/j10IIpwPrk97o8hfAczmc1LnAPcAJwIYhhMMbvforhPBQCGFbYCfgItJzslxnDCuVxP8Dh8+bVAOzNtoAAAAASUVORK5CYII=",
+    image_path=asset_url("logos/F1_Manager_2024_Logo.png"),
     image_width=25,
     image_height=6,
 )
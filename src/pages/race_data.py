@@ -7,7 +7,19 @@ import streamlit as st
 # Custom modules
 from styles import Styles
 from components import title_header
-from utils import get_team_colours, get_schedule
+from utils import (
+    get_schedule,
+    plotly_config,
+    load_pit_index,
+    pit_index_seasons,
+    BENCHMARK,
+    get_state,
+    list_partitions,
+    load_table,
+    table_version,
+    pit_index_version,
+    plotly_chart_cached,
+)
 
 # Get colour palette
 styles: Styles = Styles()
@@ -27,3 +39,110 @@ st.html(
 )
 
 # ----------------------------------------------------------------------------------
+
+# Pit stops: a team against the 10 fastest stops of every round
+st.markdown("### Pit stops")
+pit_seasons: list[int] = pit_index_seasons()
+
+if not pit_seasons:
+    st.info("No pit stop data has been imported yet.", icon=":material/info:")
+else:
+    pit_col_1, pit_col_2 = st.columns([0.25, 0.75], border=True)
+
+    with pit_col_1:
+        pit_season: int = st.selectbox(
+            label="Season", options=pit_seasons[::-1], key="pit_season"
+        )
+        pit_index: pd.DataFrame = load_pit_index(pit_season)
+        season_index: pd.DataFrame = load_pit_index(pit_season, scope="season")
+
+        pit_teams: list[str] = sorted(
+            team for team in pit_index["team"].unique() if team != BENCHMARK
+        )
+        pit_team: str = st.selectbox(
+            label="Team",
+            options=pit_teams,
+            index=(
+                pit_teams.index(get_state("selected_team"))
+                if get_state("selected_team") in pit_teams
+                else 0
+            ),
+            key="pit_team",
+        )
+        st.dataframe(
+            season_index[season_index["team"].isin([pit_team, BENCHMARK])][
+                ["team", "stops", "median", "p10", "p90"]
+            ],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "team": "Season to date",
+                "stops": "Stops",
+                "median": st.column_config.NumberColumn("Median (s)", format="%.2f"),
+                "p10": st.column_config.NumberColumn("P10 (s)", format="%.2f"),
+                "p90": st.column_config.NumberColumn("P90 (s)", format="%.2f"),
+            },
+        )
+
+    with pit_col_2:
+        # P10-P90 band, median and rolling form of the team against the benchmark
+        plotly_chart_cached(
+            "pit_stops",
+            pit_index_version(pit_season),
+            {"season": pit_season, "team": pit_team},
+            palette,
+            config=plotly_config(),
+        )
+
+# ----------------------------------------------------------------------------------
+
+# Lap times: every driver's laps over the selected rounds, downsampled for the browser
+st.markdown("### Lap times")
+lap_sessions: pd.DataFrame = list_partitions("laps")
+lap_sessions = lap_sessions[lap_sessions["session"] == "race"]
+
+if lap_sessions.empty:
+    st.info("No lap time data has been imported yet.", icon=":material/info:")
+else:
+    lap_col_1, lap_col_2 = st.columns([0.25, 0.75], border=True)
+
+    with lap_col_1:
+        lap_season: int = st.selectbox(
+            label="Season",
+            options=sorted(lap_sessions["season"].unique())[::-1],
+            key="lap_season",
+        )
+        lap_rounds: list[int] = st.multiselect(
+            label="Rounds",
+            options=sorted(
+                lap_sessions[lap_sessions["season"] == lap_season]["round"].unique()
+            ),
+            placeholder="All rounds",
+            key="lap_rounds",
+        )
+        laps: pd.DataFrame = load_table(
+            "laps",
+            columns=["round", "driver", "lap", "lap_time"],
+            season=lap_season,
+            round_no=lap_rounds or None,
+            session="race",
+        )
+        lap_drivers: list[str] = st.multiselect(
+            label="Drivers",
+            options=sorted(laps["driver"].astype(str).unique()),
+            placeholder="All drivers",
+            key="lap_drivers",
+        )
+        if lap_drivers:
+            laps = laps[laps["driver"].astype(str).isin(lap_drivers)]
+        st.caption(f"{len(laps):,} laps")
+
+    with lap_col_2:
+        # Rounds sit side by side on a fractional round axis, whatever their length
+        plotly_chart_cached(
+            "lap_times",
+            table_version("laps"),
+            {"season": lap_season, "rounds": lap_rounds, "drivers": lap_drivers},
+            palette,
+            config=plotly_config(),
+        )
@@ -7,7 +7,16 @@ import streamlit as st
 # Custom modules
 from styles import Styles
 from components import title_header
-from utils import get_team_colours, get_schedule
+from utils import (
+    get_team_colours,
+    get_race_laps,
+    get_degradation,
+    solve_strategies,
+    parse_strategy,
+    simulate_races_cached,
+    DEFAULT_COMPOUNDS,
+    active_schedule,
+)
 
 # Get colour palette
 styles: Styles = Styles()
@@ -27,3 +36,162 @@ st.html(
 )
 
 # ----------------------------------------------------------------------------------
+
+# Strategy planner
+strategy_col_1, strategy_col_2 = st.columns([0.35, 0.65], border=True)
+
+# Column 1: Race and tyre inputs
+with strategy_col_1:
+    st.markdown("### Race inputs")
+
+    # Races of the schedule chosen on the Data Input page
+    grand_prix: str = st.selectbox(
+        label="Grand Prix",
+        options=list(active_schedule().keys()),
+        key="strategy_gp",
+    )
+    race_laps: int = st.number_input(
+        label="Race laps",
+        min_value=5,
+        max_value=100,
+        value=get_race_laps(grand_prix),
+        step=1,
+        key=f"race_laps_{grand_prix}",
+    )
+    pit_loss: float = st.number_input(
+        label="Pit lane loss (s)", min_value=0.0, max_value=60.0, value=21.0, step=0.5
+    )
+    fuel_effect: float = st.number_input(
+        label="Fuel effect (s/lap)",
+        min_value=0.0,
+        max_value=0.2,
+        value=0.06,
+        step=0.01,
+    )
+    max_stops: int = st.slider(label="Maximum stops", min_value=1, max_value=4, value=3)
+    min_stint: int = st.slider(
+        label="Shortest stint (laps)", min_value=1, max_value=20, value=5
+    )
+
+    # Fitted degradation of this track if the career has data for it
+    st.markdown("### Tyre compounds")
+    fitted: dict = get_degradation(grand_prix)
+    if fitted:
+        st.caption(
+            "Fitted compounds use the pace and degradation of your imported laps, "
+            "the others keep their defaults."
+        )
+    # Compounds without a fitted curve keep their defaults
+    compounds: pd.DataFrame = st.data_editor(
+        pd.DataFrame({**DEFAULT_COMPOUNDS, **fitted})
+        .T.rename_axis("compound")
+        .reset_index()
+        .assign(fitted=lambda df: df["compound"].isin(list(fitted))),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "compound": st.column_config.TextColumn("Compound", disabled=True),
+            "pace": st.column_config.NumberColumn("Base pace (s)", format="%.3f"),
+            "degradation": st.column_config.NumberColumn(
+                "Degradation (s/lap)", format="%.3f"
+            ),
+            "fitted": st.column_config.CheckboxColumn("Fitted", disabled=True),
+        },
+        key=f"strategy_compounds_{grand_prix}",
+    )
+    tyres: dict[str, dict[str, float]] = (
+        compounds.drop(columns="fitted").set_index("compound").to_dict(orient="index")
+    )
+
+# Column 2: Best strategies
+with strategy_col_2:
+    st.markdown("### Fastest strategies")
+
+    strategies: pd.DataFrame = solve_strategies(
+        race_laps=race_laps,
+        pit_loss=pit_loss,
+        compounds=tyres,
+        max_stops=max_stops,
+        min_stint=min_stint,
+        fuel_effect=fuel_effect,
+        top_k=100,
+    )
+    st.dataframe(
+        strategies.head(10),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "stops": "Stops",
+            "compounds": "Compounds",
+            "stints": "Stints (laps)",
+            "total_time": st.column_config.NumberColumn("Race time (s)", format="%.3f"),
+            "gap": st.column_config.NumberColumn("Gap (s)", format="+%.3f"),
+        },
+    )
+
+# Race simulation
+st.markdown("### Race simulation")
+sim_col_1, sim_col_2 = st.columns([0.35, 0.65], border=True)
+
+# Column 1: Simulation inputs
+with sim_col_1:
+    n_races: int = st.select_slider(
+        label="Simulated races",
+        options=[10_000, 25_000, 50_000, 100_000],
+        value=50_000,
+    )
+    seed: int = st.number_input(label="Seed", min_value=0, value=2024, step=1)
+    n_strategies: int = st.slider(
+        label="Strategies to compare", min_value=2, max_value=6, value=4
+    )
+
+# Column 2: Win and points odds of the fastest strategy per compound sequence
+with sim_col_2:
+    candidates: pd.DataFrame = strategies.drop_duplicates("compounds").head(
+        n_strategies
+    )
+    if candidates.empty:
+        st.info(
+            "No strategy fits this race. Please allow more laps or shorter stints.",
+            icon=":material/info:",
+        )
+    else:
+        simulation: pd.DataFrame = simulate_races_cached(
+            strategies=[
+                parse_strategy(row.compounds, row.stints)
+                for row in candidates.itertuples()
+            ],
+            compounds=tyres,
+            grand_prix=grand_prix,
+            pit_loss=pit_loss,
+            n_races=n_races,
+            seed=seed,
+        )
+        st.dataframe(
+            simulation[
+                [
+                    "strategy",
+                    "win",
+                    "podium",
+                    "points_finish",
+                    "expected_points",
+                    "mean_position",
+                ]
+            ],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "strategy": "Strategy",
+                "win": st.column_config.ProgressColumn("Win", format="percent"),
+                "podium": st.column_config.ProgressColumn("Podium", format="percent"),
+                "points_finish": st.column_config.ProgressColumn(
+                    "Points", format="percent"
+                ),
+                "expected_points": st.column_config.NumberColumn(
+                    "Exp. points", format="%.2f"
+                ),
+                "mean_position": st.column_config.NumberColumn(
+                    "Avg. position", format="%.2f"
+                ),
+            },
+        )
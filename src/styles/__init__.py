@@ -1 +1 @@
-from .styles import Styles
+from .styles import Styles, PALETTES
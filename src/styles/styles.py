@@ -1,8 +1,98 @@
 # CSS-imitated code for styling the Streamlit app
 
 # Import necessary libraries
+import hashlib
+import json
+import re
+import threading
+
 import streamlit as st
 
+# Colour palettes of every theme
+PALETTES: dict[str, dict[str, str]] = {
+    "dark": {
+        "bg-color": "#15151e",
+        "secondary-bg": "#1a1a1a",
+        "text-color": "#ffffff",
+        "primary-color": "#a8e6cf",
+        "secondary-color": "#ffd3b6",
+        "third-color": "#ff8b94",
+        "title-color": "#ffffff",
+        "border-color": "#e10600",
+        "line-color": "#c6ced5",
+    },
+    "light": {
+        "bg-color": "#f7f4f1",
+        "secondary-bg": "#ffffff",
+        "text-color": "#15151e",
+        "primary-color": "#0b7a5c",
+        "secondary-color": "#d9822b",
+        "third-color": "#c0392b",
+        "title-color": "#15151e",
+        "border-color": "#e10600",
+        "line-color": "#38383f",
+    },
+    "tokyo": {
+        "bg-color": "#1a1b26",
+        "secondary-bg": "#24283b",
+        "text-color": "#c0caf5",
+        "primary-color": "#7aa2f7",
+        "secondary-color": "#bb9af7",
+        "third-color": "#f7768e",
+        "title-color": "#c0caf5",
+        "border-color": "#ff007c",
+        "line-color": "#565f89",
+    },
+}
+
+# Compiled CSS bundles, keyed by the hash of their palette
+_bundles: dict[str, str] = {}
+_bundles_lock: threading.Lock = threading.Lock()
+
+
+# Quoted strings and url(...) values, kept verbatim, and comments, dropped
+_CSS_LITERALS: re.Pattern = re.compile(
+    r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|url\([^)]*\))|/\*.*?\*/""",
+    flags=re.DOTALL,
+)
+
+
+def _minify_code(css: str) -> str:
+    # Whitespace around braces, semicolons, commas and child combinators never matters.
+    # Before a colon it does in selectors (`div :hover` is not `div:hover`), so only
+    # the space after it is dropped.
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    return re.sub(r":\s+", ":", css)
+
+
+def minify_css(css: str) -> str:
+    """
+    Strip comments and redundant whitespace from a stylesheet. Quoted strings and
+    `url(...)` values are left untouched.
+
+    Args:
+        css (str): Stylesheet.
+
+    Returns:
+        (str): Minified stylesheet.
+    """
+    parts: list[str] = []
+    code: str = ""
+    position: int = 0
+    for match in _CSS_LITERALS.finditer(css):
+        code += css[position : match.start()]
+        position = match.end()
+        if match.group(1) is None:
+            # A comment separates tokens like whitespace does
+            code += " "
+            continue
+        parts += [_minify_code(code), match.group(1)]
+        code = ""
+    parts.append(_minify_code(code + css[position:]))
+
+    return "".join(parts).replace(";}", "}").strip()
+
 
 # Class to manage the CSS styles
 class Styles:
@@ -21,10 +111,42 @@ class Styles:
         Returns:
             st.html: CSS styles as a string.
         """
-        return st.html(
-            f"""
-        <style>
-        
+        return st.html(f"<style>{self.compile_css(style_dict)}</style>")
+
+    # Build the CSS bundle of a palette once and reuse it on every rerun
+    def compile_css(self, style_dict: dict) -> str:
+        """
+        Get the minified CSS bundle of a colour palette, compiling it on first use.
+
+        Args:
+            style_dict (dict): Dictionary with colour palette.
+        Returns:
+            (str): Minified stylesheet, identical for identical palettes.
+        """
+        key: str = hashlib.blake2b(
+            json.dumps(style_dict, sort_keys=True).encode(), digest_size=16
+        ).hexdigest()
+
+        with _bundles_lock:
+            bundle: str | None = _bundles.get(key)
+        if bundle is None:
+            bundle = minify_css(self.build_css(style_dict))
+            with _bundles_lock:
+                _bundles[key] = bundle
+
+        return bundle
+
+    # Assemble the full stylesheet from the individual style blocks
+    def build_css(self, style_dict: dict) -> str:
+        """
+        Assemble the (unminified) stylesheet for a colour palette.
+
+        Args:
+            style_dict (dict): Dictionary with colour palette.
+        Returns:
+            (str): Stylesheet.
+        """
+        return f"""
         /* Import custom font */
         {self.custom_font()}
 
@@ -116,46 +238,43 @@ class Styles:
             widget_label_text=style_dict["text-color"],
             widget_help=style_dict["text-color"]
         )}
+        """
 
-        </style>
-        """,
-        )
-
-    @st.cache_resource
     # Get a dictionary of style elements
-    def get_style(_self) -> dict:
+    def get_style(self, style: str | None = None) -> dict:
         """
         Get palette colours in a dictionary.
 
+        Args:
+            style (str | None): Theme name. Defaults to the session's `theme`, or "dark".
+
         Returns:
             (dict): Dictionary with colour palette elements.
         """
+        if style is None:
+            style = st.session_state.get("theme", "dark")
 
-        return {
-            "bg-color": "#15151e",
-            "secondary-bg": "#1a1a1a",
-            "text-color": "#ffffff",
-            "primary-color": "#a8e6cf",
-            "secondary-color": "#ffd3b6",
-            "third-color": "#ff8b94",
-            "title-color": "#ffffff",
-            "border-color": "#e10600",
-            "line-color": "#c6ced5",
-        }
+        # Input checking
+        if style not in PALETTES.keys():
+            raise ValueError(
+                f"Unknown style: {style}. Please choose from {list(PALETTES.keys())}."
+            )
+
+        return dict(PALETTES[style])
 
     # Set the global style
-    def set_style(self) -> None:
+    def set_style(self, style: str | None = None) -> None:
         """
         Set the global style based on the variable passed down.
 
         Args:
-            style (str): User chosen style. Options include `light`, `dark`, `tokyo`. Default is "dark" for dark mode.
+            style (str | None): User chosen style. Options include `light`, `dark`, `tokyo`. Defaults to the session's `theme` ("dark" for dark mode).
 
         Return:
             None: Style class receives global style variable.
         """
 
-        style_dict: dict = self.get_style()
+        style_dict: dict = self.get_style(style)
         self.style_init(style_dict)
 
     # Reduce padding of the main block container
@@ -169,33 +288,35 @@ class Styles:
     # Set custom F1 font face
     def custom_font(self) -> str:
         import os
-        import base64
-
-        # Get the absolute path to your assets folder
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        font_regular = os.path.join(base_dir, "assets", "fonts", "Formula1-Regular.ttf")
-        font_bold = os.path.join(base_dir, "assets", "fonts", "Formula1-Bold.ttf")
 
-        # Read and encode fonts as base64
-        with open(font_regular, "rb") as f:
-            font_regular_b64 = base64.b64encode(f.read()).decode()
+        from utils import asset_url, web_font_unicode_range
 
-        with open(font_bold, "rb") as f:
-            font_bold_b64 = base64.b64encode(f.read()).decode()
+        # Fonts are served as fingerprinted static subsets instead of inlined data URIs
+        font_regular: str = asset_url("fonts/Formula1-Regular.ttf")
+        font_bold: str = asset_url("fonts/Formula1-Bold.ttf")
+        font_format: str = os.path.splitext(font_regular.split("?")[0])[1][1:]
+        unicode_range: str = web_font_unicode_range()
 
         return """
         @font-face {{
             font-family: Formula1;
-            src: url(data:font/ttf;base64,{font_regular}) format('truetype');
+            src: url({font_regular}) format('{font_format}');
+            unicode-range: {unicode_range};
+            font-display: swap;
         }}
 
         @font-face {{
             font-family: Formula1Bold;
-            src: url(data:font/ttf;base64,{font_bold}) format('truetype');
+            src: url({font_bold}) format('{font_format}');
+            unicode-range: {unicode_range};
             font-weight: bold;
+            font-display: swap;
         }} 
         """.format(
-            font_regular=font_regular_b64, font_bold=font_bold_b64
+            font_regular=font_regular,
+            font_bold=font_bold,
+            font_format=font_format,
+            unicode_range=unicode_range,
         )
 
     # Set global background and text colour
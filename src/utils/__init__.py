@@ -1,2 +1,227 @@
-from .utils import *
-from .f1_utils import *
+# Lazy facade over the utility modules: `from utils import x` only imports the module
+# that defines `x`, so a page never pays for dependencies it does not use.
+# Add new public names to `_EXPORTS` under the module that defines them.
+
+# Imports
+import importlib
+
+_EXPORTS: dict[str, list[str]] = {
+    "paths": ["ROOT_DIR", "DATA_DIR", "ASSETS_DIR"],
+    "utils": ["load_csv", "display_markdown", "import_fonts", "plotly_config"],
+    "fonts": [
+        "FONTS_DIR",
+        "FONT_FAMILIES",
+        "WEB_FONT_UNICODES",
+        "font_path",
+        "get_font",
+        "registered_fonts",
+        "web_font_unicode_range",
+    ],
+    "state": [
+        "STATE_KEYS",
+        "DEFAULT_CAREER",
+        "init_state",
+        "get_state",
+        "set_state",
+        "active_schedule",
+    ],
+    "career_db": [
+        "CAREER_DB_PATH",
+        "FLUSH_INTERVAL",
+        "connect",
+        "flush",
+        "pending_writes",
+        "get_or_create_career",
+        "save_setting",
+        "load_settings",
+        "save_results",
+        "load_results",
+    ],
+    "f1_utils": [
+        "MAX_RACES",
+        "MAX_SPRINTS",
+        "SCHEDULE_COLUMNS",
+        "get_team_colours",
+        "get_schedule",
+        "schedule_frame",
+        "validate_schedule",
+        "schedule_from_frame",
+        "get_race_laps",
+    ],
+    "ingest": [
+        "INGEST_CACHE_DIR",
+        "DISK_CACHE_BYTES",
+        "CACHE_VERSION",
+        "CATEGORY_RATIO",
+        "STREAM_THRESHOLD",
+        "DTYPE_HINTS",
+        "TRACE_MEMORY",
+        "IMPORT_REPORTS",
+        "file_digest",
+        "file_key",
+        "normalise_frame",
+        "infer_dtypes",
+        "stream_csv",
+        "read_csv_cached",
+        "evict_disk_cache",
+        "ingest_folder",
+        "import_reports",
+        "cache_stats",
+        "clear_cache",
+    ],
+    "race_store": [
+        "STORE_DIR",
+        "VERSION_FILE",
+        "SESSION_TYPES",
+        "PARTITION_SCHEMA",
+        "write_session",
+        "import_csv",
+        "table_schema",
+        "open_table",
+        "read_table",
+        "list_partitions",
+        "table_version",
+        "load_table",
+    ],
+    "save_extractor": [
+        "SAVE_TABLES",
+        "read_save_database",
+        "open_save",
+        "iter_batches",
+        "extract_save",
+    ],
+    "strategy": [
+        "DEFAULT_COMPOUNDS",
+        "stint_lengths",
+        "enumerate_strategies",
+        "solve_strategies",
+    ],
+    "simulator": [
+        "SIMULATION_CACHE_DIR",
+        "SIMULATION_CACHE_BYTES",
+        "CIRCUIT_NEUTRALISATION",
+        "POINTS",
+        "parse_strategy",
+        "simulation_key",
+        "simulate_races",
+        "simulate_races_cached",
+    ],
+    "degradation": [
+        "MODEL_PATH",
+        "fit_degradation",
+        "stint_hashes",
+        "update_degradation_models",
+        "update_models_from_store",
+        "get_degradation",
+    ],
+    "pit_index": [
+        "BENCHMARK",
+        "update_pit_index",
+        "update_pit_index_from_store",
+        "pit_index_seasons",
+        "pit_index_version",
+        "load_pit_index",
+    ],
+    "aggregates": [
+        "AGGREGATE_DIR",
+        "session_aggregates",
+        "update_aggregates",
+        "update_aggregates_from_store",
+        "aggregate_seasons",
+        "aggregate_lookup",
+        "get_aggregate",
+        "load_aggregates",
+        "standings",
+    ],
+    "recompute": [
+        "NODES",
+        "register_node",
+        "downstream",
+        "get_node",
+        "invalidate",
+        "set_input",
+        "reset_graph",
+        "recompute_trace",
+        "stint_table",
+    ],
+    "watcher": [
+        "EXPORTS_DIR",
+        "DEBOUNCE_SECONDS",
+        "EXPORT_PATTERN",
+        "parse_export_name",
+        "ingest_exports",
+        "scan_exports",
+        "start_watcher",
+        "stop_watcher",
+        "data_version",
+        "latest_imports",
+    ],
+    "api": ["API_PORT", "encode", "make_api", "serve_api"],
+    "warmup": [
+        "PRELOAD_MODULES",
+        "WARMUP_STEPS",
+        "warm_caches",
+        "start_warmup",
+        "warmup_status",
+    ],
+    "sheet_sync": [
+        "SHEET_CACHE_DIR",
+        "POLL_INTERVAL",
+        "SheetSyncError",
+        "sheets_session",
+        "spreadsheet_id",
+        "column_letter",
+        "row_hashes",
+        "changed_ranges",
+        "pull_worksheets",
+        "push_worksheet",
+    ],
+    "charts": [
+        "DEFAULT_WIDTH",
+        "FIGURE_POINT_BUDGET",
+        "GL_THRESHOLD",
+        "lttb",
+        "point_budget",
+        "line_trace",
+        "line_figure",
+    ],
+    "figure_cache": [
+        "FIGURE_CACHE_BYTES",
+        "FIGURE_BUILDERS",
+        "register_figure",
+        "encode_figure",
+        "figure_spec",
+        "plotly_chart_cached",
+        "figure_cache_stats",
+        "clear_figure_cache",
+    ],
+    "assets": [
+        "STATIC_DIR",
+        "STATIC_URL",
+        "build_assets",
+        "asset_manifest",
+        "asset_url",
+    ],
+}
+
+# Public name -> defining module
+_MODULES: dict[str, str] = {
+    name: module for module, names in _EXPORTS.items() for name in names
+}
+
+__all__: list[str] = list(_MODULES.keys())
+
+
+def __getattr__(name: str):
+    module: str | None = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Import the defining module on first use and remember the value
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,443 @@
+# Materialised driver and team metrics, updated one imported session at a time
+
+# Imports
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .paths import DATA_DIR
+from .race_store import STORE_DIR, read_table
+from .simulator import POINTS
+
+# One Parquet file per season, so an import never rewrites other seasons
+AGGREGATE_DIR: str = os.path.join(DATA_DIR, "aggregates")
+
+# Points for P1 to P8 of a sprint
+SPRINT_POINTS: list[int] = [8, 7, 6, 5, 4, 3, 2, 1]
+
+# Laps slower than this share of the driver's median (pit laps, safety cars) are left
+# out of the pace and consistency figures
+CLEAN_LAP_RATIO: float = 1.07
+
+# Stored figures are sums, so rounds add up to the season without the raw rows. The
+# averages (position, pace, consistency, ...) are derived from them on read. Retired
+# drivers have no position: the average position is over `classified` finishes only.
+SUM_COLUMNS: list[str] = [
+    "starts",
+    "classified",
+    "points",
+    "position_sum",
+    "gained_sum",
+    "laps",
+    "lap_time_sum",
+    "lap_time_sq_sum",
+]
+KEY_COLUMNS: list[str] = ["scope", "round", "session", "entity", "name"]
+AGGREGATE_COLUMNS: list[str] = KEY_COLUMNS + ["team"] + SUM_COLUMNS + ["best_lap"]
+
+
+def _aggregate_path(season: int, aggregate_dir: str) -> str:
+    return os.path.join(aggregate_dir, f"season={season}.parquet")
+
+
+def _read_aggregates(path: str) -> pd.DataFrame:
+    # Files written before `classified` existed counted every start as classified,
+    # refreshing the season (see `utils.batch.refresh_season`) recounts them
+    aggregates: pd.DataFrame = pd.read_parquet(path)
+    if "classified" not in aggregates:
+        aggregates.insert(
+            aggregates.columns.get_loc("starts") + 1, "classified", aggregates["starts"]
+        )
+    return aggregates
+
+
+def session_aggregates(
+    results: pd.DataFrame,
+    laps: pd.DataFrame | None,
+    round_no: int,
+    session: str,
+) -> pd.DataFrame:
+    """
+    Driver and team sums of a single session.
+
+    Args:
+        results (pd.DataFrame): Classification with `driver`, `team` and `position`, and
+            optionally `grid` and `points` (derived from the position when missing).
+        laps (pd.DataFrame | None): Laps with `driver` and `lap_time` (s), if recorded.
+        round_no (int): Round number.
+        session (str): Session type, e.g. "sprint" or "race".
+
+    Returns:
+        (pd.DataFrame): `AGGREGATE_COLUMNS` rows of scope "round".
+    """
+    # Input checking
+    if not {"driver", "team", "position"} <= set(results.columns):
+        raise ValueError("Results need `driver`, `team` and `position` columns.")
+
+    position: pd.Series = pd.to_numeric(results["position"], errors="coerce")
+    if "points" in results:
+        points: pd.Series = pd.to_numeric(results["points"], errors="coerce").fillna(0)
+    else:
+        table: list[int] = SPRINT_POINTS if session == "sprint" else POINTS
+        points = position.map(
+            lambda p: table[int(p) - 1] if p == p and 1 <= p <= len(table) else 0
+        )
+    gained: pd.Series = (
+        pd.to_numeric(results["grid"], errors="coerce") - position
+        if "grid" in results
+        else pd.Series(0.0, index=results.index)
+    )
+    drivers: pd.DataFrame = pd.DataFrame(
+        {
+            "name": results["driver"].astype(str),
+            "team": results["team"].astype(str),
+            "starts": 1,
+            "classified": position.notna().astype(int),
+            "points": points.astype(float),
+            "position_sum": position.fillna(0).astype(float),
+            "gained_sum": gained.fillna(0).astype(float),
+        }
+    )
+
+    # Lap sums over clean laps only
+    if laps is not None and not laps.empty:
+        lap_times: pd.DataFrame = laps[["driver", "lap_time"]].dropna().copy()
+        lap_times["driver"] = lap_times["driver"].astype(str)
+        median: pd.Series = lap_times.groupby("driver")["lap_time"].transform("median")
+        clean: pd.DataFrame = lap_times[
+            lap_times["lap_time"] <= median * CLEAN_LAP_RATIO
+        ]
+        lap_sums: pd.DataFrame = clean.groupby("driver")["lap_time"].agg(
+            laps="count",
+            lap_time_sum="sum",
+            lap_time_sq_sum=lambda times: float(np.square(times.astype(float)).sum()),
+            best_lap="min",
+        )
+        drivers = drivers.merge(lap_sums, left_on="name", right_index=True, how="left")
+    for column in ["laps", "lap_time_sum", "lap_time_sq_sum", "best_lap"]:
+        if column not in drivers:
+            drivers[column] = np.nan
+    drivers[["laps", "lap_time_sum", "lap_time_sq_sum"]] = drivers[
+        ["laps", "lap_time_sum", "lap_time_sq_sum"]
+    ].fillna(0)
+    drivers["entity"] = "driver"
+
+    # Teams are the sums of their drivers
+    teams: pd.DataFrame = (
+        drivers.groupby("team", as_index=False)
+        .agg({**{column: "sum" for column in SUM_COLUMNS}, "best_lap": "min"})
+        .assign(name=lambda frame: frame["team"], entity="team")
+    )
+
+    rows: pd.DataFrame = pd.concat([drivers, teams], ignore_index=True)
+    rows["scope"] = "round"
+    rows["round"] = round_no
+    rows["session"] = session
+    return rows[AGGREGATE_COLUMNS]
+
+
+def _same_rows(old: pd.DataFrame, new: pd.DataFrame) -> bool:
+    # Row order and dtypes (e.g. after a Parquet round trip) do not matter
+    if len(old) != len(new):
+        return False
+    order: list[str] = ["entity", "name"]
+    old = old[AGGREGATE_COLUMNS].sort_values(order, ignore_index=True)
+    new = new[AGGREGATE_COLUMNS].sort_values(order, ignore_index=True)
+    try:
+        pd.testing.assert_frame_equal(old, new, check_dtype=False)
+    except AssertionError:
+        return False
+    return True
+
+
+def update_aggregates(
+    results: pd.DataFrame,
+    laps: pd.DataFrame | None,
+    season: int,
+    round_no: int,
+    session: str,
+    aggregate_dir: str = AGGREGATE_DIR,
+) -> pd.DataFrame:
+    """
+    Add (or replace) one session in the aggregates of its season. The file is left
+    untouched when the session's rows did not change.
+
+    Only the new session is computed from raw rows. Season-to-date figures are the sums
+    of the stored round rows, so the cost of an update depends on the number of rounds
+    and drivers, never on the number of laps.
+
+    Args:
+        results (pd.DataFrame): Classification of the session (see `session_aggregates`).
+        laps (pd.DataFrame | None): Laps of the session, if recorded.
+        season (int): Season of the session.
+        round_no (int): Round number.
+        session (str): Session type, e.g. "sprint" or "race".
+        aggregate_dir (str, optional): Folder of the aggregates. Defaults to `AGGREGATE_DIR`.
+
+    Returns:
+        (pd.DataFrame): The updated aggregates of the season.
+    """
+    path: str = _aggregate_path(season, aggregate_dir)
+    stored: pd.DataFrame = (
+        _read_aggregates(path)
+        if os.path.exists(path)
+        else pd.DataFrame(columns=AGGREGATE_COLUMNS)
+    )
+    replaced: pd.Series = (
+        (stored["scope"] == "round")
+        & (stored["round"] == round_no)
+        & (stored["session"] == session)
+    )
+    new_rows: pd.DataFrame = session_aggregates(results, laps, round_no, session)
+
+    # Unchanged session (e.g. a round only being viewed): keep the file and its mtime
+    if os.path.exists(path) and _same_rows(stored[replaced], new_rows):
+        return stored
+
+    rounds: pd.DataFrame = stored[(stored["scope"] == "round") & ~replaced]
+    rounds = pd.concat(
+        [frame for frame in (rounds, new_rows) if not frame.empty],
+        ignore_index=True,
+    ).sort_values(["round", "session", "entity", "name"], ignore_index=True)
+
+    # Season to date per session type, summed from the round rows
+    season_rows: pd.DataFrame = rounds.groupby(
+        ["session", "entity", "name"], as_index=False
+    ).agg(
+        {
+            **{column: "sum" for column in SUM_COLUMNS},
+            "team": "last",
+            "best_lap": "min",
+            "round": "max",
+        }
+    )
+    season_rows["scope"] = "season"
+
+    aggregates: pd.DataFrame = pd.concat(
+        [rounds, season_rows[AGGREGATE_COLUMNS]], ignore_index=True
+    )
+    os.makedirs(aggregate_dir, exist_ok=True)
+    aggregates.to_parquet(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+
+    return aggregates
+
+
+def update_aggregates_from_store(
+    season: int,
+    round_no: int,
+    session: str,
+    aggregate_dir: str = AGGREGATE_DIR,
+    store_dir: str = STORE_DIR,
+) -> pd.DataFrame:
+    """
+    Refresh one session of the aggregates from the `results` and `laps` tables of the
+    race store.
+
+    Args:
+        season (int): Season of the session.
+        round_no (int): Round number.
+        session (str): Session type.
+        aggregate_dir (str, optional): Folder of the aggregates. Defaults to `AGGREGATE_DIR`.
+        store_dir (str, optional): Root folder of the store. Defaults to `STORE_DIR`.
+
+    Returns:
+        (pd.DataFrame): The updated aggregates of the season.
+    """
+    results: pd.DataFrame = read_table(
+        "results",
+        season=season,
+        round_no=round_no,
+        session=session,
+        store_dir=store_dir,
+    )
+    laps: pd.DataFrame = read_table(
+        "laps", season=season, round_no=round_no, session=session, store_dir=store_dir
+    )
+    return update_aggregates(
+        results,
+        laps if {"driver", "lap_time"} <= set(laps.columns) else None,
+        season,
+        round_no,
+        session,
+        aggregate_dir,
+    )
+
+
+def aggregate_seasons(aggregate_dir: str = AGGREGATE_DIR) -> list[int]:
+    """
+    Seasons with materialised aggregates.
+
+    Args:
+        aggregate_dir (str, optional): Folder of the aggregates. Defaults to `AGGREGATE_DIR`.
+
+    Returns:
+        (list[int]): Sorted seasons.
+    """
+    if not os.path.isdir(aggregate_dir):
+        return []
+
+    return sorted(
+        int(name[len("season=") : -len(".parquet")])
+        for name in os.listdir(aggregate_dir)
+        if name.startswith("season=") and name.endswith(".parquet")
+    )
+
+
+def _with_metrics(rows: pd.DataFrame) -> pd.DataFrame:
+    # Averages derived from the stored sums
+    classified: pd.Series = rows["classified"].where(rows["classified"] > 0)
+    laps: pd.Series = rows["laps"].where(rows["laps"] > 0)
+    pace: pd.Series = rows["lap_time_sum"] / laps
+    return rows.assign(
+        avg_position=rows["position_sum"] / classified,
+        positions_gained=rows["gained_sum"],
+        pace=pace,
+        consistency=np.sqrt((rows["lap_time_sq_sum"] / laps - pace**2).clip(lower=0)),
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _load_lookup(path: str, version: float) -> dict[tuple, dict]:
+    # Shared, read-only lookup table of one season file
+    rows: pd.DataFrame = _with_metrics(_read_aggregates(path))
+    records: list[dict] = rows.to_dict("records")
+    # Season rows are keyed without a round, so season to date is a single lookup too
+    return {
+        (
+            row["scope"],
+            row["round"] if row["scope"] == "round" else None,
+            row["session"],
+            row["entity"],
+            row["name"],
+        ): row
+        for row in records
+    }
+
+
+def aggregate_lookup(
+    season: int, aggregate_dir: str = AGGREGATE_DIR
+) -> dict[tuple, dict]:
+    """
+    Hash table of every aggregate row of a season, loaded once per file version.
+
+    Args:
+        season (int): Season to read.
+        aggregate_dir (str, optional): Folder of the aggregates. Defaults to `AGGREGATE_DIR`.
+
+    Returns:
+        (dict[tuple, dict]): Rows keyed by (scope, round, session, entity, name), with a
+            None round for season rows. Shared between sessions, do not modify.
+    """
+    path: str = _aggregate_path(season, aggregate_dir)
+    if not os.path.exists(path):
+        return {}
+
+    return _load_lookup(path, os.path.getmtime(path))
+
+
+def get_aggregate(
+    season: int,
+    round_no: int | None,
+    session: str,
+    name: str,
+    entity: str = "driver",
+    aggregate_dir: str = AGGREGATE_DIR,
+) -> dict | None:
+    """
+    Metrics of a driver or team for one session, or season to date, in O(1).
+
+    Args:
+        season (int): Season.
+        round_no (int | None): Round number, or None for season to date.
+        session (str): Session type, e.g. "sprint" or "race".
+        name (str): Driver or team name.
+        entity (str, optional): "driver" or "team". Defaults to "driver".
+        aggregate_dir (str, optional): Folder of the aggregates. Defaults to `AGGREGATE_DIR`.
+
+    Returns:
+        (dict | None): `points`, `avg_position`, `positions_gained`, `pace`, `consistency`,
+            `best_lap` and the stored sums, or None if there is no such row.
+    """
+    # Input checking
+    if entity not in ["driver", "team"]:
+        raise ValueError("Unknown entity. Please choose between 'driver' or 'team'.")
+
+    scope: str = "season" if round_no is None else "round"
+    return aggregate_lookup(season, aggregate_dir).get(
+        (scope, round_no, session, entity, name)
+    )
+
+
+def load_aggregates(
+    season: int,
+    scope: str = "round",
+    entity: str = "driver",
+    aggregate_dir: str = AGGREGATE_DIR,
+) -> pd.DataFrame:
+    """
+    Aggregates of a season as a table, for charts and leaderboards.
+
+    Args:
+        season (int): Season to read.
+        scope (str, optional): "round" for per-session rows or "season" for season to date. Defaults to "round".
+        entity (str, optional): "driver" or "team". Defaults to "driver".
+        aggregate_dir (str, optional): Folder of the aggregates. Defaults to `AGGREGATE_DIR`.
+
+    Returns:
+        (pd.DataFrame): Stored sums plus the derived metrics, empty if nothing was imported.
+    """
+    # Input checking
+    if scope not in ["round", "season"]:
+        raise ValueError("Unknown scope. Please choose between 'round' or 'season'.")
+
+    rows: list[dict] = [
+        row
+        for key, row in aggregate_lookup(season, aggregate_dir).items()
+        if key[0] == scope and key[3] == entity
+    ]
+    return pd.DataFrame(rows).drop(columns=["scope", "entity"], errors="ignore")
+
+
+def standings(
+    season: int,
+    entity: str = "driver",
+    session: str = "race",
+    aggregate_dir: str = AGGREGATE_DIR,
+) -> pd.DataFrame:
+    """
+    Season-to-date table of a session type, ordered by points.
+
+    Args:
+        season (int): Season to read.
+        entity (str, optional): "driver" or "team". Defaults to "driver".
+        session (str, optional): Session type. Defaults to "race".
+        aggregate_dir (str, optional): Folder of the aggregates. Defaults to `AGGREGATE_DIR`.
+
+    Returns:
+        (pd.DataFrame): `position`, `name`, `team`, `points`, `starts`, `avg_position`,
+            `positions_gained`, `pace`, `consistency` and `best_lap`.
+    """
+    columns: list[str] = [
+        "position",
+        "name",
+        "team",
+        "points",
+        "starts",
+        "avg_position",
+        "positions_gained",
+        "pace",
+        "consistency",
+        "best_lap",
+    ]
+    rows: pd.DataFrame = load_aggregates(season, "season", entity, aggregate_dir)
+    if rows.empty:
+        return pd.DataFrame(columns=columns)
+
+    # Ties on points go to the better average finish
+    rows = rows[rows["session"] == session].sort_values(
+        ["points", "avg_position"], ascending=[False, True], ignore_index=True
+    )
+    return rows.assign(position=range(1, len(rows) + 1))[columns]
@@ -0,0 +1,271 @@
+# Local JSON API over the precomputed race data, for overlays, sheets and scripts
+
+# Imports
+import asyncio
+import gzip
+import hashlib
+import os
+import threading
+from typing import Any, Callable
+
+import orjson
+import pandas as pd
+import tornado.web
+from cachetools import LRUCache
+from loguru import logger
+
+from .aggregates import AGGREGATE_DIR, aggregate_seasons, load_aggregates, standings
+from .pit_index import INDEX_DIR, load_pit_index, pit_index_seasons
+from .race_store import read_table, table_version
+
+# Served next to the dashboard (see main.py), on the loopback interface only
+API_PORT: int = 8081
+API_ADDRESS: str = "127.0.0.1"
+
+# Encoded responses kept in memory, keyed by the digest of their data version
+RESPONSE_CACHE_SIZE: int = 256
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES: int = 1024
+
+_lock: threading.Lock = threading.Lock()
+_responses: LRUCache = LRUCache(maxsize=RESPONSE_CACHE_SIZE)
+
+
+def _file_version(path: str) -> str:
+    # Changes whenever the file is rewritten
+    if not os.path.exists(path):
+        return "0"
+    stat: os.stat_result = os.stat(path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _default(value: Any) -> Any:
+    # Types orjson does not know natively
+    if isinstance(value, pd.DataFrame):
+        return value.to_dict("records")
+    if isinstance(value, pd.Series):
+        return value.to_list()
+    return str(value)
+
+
+def encode(payload: Any) -> bytes:
+    """
+    Encode a response with orjson. NaN becomes null, NumPy values and (nested)
+    DataFrames, as lists of records, are supported.
+
+    Args:
+        payload (Any): Dicts, lists, DataFrames and scalars.
+
+    Returns:
+        (bytes): JSON document.
+    """
+    return orjson.dumps(
+        payload,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        default=_default,
+    )
+
+
+def _standings(season: int, args: dict[str, str]) -> pd.DataFrame:
+    return standings(season, args.get("entity", "driver"), args.get("session", "race"))
+
+
+def _aggregates(season: int, args: dict[str, str]) -> pd.DataFrame:
+    return load_aggregates(
+        season, args.get("scope", "round"), args.get("entity", "driver")
+    )
+
+
+def _pit_stops(season: int, args: dict[str, str]) -> pd.DataFrame:
+    return load_pit_index(season, args.get("scope", "round"))
+
+
+def _stints(season: int, args: dict[str, str]) -> pd.DataFrame:
+    from .recompute import stint_table
+
+    # Read-only: the dashboard's recompute graph is left alone
+    round_no: int = int(args["round"])
+    return stint_table(
+        read_table("laps", season=season, round_no=round_no, session="race")
+    )
+
+
+# Resource -> (loader of a season, version of its data, allowed query arguments)
+RESOURCES: dict[str, dict[str, Any]] = {
+    "standings": {
+        "load": _standings,
+        "version": lambda season: _file_version(
+            os.path.join(AGGREGATE_DIR, f"season={season}.parquet")
+        ),
+        "args": {"entity": ["driver", "team"], "session": None},
+    },
+    "aggregates": {
+        "load": _aggregates,
+        "version": lambda season: _file_version(
+            os.path.join(AGGREGATE_DIR, f"season={season}.parquet")
+        ),
+        "args": {"scope": ["round", "season"], "entity": ["driver", "team"]},
+    },
+    "pit-stops": {
+        "load": _pit_stops,
+        "version": lambda season: _file_version(
+            os.path.join(INDEX_DIR, f"season={season}.parquet")
+        ),
+        "args": {"scope": ["round", "season"]},
+    },
+    "stints": {
+        "load": _stints,
+        "version": lambda season: str(table_version("laps")),
+        "args": {"round": None},
+    },
+}
+
+
+class _JSONHandler(tornado.web.RequestHandler):
+    # Conditional, compressed JSON responses. The ETag comes from the data version, so
+    # a poller whose copy is current gets a 304 without anything being loaded.
+
+    def initialize(self, resource: str | None = None) -> None:
+        self.resource: str | None = resource
+        self._etag: str | None = None
+
+    def compute_etag(self) -> str | None:
+        return self._etag
+
+    def send_json(self, key: str, build: Callable[[], Any]) -> None:
+        # Gzip and plain bodies differ byte for byte, so clients that accept gzip get
+        # their own strong ETag (small bodies are sent plain under it all the same)
+        digest: str = hashlib.blake2b(key.encode(), digest_size=12).hexdigest()
+        accepts_gzip: bool = "gzip" in self.request.headers.get("Accept-Encoding", "")
+        self._etag = f'"{digest}-gz"' if accepts_gzip else f'"{digest}"'
+        self.set_etag_header()
+        self.set_header("Cache-Control", "no-cache")
+        self.set_header("Vary", "Accept-Encoding")
+        if self.check_etag_header():
+            self.set_status(304)
+            return
+
+        with _lock:
+            cached: tuple[bytes, bytes | None] | None = _responses.get(digest)
+        if cached is None:
+            body: bytes = encode(build())
+            cached = (
+                body,
+                gzip.compress(body, 6) if len(body) >= GZIP_MIN_BYTES else None,
+            )
+            with _lock:
+                _responses[digest] = cached
+
+        body, compressed = cached
+        self.set_header("Content-Type", "application/json")
+        if compressed is not None and accepts_gzip:
+            self.set_header("Content-Encoding", "gzip")
+            body = compressed
+        self.write(body)
+
+    def write_error(self, status_code: int, **kwargs) -> None:
+        self.set_header("Content-Type", "application/json")
+        self.finish(encode({"error": self._reason}))
+
+
+class SeasonsHandler(_JSONHandler):
+    def get(self) -> None:
+        version: str = "|".join(
+            [_file_version(AGGREGATE_DIR), _file_version(INDEX_DIR)]
+        )
+        self.send_json(
+            f"seasons|{version}",
+            lambda: {
+                "aggregates": aggregate_seasons(),
+                "pit_stops": pit_index_seasons(),
+            },
+        )
+
+
+class HealthHandler(_JSONHandler):
+    def get(self) -> None:
+        from .warmup import warmup_status
+
+        # Readiness changes while the server warms up, never cached
+        self.set_header("Cache-Control", "no-store")
+        self.set_header("Content-Type", "application/json")
+        self.write(encode(warmup_status()))
+
+
+class ResourceHandler(_JSONHandler):
+    def get(self, season: str) -> None:
+        spec: dict[str, Any] = RESOURCES[self.resource]
+
+        # Input checking
+        args: dict[str, str] = {}
+        for name, choices in spec["args"].items():
+            value: str | None = self.get_query_argument(name, None)
+            if value is None:
+                continue
+            if choices is not None and value not in choices:
+                raise tornado.web.HTTPError(
+                    400, reason=f"Unknown {name}. Please choose from {choices}."
+                )
+            args[name] = value
+        if self.resource == "stints" and not args.get("round", "").isdigit():
+            raise tornado.web.HTTPError(400, reason="Please give a round number.")
+
+        key: str = "|".join(
+            [self.resource, season, spec["version"](int(season))]
+            + [f"{name}={value}" for name, value in sorted(args.items())]
+        )
+        self.send_json(
+            key,
+            lambda: {
+                "season": int(season),
+                **args,
+                "rows": spec["load"](int(season), args),
+            },
+        )
+
+
+def make_api() -> tornado.web.Application:
+    """
+    Tornado application of the JSON API.
+
+    Routes:
+        /api/health: readiness of the server caches, see `warmup_status`.
+        /api/seasons: seasons with aggregates and pit stop data.
+        /api/standings/<season>?entity=driver|team&session=race: season-to-date table.
+        /api/aggregates/<season>?scope=round|season&entity=driver|team: stored metrics.
+        /api/pit-stops/<season>?scope=round|season: pit stop index.
+        /api/stints/<season>?round=<round>: stints of a race.
+
+    Returns:
+        (tornado.web.Application): The application, not listening yet.
+    """
+    return tornado.web.Application(
+        [(r"/api/health", HealthHandler), (r"/api/seasons", SeasonsHandler)]
+        + [
+            (
+                rf"/api/{resource}/(\d{{4}})",
+                ResourceHandler,
+                {"resource": resource},
+            )
+            for resource in RESOURCES
+        ]
+    )
+
+
+def serve_api(port: int = API_PORT, address: str = API_ADDRESS) -> None:
+    """
+    Serve the JSON API until the process is stopped (blocking). Runs its own event
+    loop, so it can also be served from a thread next to the Streamlit server.
+
+    Args:
+        port (int, optional): Port to listen on. Defaults to `API_PORT`.
+        address (str, optional): Interface to bind. Defaults to `API_ADDRESS`.
+    """
+
+    async def _serve() -> None:
+        make_api().listen(port, address)
+        logger.info(f"JSON API listening on http://{address}:{port}/api")
+        await asyncio.Event().wait()
+
+    asyncio.run(_serve())
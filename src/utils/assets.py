@@ -0,0 +1,198 @@
+# Static asset pipeline: optimised, fingerprinted logos and fonts served by Streamlit
+
+# Imports
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import streamlit as st
+
+from .fonts import FONT_FAMILIES, WEB_FONT_FAMILIES, WEB_FONT_UNICODES
+from .ingest import file_digest
+from .paths import ASSETS_DIR, ROOT_DIR
+
+# Streamlit serves `static/` next to the main script at `app/static/` when
+# `server.enableStaticServing` is on (see `.streamlit/config.toml`)
+STATIC_DIR: str = os.path.join(ROOT_DIR, "src", "static")
+STATIC_URL: str = "app/static"
+MANIFEST_PATH: str = os.path.join(STATIC_DIR, "manifest.json")
+
+# Asset types handled by the pipeline
+IMAGE_EXTENSIONS: list[str] = [".png", ".jpg", ".jpeg"]
+FONT_EXTENSIONS: list[str] = [".ttf", ".otf"]
+
+# Font files (relative to `ASSETS_DIR`) that are cut down to `WEB_FONT_UNICODES`
+WEB_FONTS: list[str] = [
+    f"fonts/{name}"
+    for family in WEB_FONT_FAMILIES
+    for name in FONT_FAMILIES[family].values()
+]
+
+_build_lock: threading.Lock = threading.Lock()
+
+
+def _font_flavor() -> str:
+    # WOFF2 needs brotli, WOFF (zlib) is always available
+    try:
+        import brotli  # noqa: F401
+
+        return "woff2"
+    except ImportError:
+        return "woff"
+
+
+def _optimise_image(source: str, target: str) -> None:
+    from PIL import Image
+
+    with Image.open(source) as image:
+        image.save(target, optimize=True)
+
+    # Keep the original if re-encoding did not help
+    if os.path.getsize(target) >= os.path.getsize(source):
+        shutil.copyfile(source, target)
+
+
+def _optimise_font(source: str, target: str, flavor: str, subset: bool) -> None:
+    from fontTools import subset as subsetter
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(source)
+    if subset:
+        # Keep kerning and ligatures, drop hinting and glyph names browsers do not use
+        options = subsetter.Options()
+        options.layout_features = ["*"]
+        options.hinting = False
+        options.glyph_names = False
+        options.name_IDs = [1, 2, 4, 6]
+        sub = subsetter.Subsetter(options)
+        sub.populate(
+            unicodes=[
+                code
+                for first, last in WEB_FONT_UNICODES
+                for code in range(first, last + 1)
+            ]
+        )
+        sub.subset(font)
+    font.flavor = flavor
+    font.save(target)
+
+
+def _fingerprint(source: str, subset: bool) -> str:
+    # Subsets also depend on the kept code points, so a new range gets a new URL
+    digest: str = file_digest(source)
+    if subset:
+        digest = hashlib.blake2b(
+            f"{digest}{WEB_FONT_UNICODES}".encode(), digest_size=16
+        ).hexdigest()
+    return digest[:12]
+
+
+def build_assets(
+    assets_dir: str = ASSETS_DIR,
+    static_dir: str = STATIC_DIR,
+    force: bool = False,
+) -> dict[str, dict[str, str]]:
+    """
+    Optimise and fingerprint every logo and font into the static folder. Fonts used by the
+    page CSS (`WEB_FONTS`) are subset to `WEB_FONT_UNICODES`. Assets whose content did not
+    change since the last build are left alone.
+
+    Args:
+        assets_dir (str, optional): Source assets. Defaults to `ASSETS_DIR`.
+        static_dir (str, optional): Folder served by Streamlit. Defaults to `STATIC_DIR`.
+        force (bool, optional): Rebuild everything. Defaults to False.
+
+    Returns:
+        (dict[str, dict[str, str]]): Manifest mapping each source path (relative to
+            `assets_dir`, e.g. "logos/F1_Manager_2024_Logo.png") to its `digest` and built `file`.
+    """
+    manifest_path: str = os.path.join(static_dir, "manifest.json")
+
+    with _build_lock:
+        manifest: dict[str, dict[str, str]] = {}
+        if os.path.exists(manifest_path) and not force:
+            with open(manifest_path, "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+
+        flavor: str = _font_flavor()
+        changed: bool = False
+        for root, _, names in os.walk(assets_dir):
+            for name in sorted(names):
+                source: str = os.path.join(root, name)
+                relative: str = os.path.relpath(source, assets_dir).replace(os.sep, "/")
+                stem, extension = os.path.splitext(relative)
+                extension = extension.lower()
+                if extension not in IMAGE_EXTENSIONS + FONT_EXTENSIONS:
+                    continue
+
+                subset: bool = relative in WEB_FONTS
+                digest: str = _fingerprint(source, subset)
+                entry: dict[str, str] | None = manifest.get(relative)
+                if (
+                    entry is not None
+                    and entry["digest"] == digest
+                    and os.path.exists(os.path.join(static_dir, entry["file"]))
+                ):
+                    continue
+
+                built: str = (
+                    f"{stem}-{digest}{extension}"
+                    if extension in IMAGE_EXTENSIONS
+                    else f"{stem}-{digest}.{flavor}"
+                )
+                target: str = os.path.join(static_dir, built)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                if extension in IMAGE_EXTENSIONS:
+                    _optimise_image(source, target)
+                else:
+                    _optimise_font(source, target, flavor, subset)
+
+                # Drop the previous fingerprint of this asset
+                if entry is not None and entry["file"] != built:
+                    stale: str = os.path.join(static_dir, entry["file"])
+                    if os.path.exists(stale):
+                        os.remove(stale)
+
+                manifest[relative] = {"digest": digest, "file": built}
+                changed = True
+
+        if changed:
+            os.makedirs(static_dir, exist_ok=True)
+            with open(manifest_path + ".tmp", "w", encoding="utf-8") as file:
+                json.dump(manifest, file, indent=1, sort_keys=True)
+            os.replace(manifest_path + ".tmp", manifest_path)
+
+    return manifest
+
+
+@st.cache_resource(show_spinner=False)
+def asset_manifest() -> dict[str, dict[str, str]]:
+    """
+    Manifest of the built assets, building them on first use in this process.
+
+    Returns:
+        (dict[str, dict[str, str]]): See `build_assets`.
+    """
+    return build_assets()
+
+
+def asset_url(relative_path: str) -> str:
+    """
+    URL of a built asset. The name is fingerprinted, so browsers can keep it for as long
+    as they like and a changed asset always gets a new URL.
+
+    Args:
+        relative_path (str): Path relative to `src/assets`, e.g. "fonts/Formula1-Bold.ttf".
+
+    Returns:
+        (str): Relative URL under Streamlit's static route.
+    """
+    entry: dict[str, str] | None = asset_manifest().get(relative_path)
+    if entry is None:
+        raise ValueError(f"Unknown asset: {relative_path}")
+
+    # `v` marks the URL as versioned, which lets the static handler send long-lived
+    # cache headers on Streamlit versions that serve files through Tornado
+    return f"{STATIC_URL}/{entry['file']}?v={entry['digest']}"
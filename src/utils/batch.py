@@ -0,0 +1,418 @@
+# Headless pipelines behind the command line (see main.py): ingest, fit, simulate, export
+
+# Imports
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable
+
+import pandas as pd
+from loguru import logger
+
+from .paths import DATA_DIR
+from .race_store import STORE_DIR
+
+# Where `export_seasons` writes by default
+EXPORT_DIR: str = os.path.join(DATA_DIR, "export")
+EXPORT_FORMATS: list[str] = ["csv", "parquet", "json"]
+
+# Same defaults as the Strategy Hub, so the dashboard reuses what was simulated here
+SIMULATION_DEFAULTS: dict[str, Any] = {
+    "pit_loss": 21.0,
+    "fuel_effect": 0.06,
+    "max_stops": 3,
+    "min_stint": 5,
+    "n_strategies": 4,
+    "n_races": 50_000,
+    "seed": 2024,
+}
+
+
+def run_parallel(
+    func: Callable,
+    tasks: list[tuple],
+    workers: int | None = None,
+    label: str = "task",
+) -> list[Any]:
+    """
+    Run independent tasks in a process pool and log their progress. A failing task is
+    logged and returns None, the others carry on.
+
+    Args:
+        func (Callable): Top-level (picklable) function called as `func(*task)`.
+        tasks (list[tuple]): Arguments of every task.
+        workers (int | None, optional): Worker processes, 1 to run in this process. Defaults to the CPU count.
+        label (str, optional): Name of a task in the log. Defaults to "task".
+
+    Returns:
+        (list[Any]): Result of every task, in task order.
+    """
+    results: list[Any] = [None] * len(tasks)
+    if not tasks:
+        return results
+
+    start: float = time.perf_counter()
+    done: int = 0
+
+    def _log(index: int, error: Exception | None) -> None:
+        nonlocal done
+        done += 1
+        if error is not None:
+            logger.error(
+                f"[{done}/{len(tasks)}] {label} {tasks[index]} failed: {error}"
+            )
+        else:
+            logger.info(
+                f"[{done}/{len(tasks)}] {label} {tasks[index]} done "
+                f"({time.perf_counter() - start:.1f}s)"
+            )
+
+    if workers == 1 or len(tasks) == 1:
+        for index, task in enumerate(tasks):
+            try:
+                results[index] = func(*task)
+                _log(index, None)
+            except Exception as e:
+                _log(index, e)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures: dict = {
+            pool.submit(func, *task): index for index, task in enumerate(tasks)
+        }
+        for future in as_completed(futures):
+            index: int = futures[future]
+            try:
+                results[index] = future.result()
+                _log(index, None)
+            except Exception as e:
+                _log(index, e)
+
+    return results
+
+
+def _ingest_file(path: str, seasons: list[int] | None, store_dir: str) -> dict:
+    # One export or save (all the requested seasons in one pass, so the save is only
+    # decompressed once), with the seasons it wrote
+    from .race_store import import_csv
+    from .save_extractor import extract_save
+    from .watcher import SAVE_EXTENSION, parse_export_name
+
+    if path.lower().endswith(SAVE_EXTENSION):
+        summary: dict[str, Any] = extract_save(
+            path, season=seasons, store_dir=store_dir
+        )
+        return {
+            **summary,
+            "seasons": sorted({record["season"] for record in summary["partitions"]}),
+        }
+
+    partition: dict = parse_export_name(path)
+    import_csv(path, store_dir=store_dir, **partition)
+    return {"written": 1, "unchanged": 0, "seasons": [partition["season"]]}
+
+
+def refresh_season(season: int, store_dir: str = STORE_DIR) -> dict[str, int]:
+    """
+    Rebuild the aggregates and the pit stop index of a season from the race store.
+
+    Args:
+        season (int): Season to refresh.
+        store_dir (str, optional): Root folder of the store. Defaults to `STORE_DIR`.
+
+    Returns:
+        (dict[str, int]): Number of `aggregates` sessions and `pit_index` rounds refreshed.
+    """
+    from .aggregates import update_aggregates
+    from .pit_index import update_pit_index
+    from .race_store import list_partitions, read_table
+
+    refreshed: dict[str, int] = {"aggregates": 0, "pit_index": 0}
+
+    results: pd.DataFrame = list_partitions("results", store_dir)
+    for row in results[
+        (results["season"] == season) & results["session"].isin(["sprint", "race"])
+    ].itertuples():
+        laps: pd.DataFrame = read_table(
+            "laps",
+            season=season,
+            round_no=row.round,
+            session=row.session,
+            store_dir=store_dir,
+        )
+        update_aggregates(
+            read_table(
+                "results",
+                season=season,
+                round_no=row.round,
+                session=row.session,
+                store_dir=store_dir,
+            ),
+            laps if {"driver", "lap_time"} <= set(laps.columns) else None,
+            season,
+            int(row.round),
+            row.session,
+        )
+        refreshed["aggregates"] += 1
+
+    stops: pd.DataFrame = list_partitions("pit_stops", store_dir)
+    for row in stops[
+        (stops["season"] == season) & (stops["session"] == "race")
+    ].itertuples():
+        round_stops: pd.DataFrame = read_table(
+            "pit_stops",
+            season=season,
+            round_no=row.round,
+            session="race",
+            store_dir=store_dir,
+        )
+        if {"team", "pit_time"} <= set(round_stops.columns):
+            update_pit_index(round_stops, season, int(row.round))
+            refreshed["pit_index"] += 1
+
+    return refreshed
+
+
+def ingest_paths(
+    paths: list[str],
+    seasons: list[int] | None = None,
+    workers: int | None = None,
+    store_dir: str = STORE_DIR,
+) -> dict[str, int]:
+    """
+    Import exports and saves into the race store in parallel (one process per file),
+    then refresh the derived tables of every season they wrote (one process per season).
+
+    Args:
+        paths (list[str]): Files or folders (searched recursively) of `.sav` saves and
+            CSV exports named as in `utils.watcher.EXPORT_PATTERN`.
+        seasons (list[int] | None, optional): Only import these seasons. Defaults to all.
+        workers (int | None, optional): Worker processes. Defaults to the CPU count.
+        store_dir (str, optional): Root folder of the store. Defaults to `STORE_DIR`.
+
+    Returns:
+        (dict[str, int]): Number of `files`, `written`/`unchanged` partitions, `seasons`
+            refreshed and `failed` tasks (imports and season refreshes).
+    """
+    from .watcher import SAVE_EXTENSION, parse_export_name
+
+    files: list[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += [
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in sorted(names)
+            ]
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            logger.warning(f"{path} does not exist, skipping it.")
+
+    known: list[str] = [
+        file
+        for file in files
+        if file.lower().endswith(SAVE_EXTENSION) or parse_export_name(file)
+    ]
+    for file in sorted(set(files) - set(known)):
+        logger.warning(f"{file} is not a save or a named export, skipping it.")
+
+    tasks: list[tuple] = []
+    for file in known:
+        if file.lower().endswith(SAVE_EXTENSION):
+            tasks.append((file, seasons, store_dir))
+        elif seasons is None or parse_export_name(file)["season"] in seasons:
+            tasks.append((file, None, store_dir))
+
+    logger.info(f"Ingesting {len(known)} files")
+    imported: list[dict | None] = run_parallel(_ingest_file, tasks, workers, "ingest")
+    summary: dict[str, int] = {
+        "files": len(known),
+        "written": sum(result["written"] for result in imported if result),
+        "unchanged": sum(result["unchanged"] for result in imported if result),
+    }
+
+    touched: list[int] = sorted(
+        {int(value) for result in imported if result for value in result["seasons"]}
+    )
+    logger.info(f"Refreshing aggregates and pit stop index of {touched}")
+    refreshed: list[dict | None] = run_parallel(
+        refresh_season, [(value, store_dir) for value in touched], workers, "season"
+    )
+    summary["seasons"] = len(touched)
+    # Failed tasks return None, see `run_parallel`
+    summary["failed"] = imported.count(None) + refreshed.count(None)
+
+    return summary
+
+
+def fit_degradation_models() -> pd.DataFrame:
+    """
+    Refit the degradation curves whose laps changed, from the race store.
+
+    Returns:
+        (pd.DataFrame): Every fitted model, see `update_degradation_models`.
+    """
+    from .degradation import update_models_from_store
+
+    models: pd.DataFrame = update_models_from_store()
+    logger.info(f"{len(models)} degradation curves up to date")
+    return models
+
+
+def simulate_grand_prix(grand_prix: str, options: dict[str, Any]) -> pd.DataFrame:
+    """
+    Strategy Hub pipeline for one Grand Prix: fastest strategies with the fitted tyres
+    (defaults for compounds without a fitted curve), then a race simulation of the
+    best one per compound sequence. The simulation lands in the on-disk cache the
+    dashboard reads.
+
+    Args:
+        grand_prix (str): Grand Prix name, as returned by `get_schedule`.
+        options (dict[str, Any]): Overrides of `SIMULATION_DEFAULTS`.
+
+    Returns:
+        (pd.DataFrame): Simulation summary, see `simulate_races`.
+    """
+    from .degradation import get_degradation
+    from .f1_utils import get_race_laps
+    from .simulator import parse_strategy, simulate_races
+    from .strategy import DEFAULT_COMPOUNDS, solve_strategies
+
+    options = {**SIMULATION_DEFAULTS, **options}
+    # Compounds without a fitted curve keep their defaults
+    compounds: dict[str, dict[str, float]] = {
+        **DEFAULT_COMPOUNDS,
+        **get_degradation(grand_prix),
+    }
+    strategies: pd.DataFrame = solve_strategies(
+        race_laps=get_race_laps(grand_prix),
+        pit_loss=options["pit_loss"],
+        compounds=compounds,
+        max_stops=options["max_stops"],
+        min_stint=options["min_stint"],
+        fuel_effect=options["fuel_effect"],
+        top_k=100,
+    )
+    candidates: pd.DataFrame = strategies.drop_duplicates("compounds").head(
+        options["n_strategies"]
+    )
+    return simulate_races(
+        strategies=[
+            parse_strategy(row.compounds, row.stints) for row in candidates.itertuples()
+        ],
+        compounds=compounds,
+        grand_prix=grand_prix,
+        pit_loss=options["pit_loss"],
+        n_races=options["n_races"],
+        seed=options["seed"],
+        # Grands Prix already run in parallel
+        max_workers=1,
+    ).assign(grand_prix=grand_prix)
+
+
+def simulate_schedule(
+    grands_prix: list[str], workers: int | None = None, **options
+) -> pd.DataFrame:
+    """
+    Simulate several Grands Prix in parallel, one process each.
+
+    Args:
+        grands_prix (list[str]): Grand Prix names.
+        workers (int | None, optional): Worker processes. Defaults to the CPU count.
+        **options: Overrides of `SIMULATION_DEFAULTS`.
+
+    Returns:
+        (pd.DataFrame): Simulation summaries of every Grand Prix that succeeded.
+    """
+    results: list[pd.DataFrame | None] = run_parallel(
+        simulate_grand_prix,
+        [(grand_prix, options) for grand_prix in grands_prix],
+        workers,
+        "simulation",
+    )
+    frames: list[pd.DataFrame] = [frame for frame in results if frame is not None]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def _write(frame: pd.DataFrame, path: str, fmt: str) -> None:
+    if fmt == "csv":
+        frame.to_csv(path, index=False)
+    elif fmt == "parquet":
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_json(path, orient="records", indent=1)
+
+
+def export_season(
+    season: int, out_dir: str = EXPORT_DIR, fmt: str = "csv"
+) -> list[str]:
+    """
+    Write the standings, aggregates and pit stop index of a season to files.
+
+    Args:
+        season (int): Season to export.
+        out_dir (str, optional): Output folder, one sub-folder per season. Defaults to `EXPORT_DIR`.
+        fmt (str, optional): One of `EXPORT_FORMATS`. Defaults to "csv".
+
+    Returns:
+        (list[str]): Paths of the written files.
+    """
+    from .aggregates import load_aggregates, standings
+    from .pit_index import load_pit_index
+
+    # Input checking
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format. Please choose from {EXPORT_FORMATS}.")
+
+    tables: dict[str, pd.DataFrame] = {
+        "driver_standings": standings(season, "driver"),
+        "team_standings": standings(season, "team"),
+        "driver_rounds": load_aggregates(season, "round", "driver"),
+        "team_rounds": load_aggregates(season, "round", "team"),
+        "pit_stops": load_pit_index(season, "round"),
+        "pit_stops_season": load_pit_index(season, "season"),
+    }
+
+    folder: str = os.path.join(out_dir, f"season={season}")
+    os.makedirs(folder, exist_ok=True)
+    paths: list[str] = []
+    for name, frame in tables.items():
+        path: str = os.path.join(folder, f"{name}.{fmt}")
+        _write(frame, path, fmt)
+        paths.append(path)
+
+    return paths
+
+
+def export_seasons(
+    seasons: list[int] | None = None,
+    out_dir: str = EXPORT_DIR,
+    fmt: str = "csv",
+    workers: int | None = None,
+) -> dict[str, Any]:
+    """
+    Export several seasons in parallel, see `export_season`.
+
+    Args:
+        seasons (list[int] | None, optional): Seasons to export. Defaults to every season with aggregates.
+        out_dir (str, optional): Output folder. Defaults to `EXPORT_DIR`.
+        fmt (str, optional): One of `EXPORT_FORMATS`. Defaults to "csv".
+        workers (int | None, optional): Worker processes. Defaults to the CPU count.
+
+    Returns:
+        (dict[str, Any]): `paths` of the written files and number of `failed` seasons.
+    """
+    from .aggregates import aggregate_seasons
+    from .pit_index import pit_index_seasons
+
+    if seasons is None:
+        seasons = sorted(set(aggregate_seasons()) | set(pit_index_seasons()))
+
+    results: list[list[str] | None] = run_parallel(
+        export_season, [(season, out_dir, fmt) for season in seasons], workers, "export"
+    )
+    return {
+        "paths": [path for paths in results if paths for path in paths],
+        "failed": results.count(None),
+    }
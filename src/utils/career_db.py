@@ -0,0 +1,366 @@
+# Local career database: everything entered in the app survives closing the tab
+
+# Imports
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+import pandas as pd
+from loguru import logger
+
+from .paths import DATA_DIR
+
+CAREER_DB_PATH: str = os.path.join(DATA_DIR, "careers.sqlite")
+
+# Pending writes are flushed after this many seconds, or earlier once this many queue up
+FLUSH_INTERVAL: float = 2.0
+FLUSH_BATCH: int = 500
+
+# Lookups are by career, then season / round / session, so those lead every key
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS careers (
+    career_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    team TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS settings (
+    career_id INTEGER NOT NULL REFERENCES careers (career_id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (career_id, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS career_results (
+    career_id INTEGER NOT NULL REFERENCES careers (career_id) ON DELETE CASCADE,
+    season INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    session TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    position INTEGER,
+    driver TEXT,
+    team TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (career_id, season, round, session, row)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS career_results_driver
+    ON career_results (career_id, driver, season);
+"""
+
+_lock: threading.RLock = threading.RLock()
+_connections: dict[str, sqlite3.Connection] = {}
+# Write-behind queue per database, keyed so a newer write of the same row replaces the
+# pending one. Dicts keep insertion order, so writes are flushed in the order issued.
+_pending: dict[str, dict[tuple, tuple[str, tuple]]] = {}
+_flusher: threading.Thread | None = None
+_wake: threading.Event = threading.Event()
+
+
+def connect(db_path: str = CAREER_DB_PATH) -> sqlite3.Connection:
+    """
+    Shared connection to a career database, creating the schema on first use.
+
+    Args:
+        db_path (str, optional): Path to the database. Defaults to `CAREER_DB_PATH`.
+
+    Returns:
+        (sqlite3.Connection): Connection shared by every thread of this process. Hold
+            the module lock (or use the functions of this module) while using it.
+    """
+    with _lock:
+        connection: sqlite3.Connection | None = _connections.get(db_path)
+        if connection is not None:
+            return connection
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        connection = sqlite3.connect(db_path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.executescript(SCHEMA)
+        _connections[db_path] = connection
+
+        return connection
+
+
+def _enqueue(db_path: str, key: tuple, sql: str, params: tuple) -> None:
+    with _lock:
+        pending: dict[tuple, tuple[str, tuple]] = _pending.setdefault(db_path, {})
+        # Move a rewritten row to the end so it still lands after earlier deletes
+        pending.pop(key, None)
+        pending[key] = (sql, params)
+        size: int = len(pending)
+
+    _start_flusher()
+    if size >= FLUSH_BATCH:
+        _wake.set()
+
+
+def flush(db_path: str | None = None) -> int:
+    """
+    Write every pending change to disk in one transaction per database.
+
+    Args:
+        db_path (str | None, optional): Database to flush. Defaults to all of them.
+
+    Returns:
+        (int): Number of statements written.
+    """
+    written: int = 0
+    with _lock:
+        for path in [db_path] if db_path is not None else list(_pending.keys()):
+            pending: dict[tuple, tuple[str, tuple]] = _pending.pop(path, {})
+            if not pending:
+                continue
+
+            connection: sqlite3.Connection = connect(path)
+            try:
+                with connection:
+                    # Consecutive writes of the same statement share one executemany
+                    batch_sql: str | None = None
+                    batch: list[tuple] = []
+                    for sql, params in pending.values():
+                        if sql != batch_sql and batch:
+                            connection.executemany(batch_sql, batch)
+                            batch = []
+                        batch_sql = sql
+                        batch.append(params)
+                    if batch:
+                        connection.executemany(batch_sql, batch)
+            except sqlite3.Error:
+                # The transaction was rolled back, keep the writes for the next flush
+                pending.update(_pending.get(path, {}))
+                _pending[path] = pending
+                raise
+            written += len(pending)
+
+    if written:
+        logger.debug(f"Flushed {written} career database writes.")
+    return written
+
+
+def pending_writes(db_path: str = CAREER_DB_PATH) -> int:
+    """
+    Number of writes waiting in the queue.
+
+    Args:
+        db_path (str, optional): Path to the database. Defaults to `CAREER_DB_PATH`.
+
+    Returns:
+        (int): Pending statements.
+    """
+    with _lock:
+        return len(_pending.get(db_path, {}))
+
+
+def _flush_loop() -> None:
+    while True:
+        _wake.wait(FLUSH_INTERVAL)
+        _wake.clear()
+        try:
+            flush()
+        except sqlite3.Error as e:
+            logger.error(f"Could not flush the career database: {e}")
+
+
+def _start_flusher() -> None:
+    global _flusher
+    with _lock:
+        if _flusher is None:
+            _flusher = threading.Thread(
+                target=_flush_loop, name="career-db-flusher", daemon=True
+            )
+            _flusher.start()
+            # The flusher is a daemon thread, so write what is left on the way out
+            atexit.register(flush)
+
+
+def get_or_create_career(
+    name: str, team: str | None = None, db_path: str = CAREER_DB_PATH
+) -> int:
+    """
+    Id of a career, created on the spot if it does not exist yet.
+
+    Args:
+        name (str): Career name.
+        team (str | None, optional): Team managed in the career. Defaults to None.
+        db_path (str, optional): Path to the database. Defaults to `CAREER_DB_PATH`.
+
+    Returns:
+        (int): Career id.
+    """
+    with _lock:
+        connection: sqlite3.Connection = connect(db_path)
+        with connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO careers (name, team, created_at) VALUES (?, ?, ?)",
+                (name, team, time.time()),
+            )
+        return connection.execute(
+            "SELECT career_id FROM careers WHERE name = ?", (name,)
+        ).fetchone()[0]
+
+
+def save_setting(
+    career_id: int, key: str, value: Any, db_path: str = CAREER_DB_PATH
+) -> None:
+    """
+    Queue a UI setting (selected year, team colours, ...) of a career for saving.
+
+    Args:
+        career_id (int): Career id.
+        key (str): Setting name.
+        value (Any): JSON-serialisable value.
+        db_path (str, optional): Path to the database. Defaults to `CAREER_DB_PATH`.
+    """
+    _enqueue(
+        db_path,
+        ("settings", career_id, key),
+        "INSERT INTO settings (career_id, key, value) VALUES (?, ?, ?) "
+        "ON CONFLICT (career_id, key) DO UPDATE SET value = excluded.value",
+        (career_id, key, json.dumps(value)),
+    )
+
+
+def load_settings(career_id: int, db_path: str = CAREER_DB_PATH) -> dict[str, Any]:
+    """
+    Every saved setting of a career, including writes still in the queue.
+
+    Args:
+        career_id (int): Career id.
+        db_path (str, optional): Path to the database. Defaults to `CAREER_DB_PATH`.
+
+    Returns:
+        (dict[str, Any]): Setting name -> value.
+    """
+    flush(db_path)
+    with _lock:
+        rows: list[tuple[str, str]] = (
+            connect(db_path)
+            .execute(
+                "SELECT key, value FROM settings WHERE career_id = ?", (career_id,)
+            )
+            .fetchall()
+        )
+
+    return {key: json.loads(value) for key, value in rows}
+
+
+def save_results(
+    career_id: int,
+    season: int,
+    round_no: int,
+    session: str,
+    results: pd.DataFrame,
+    db_path: str = CAREER_DB_PATH,
+) -> None:
+    """
+    Queue the classification of a session for saving, replacing the previous one.
+
+    Args:
+        career_id (int): Career id.
+        season (int): Season of the career.
+        round_no (int): Round number within the season.
+        session (str): Session type, e.g. "qualifying" or "race".
+        results (pd.DataFrame): One row per driver, in classification order. A missing or
+            non-numeric `position` (DNF, DSQ, ...) is kept as is.
+        db_path (str, optional): Path to the database. Defaults to `CAREER_DB_PATH`.
+    """
+    # Input checking
+    if "driver" not in results:
+        raise ValueError("Results are missing the driver column. Please add it.")
+
+    # Numpy integers (e.g. from a selectbox) would be stored as blobs
+    season, round_no = int(season), int(round_no)
+
+    # The whole row is kept as JSON so it loads back exactly as entered, the key columns
+    # are copied out of it for the indexed lookups
+    rows: list[dict[str, Any]] = (
+        results.astype(object).where(results.notna(), None).to_dict("records")
+    )
+    positions: pd.Series = pd.to_numeric(
+        results.get("position", pd.Series(None, index=results.index, dtype=object)),
+        errors="coerce",
+    )
+
+    _enqueue(
+        db_path,
+        ("results-trim", career_id, season, round_no, session),
+        "DELETE FROM career_results "
+        "WHERE career_id = ? AND season = ? AND round = ? AND session = ?",
+        (career_id, season, round_no, session),
+    )
+    for row_no, (row, position) in enumerate(zip(rows, positions)):
+        _enqueue(
+            db_path,
+            ("results", career_id, season, round_no, session, row_no),
+            "INSERT OR REPLACE INTO career_results "
+            "(career_id, season, round, session, row, position, driver, team, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                career_id,
+                season,
+                round_no,
+                session,
+                row_no,
+                None if pd.isna(position) else int(position),
+                None if row["driver"] is None else str(row["driver"]),
+                None if row.get("team") is None else str(row["team"]),
+                json.dumps(row, default=str),
+            ),
+        )
+
+
+def load_results(
+    career_id: int,
+    season: int | None = None,
+    round_no: int | None = None,
+    session: str | None = None,
+    db_path: str = CAREER_DB_PATH,
+) -> pd.DataFrame:
+    """
+    Session results of a career. Only rows matching the filters are read, through the
+    (career, season, round, session) key.
+
+    Args:
+        career_id (int): Career id.
+        season (int | None, optional): Season to keep. Defaults to all.
+        round_no (int | None, optional): Round to keep. Defaults to all.
+        session (str | None, optional): Session type to keep. Defaults to all.
+        db_path (str, optional): Path to the database. Defaults to `CAREER_DB_PATH`.
+
+    Returns:
+        (pd.DataFrame): `season`, `round`, `session` and the saved columns, in
+            classification order. Empty if nothing was saved.
+    """
+    query: str = (
+        "SELECT season, round, session, data FROM career_results WHERE career_id = ?"
+    )
+    params: list = [career_id]
+    for column, value in (
+        ("season", season),
+        ("round", round_no),
+        ("session", session),
+    ):
+        if value is not None:
+            query += f" AND {column} = ?"
+            params.append(value if column == "session" else int(value))
+    query += " ORDER BY season, round, session, row"
+
+    flush(db_path)
+    with _lock:
+        rows: list[tuple[int, int, str, str]] = (
+            connect(db_path).execute(query, params).fetchall()
+        )
+
+    return pd.DataFrame(
+        [
+            {"season": row_season, "round": row_round, "session": row_session}
+            | json.loads(data)
+            for row_season, row_round, row_session, data in rows
+        ],
+        columns=None if rows else ["season", "round", "session"],
+    )
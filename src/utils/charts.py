@@ -0,0 +1,190 @@
+# Chart data layer: keep dense traces light enough to stay interactive in the browser
+
+# Imports
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Width the charts are drawn at (px) and how many points per pixel are worth sending
+DEFAULT_WIDTH: int = 1200
+POINTS_PER_PIXEL: float = 2.0
+
+# Points shipped for a whole figure, shared between its traces
+FIGURE_POINT_BUDGET: int = 60_000
+
+# Traces with more points than this (or figures above the total) are drawn with WebGL
+GL_THRESHOLD: int = 1_000
+GL_FIGURE_THRESHOLD: int = 10_000
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling. Keeps the first and last points and,
+    from every bucket in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket, so peaks and dips survive.
+
+    Args:
+        x (np.ndarray): Sorted x values (numeric).
+        y (np.ndarray): y values.
+        n_out (int): Number of points to keep (at least 3).
+
+    Returns:
+        (np.ndarray): Indices of the kept points, in order.
+    """
+    n: int = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket edges over the points between the first and the last
+    edges: np.ndarray = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept: np.ndarray = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+
+    # Average of the bucket after each bucket (the last point for the final one),
+    # from cumulative sums so the loop below only picks the points
+    bounds: np.ndarray = np.append(edges, n)
+    sum_x: np.ndarray = np.concatenate([[0.0], np.cumsum(x)])
+    sum_y: np.ndarray = np.concatenate([[0.0], np.cumsum(y)])
+    sizes: np.ndarray = bounds[2:] - bounds[1:-1]
+    average_x: np.ndarray = (sum_x[bounds[2:]] - sum_x[bounds[1:-1]]) / sizes
+    average_y: np.ndarray = (sum_y[bounds[2:]] - sum_y[bounds[1:-1]]) / sizes
+
+    previous: int = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Twice the triangle areas, for every candidate of the bucket at once
+        areas: np.ndarray = np.abs(
+            (x[previous] - average_x[bucket]) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (average_y[bucket] - y[previous])
+        )
+        previous = start + int(areas.argmax())
+        kept[bucket + 1] = previous
+
+    return kept
+
+
+def point_budget(
+    n_traces: int,
+    width: int = DEFAULT_WIDTH,
+    figure_budget: int = FIGURE_POINT_BUDGET,
+) -> int:
+    """
+    Most points a single trace should carry.
+
+    Args:
+        n_traces (int): Traces in the figure.
+        width (int, optional): Plot width (px). Defaults to `DEFAULT_WIDTH`.
+        figure_budget (int, optional): Points for the whole figure. Defaults to `FIGURE_POINT_BUDGET`.
+
+    Returns:
+        (int): Point budget per trace.
+    """
+    return max(int(min(width * POINTS_PER_PIXEL, figure_budget / max(n_traces, 1))), 3)
+
+
+def line_trace(
+    x: pd.Series | np.ndarray,
+    y: pd.Series | np.ndarray,
+    budget: int | None = None,
+    webgl: bool | None = None,
+    **kwargs,
+) -> go.Scatter | go.Scattergl:
+    """
+    Line trace that is downsampled with LTTB above its point budget and drawn with
+    WebGL when it is dense.
+
+    Args:
+        x (pd.Series | np.ndarray): x values (numeric or datetime).
+        y (pd.Series | np.ndarray): y values. Points with a missing x or y are dropped.
+        budget (int | None, optional): Most points to keep. Defaults to `point_budget(1)`.
+        webgl (bool | None, optional): Force (or prevent) `Scattergl`. Defaults to
+            WebGL above `GL_THRESHOLD` points.
+        **kwargs: Passed to the Plotly trace (name, line, mode, ...).
+
+    Returns:
+        (go.Scatter | go.Scattergl): The trace.
+    """
+    x_values: np.ndarray = np.asarray(x)
+    y_values: np.ndarray = np.asarray(y, dtype=np.float64)
+    keep: np.ndarray = ~pd.isna(x_values) & ~np.isnan(y_values)
+    x_values, y_values = x_values[keep], y_values[keep]
+
+    # LTTB needs numbers and a sorted x axis
+    numeric_x: np.ndarray = (
+        x_values.astype("datetime64[ns]").astype(np.int64)
+        if np.issubdtype(x_values.dtype, np.datetime64)
+        else x_values.astype(np.float64)
+    )
+    order: np.ndarray = np.argsort(numeric_x, kind="stable")
+    if (order != np.arange(len(order))).any():
+        x_values, y_values, numeric_x = (
+            x_values[order],
+            y_values[order],
+            numeric_x[order],
+        )
+
+    budget = budget if budget is not None else point_budget(1)
+    if len(x_values) > budget:
+        kept: np.ndarray = lttb(numeric_x, y_values, budget)
+        x_values, y_values = x_values[kept], y_values[kept]
+
+    trace = (
+        go.Scattergl
+        if (webgl if webgl is not None else len(x_values) > GL_THRESHOLD)
+        else go.Scatter
+    )
+    return trace(x=x_values, y=y_values, **kwargs)
+
+
+def line_figure(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    group: str,
+    colours: dict[str, str] | None = None,
+    width: int = DEFAULT_WIDTH,
+    figure_budget: int = FIGURE_POINT_BUDGET,
+    **kwargs,
+) -> go.Figure:
+    """
+    One line per group (e.g. per driver), sharing the figure's point budget.
+
+    Args:
+        df (pd.DataFrame): Long-format data.
+        x (str): Column on the x axis.
+        y (str): Column on the y axis.
+        group (str): Column splitting the lines.
+        colours (dict[str, str] | None, optional): Line colour per group. Defaults to Plotly's.
+        width (int, optional): Plot width (px). Defaults to `DEFAULT_WIDTH`.
+        figure_budget (int, optional): Points for the whole figure. Defaults to `FIGURE_POINT_BUDGET`.
+        **kwargs: Passed to every trace.
+
+    Returns:
+        (go.Figure): Figure with one trace per group.
+    """
+    groups = df.groupby(group, sort=True, observed=True)
+    budget: int = point_budget(groups.ngroups, width, figure_budget)
+    # Dense figures switch every trace to WebGL, so they share one rendering context
+    webgl: bool | None = True if len(df) > GL_FIGURE_THRESHOLD else None
+
+    figure: go.Figure = go.Figure()
+    for name, rows in groups:
+        line: dict = {"width": 1.5}
+        if colours is not None and name in colours:
+            line["color"] = colours[name]
+        figure.add_trace(
+            line_trace(
+                rows[x],
+                rows[y],
+                budget=budget,
+                webgl=webgl,
+                name=str(name),
+                mode="lines",
+                line=line,
+                **kwargs,
+            )
+        )
+
+    return figure
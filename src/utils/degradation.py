@@ -0,0 +1,258 @@
+# Tyre degradation curve fitting per track and compound
+
+# Imports
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .paths import DATA_DIR
+from .race_store import read_table
+
+# Fitted coefficients, one row per (track, compound) with the hash of the stints behind it
+MODEL_PATH: str = os.path.join(DATA_DIR, "models", "degradation.parquet")
+
+# Columns the lap data needs
+GROUP_COLUMNS: list[str] = ["track", "compound"]
+STINT_COLUMNS: list[str] = ["season", "round", "driver", "stint"]
+
+# Huber threshold, in robust standard deviations, and number of reweighting passes
+HUBER_K: float = 1.345
+IRLS_ITERATIONS: int = 10
+
+
+def fit_degradation(
+    laps: pd.DataFrame,
+    x_column: str = "tyre_age",
+    y_column: str = "lap_time",
+) -> pd.DataFrame:
+    """
+    Fit a linear degradation curve `lap_time = pace + degradation * tyre_age` for every
+    (track, compound) in one vectorised pass.
+
+    Stints are first centred on their own mean lap time, so the fit measures how lap times
+    grow with tyre age rather than the pace gap between drivers. The fit is robust: a few
+    rounds of iteratively reweighted least squares with Huber weights damp traffic,
+    mistakes and in/out laps.
+
+    Args:
+        laps (pd.DataFrame): Lap data with `track`, `compound`, `season`, `round`, `driver`,
+            `stint`, tyre age and lap time columns.
+        x_column (str, optional): Tyre age column. Defaults to "tyre_age".
+        y_column (str, optional): Lap time column (s). Defaults to "lap_time".
+
+    Returns:
+        (pd.DataFrame): One row per (track, compound) with `pace` (mean lap time brought
+            back to fresh tyres), `degradation` (s/lap), `residual_std`, `laps` and `stints`.
+    """
+    # Input checking
+    missing: list[str] = [
+        column
+        for column in GROUP_COLUMNS + STINT_COLUMNS + [x_column, y_column]
+        if column not in laps.columns
+    ]
+    if missing:
+        raise ValueError(f"Missing lap data columns: {missing}")
+
+    laps = laps.dropna(subset=[x_column, y_column])
+    keys: pd.DataFrame = laps[GROUP_COLUMNS].drop_duplicates().reset_index(drop=True)
+    if keys.empty:
+        return pd.DataFrame(
+            columns=GROUP_COLUMNS
+            + ["pace", "degradation", "residual_std", "laps", "stints"]
+        )
+
+    group: np.ndarray = (
+        laps[GROUP_COLUMNS]
+        .merge(keys.reset_index(), on=GROUP_COLUMNS, how="left")["index"]
+        .to_numpy()
+    )
+    stint: np.ndarray = (
+        laps.groupby(GROUP_COLUMNS + STINT_COLUMNS, sort=False).ngroup().to_numpy()
+    )
+    x: np.ndarray = laps[x_column].to_numpy(dtype=float)
+    y: np.ndarray = laps[y_column].to_numpy(dtype=float)
+
+    # Remove the pace of every stint (its mean lap time and mean tyre age)
+    n_stints: int = stint.max() + 1
+    counts: np.ndarray = np.bincount(stint, minlength=n_stints)
+    x_centred: np.ndarray = x - (np.bincount(stint, x, n_stints) / counts)[stint]
+    y_centred: np.ndarray = y - (np.bincount(stint, y, n_stints) / counts)[stint]
+
+    # Robust slope through the origin of the centred data, reweighted with Huber weights
+    weights: np.ndarray = np.ones_like(y)
+    n_groups: int = len(keys)
+    for _ in range(IRLS_ITERATIONS):
+        numerator: np.ndarray = np.bincount(
+            group, weights * x_centred * y_centred, n_groups
+        )
+        denominator: np.ndarray = np.bincount(group, weights * x_centred**2, n_groups)
+        slope: np.ndarray = np.divide(
+            numerator, denominator, out=np.zeros(n_groups), where=denominator > 0
+        )
+        residuals: np.ndarray = y_centred - slope[group] * x_centred
+
+        # Robust scale of every group's residuals (normalised median absolute deviation)
+        by_group = pd.Series(residuals).groupby(group)
+        deviation: pd.Series = (
+            pd.Series(residuals) - by_group.transform("median")
+        ).abs()
+        scale: np.ndarray = (
+            1.4826
+            * deviation.groupby(group)
+            .median()
+            .reindex(range(n_groups), fill_value=0.0)
+            .to_numpy()
+        )
+        threshold: np.ndarray = HUBER_K * np.maximum(scale, 1e-6)[group]
+        weights = np.minimum(1.0, threshold / np.maximum(np.abs(residuals), 1e-12))
+
+    # Fresh-tyre pace: weighted mean lap time with the degradation taken out
+    intercept: np.ndarray = np.bincount(
+        group, weights * (y - slope[group] * x), n_groups
+    ) / np.bincount(group, weights, n_groups)
+
+    return keys.assign(
+        pace=intercept,
+        degradation=slope,
+        residual_std=scale,
+        laps=np.bincount(group, minlength=n_groups),
+        stints=pd.Series(stint)
+        .groupby(group)
+        .nunique()
+        .reindex(range(n_groups))
+        .to_numpy(),
+    )
+
+
+def stint_hashes(laps: pd.DataFrame) -> pd.DataFrame:
+    """
+    Hash the lap data behind every (track, compound).
+
+    Args:
+        laps (pd.DataFrame): Lap data, as for `fit_degradation`.
+
+    Returns:
+        (pd.DataFrame): One row per (track, compound) with a `data_hash` column that only
+            changes when one of its laps changes, whatever the row order.
+    """
+    row_hashes: pd.Series = pd.util.hash_pandas_object(
+        laps.reset_index(drop=True), index=False
+    )
+    # Order-independent combination of the row hashes of every group
+    return (
+        pd.DataFrame(
+            {
+                **{column: laps[column].to_numpy() for column in GROUP_COLUMNS},
+                "data_hash": row_hashes.to_numpy(),
+            }
+        )
+        .groupby(GROUP_COLUMNS, observed=True, sort=False)["data_hash"]
+        .agg(lambda values: int(values.to_numpy().sum(dtype="uint64")))
+        .reset_index()
+    )
+
+
+def update_degradation_models(
+    laps: pd.DataFrame,
+    model_path: str = MODEL_PATH,
+    x_column: str = "tyre_age",
+    y_column: str = "lap_time",
+) -> pd.DataFrame:
+    """
+    Refit only the (track, compound) curves whose stints changed and persist the models.
+
+    Args:
+        laps (pd.DataFrame): All lap data of the career (or of the seasons to model).
+        model_path (str, optional): Parquet file of the fitted models. Defaults to `MODEL_PATH`.
+        x_column (str, optional): Tyre age column. Defaults to "tyre_age".
+        y_column (str, optional): Lap time column (s). Defaults to "lap_time".
+
+    Returns:
+        (pd.DataFrame): Every fitted model, see `fit_degradation`, plus `data_hash`.
+    """
+    hashes: pd.DataFrame = stint_hashes(laps)
+    models: pd.DataFrame = (
+        pd.read_parquet(model_path)
+        if os.path.exists(model_path)
+        else pd.DataFrame(columns=GROUP_COLUMNS + ["data_hash"])
+    )
+
+    # Keep the models whose data hash is unchanged, refit the others
+    current: pd.DataFrame = models.merge(hashes, on=GROUP_COLUMNS + ["data_hash"])
+    stale: pd.DataFrame = hashes.merge(
+        current[GROUP_COLUMNS], on=GROUP_COLUMNS, how="left", indicator=True
+    ).query("_merge == 'left_only'")[GROUP_COLUMNS + ["data_hash"]]
+
+    if not stale.empty:
+        refit: pd.DataFrame = fit_degradation(
+            laps.merge(stale[GROUP_COLUMNS], on=GROUP_COLUMNS), x_column, y_column
+        ).merge(stale, on=GROUP_COLUMNS)
+        current = pd.concat(
+            [frame for frame in (current, refit) if not frame.empty], ignore_index=True
+        )
+
+        os.makedirs(os.path.dirname(model_path), exist_ok=True)
+        current.to_parquet(model_path + ".tmp", index=False)
+        os.replace(model_path + ".tmp", model_path)
+
+    return current
+
+
+def update_models_from_store(
+    x_column: str = "tyre_age",
+    y_column: str = "lap_time",
+    model_path: str = MODEL_PATH,
+) -> pd.DataFrame:
+    """
+    Refresh the degradation models from the `laps` table of the race store, typically
+    right after a round has been imported.
+
+    Args:
+        x_column (str, optional): Tyre age column. Defaults to "tyre_age".
+        y_column (str, optional): Lap time column (s). Defaults to "lap_time".
+        model_path (str, optional): Parquet file of the fitted models. Defaults to `MODEL_PATH`.
+
+    Returns:
+        (pd.DataFrame): Every fitted model, see `update_degradation_models`.
+    """
+    laps: pd.DataFrame = read_table(
+        "laps",
+        columns=GROUP_COLUMNS + STINT_COLUMNS + [x_column, y_column],
+        session="race",
+    )
+    return update_degradation_models(laps, model_path, x_column, y_column)
+
+
+@st.cache_data(show_spinner=False)
+def _load_models(model_path: str, version: float) -> pd.DataFrame:
+    return pd.read_parquet(model_path)
+
+
+def get_degradation(
+    track: str | None = None, model_path: str = MODEL_PATH
+) -> dict[str, dict[str, float]]:
+    """
+    Fitted compounds of a track, in the format expected by the strategy tools.
+
+    Args:
+        track (str | None, optional): Track to look up. Defaults to the average over all tracks.
+        model_path (str, optional): Parquet file of the fitted models. Defaults to `MODEL_PATH`.
+
+    Returns:
+        (dict[str, dict[str, float]]): `pace` and `degradation` per compound, empty if no
+            model has been fitted yet.
+    """
+    if not os.path.exists(model_path):
+        return {}
+
+    models: pd.DataFrame = _load_models(model_path, os.path.getmtime(model_path))
+    if track is not None:
+        models = models[models["track"] == track]
+
+    return (
+        models.groupby("compound", observed=True)[["pace", "degradation"]]
+        .mean()
+        .to_dict(orient="index")
+    )
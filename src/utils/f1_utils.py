@@ -1,6 +1,7 @@
 # Utility functions related to F1
 
 # Imports
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -156,3 +157,153 @@ def get_schedule(year: int) -> dict | list:
         return schedule_2025
     elif year == 0:
         return grand_prixes
+
+
+# Calendar limits enforced by the schedule validation
+MAX_RACES: int = 24
+MAX_SPRINTS: int = 6
+SCHEDULE_COLUMNS: list[str] = ["round", "grand_prix", "sprint"]
+
+
+def schedule_frame(schedule: dict[str, bool]) -> pd.DataFrame:
+    """
+    Turn a schedule into the grid edited on the Data Input page.
+
+    Args:
+        schedule (dict[str, bool]): Grand Prix -> sprint weekend, in calendar order.
+
+    Returns:
+        (pd.DataFrame): One row per race with `round`, `grand_prix` and `sprint` columns.
+    """
+    return pd.DataFrame(
+        {
+            "round": pd.Series(range(1, len(schedule) + 1), dtype="Int64"),
+            "grand_prix": pd.Series(list(schedule.keys()), dtype="object"),
+            "sprint": pd.Series(list(schedule.values()), dtype="bool"),
+        }
+    )
+
+
+def validate_schedule(
+    df: pd.DataFrame,
+    max_races: int = MAX_RACES,
+    max_sprints: int = MAX_SPRINTS,
+) -> list[str]:
+    """
+    Check a schedule grid in one pass over its columns.
+
+    Args:
+        df (pd.DataFrame): Grid with `round`, `grand_prix` and `sprint` columns.
+        max_races (int, optional): Longest allowed calendar. Defaults to `MAX_RACES`.
+        max_sprints (int, optional): Most sprint weekends allowed. Defaults to `MAX_SPRINTS`.
+
+    Returns:
+        (list[str]): Problems found, empty if the schedule is valid.
+    """
+    issues: list[str] = []
+    if df.empty:
+        return ["The schedule is empty. Please add at least one race."]
+    if len(df) > max_races:
+        issues.append(f"The schedule has {len(df)} races, the maximum is {max_races}.")
+
+    grand_prix: pd.Series = df["grand_prix"].fillna("").astype(str).str.strip()
+    rounds: pd.Series = pd.to_numeric(df["round"], errors="coerce")
+
+    # Missing or unknown races
+    missing: pd.Series = grand_prix == ""
+    if missing.any():
+        rows: list[str] = [str(row) for row in np.flatnonzero(missing) + 1]
+        issues.append(f"No race is selected for row(s) {', '.join(rows)}.")
+    unknown: pd.Series = ~missing & ~grand_prix.isin(get_schedule(0))
+    if unknown.any():
+        issues.append(f"Unknown Grand Prix: {', '.join(grand_prix[unknown].unique())}.")
+
+    # Every Grand Prix at most once
+    duplicated: pd.Series = ~missing & grand_prix.duplicated(keep=False)
+    if duplicated.any():
+        issues.append(
+            f"Selected more than once: {', '.join(grand_prix[duplicated].unique())}."
+        )
+
+    # Sprint weekends
+    sprints: int = int(df["sprint"].fillna(False).astype(bool).sum())
+    if sprints > max_sprints:
+        issues.append(
+            f"The schedule has {sprints} sprint weekends, the maximum is {max_sprints}."
+        )
+
+    # Rounds must be 1..n with no gaps or repeats
+    if rounds.isna().any():
+        issues.append("Every race needs a round number.")
+    elif not (rounds.sort_values().to_numpy() == np.arange(1, len(rounds) + 1)).all():
+        issues.append(
+            f"Rounds must run from 1 to {len(rounds)} without gaps or repeats."
+        )
+
+    return issues
+
+
+def schedule_from_frame(df: pd.DataFrame) -> dict[str, bool]:
+    """
+    Turn a validated schedule grid back into a schedule.
+
+    Args:
+        df (pd.DataFrame): Grid with `round`, `grand_prix` and `sprint` columns.
+
+    Returns:
+        (dict[str, bool]): Grand Prix -> sprint weekend, in round order.
+    """
+    ordered: pd.DataFrame = df.sort_values("round")
+    return dict(
+        zip(
+            ordered["grand_prix"].astype(str).str.strip(),
+            ordered["sprint"].fillna(False).astype(bool),
+        )
+    )
+
+
+def get_race_laps(grand_prix: str, distance: float = 1.0) -> int:
+    """
+    Get the number of laps of a Grand Prix.
+
+    Args:
+        grand_prix (str): Grand Prix name, as returned by `get_schedule`.
+        distance (float, optional): Share of the full race distance (F1 Manager allows 25%, 50% and 100%). Defaults to 1.0.
+
+    Returns:
+        (int): Number of laps.
+    """
+    race_laps: dict[str, int] = {
+        "Australia": 58,
+        "China": 56,
+        "Japan": 53,
+        "Bahrain": 57,
+        "Saudi Arabia": 50,
+        "Miami": 57,
+        "Imola/Emilia-Romagna": 63,
+        "Monaco": 78,
+        "Spain": 66,
+        "Canada": 70,
+        "Austria": 71,
+        "Great Britain": 52,
+        "Belgium": 44,
+        "Hungary": 70,
+        "Netherlands": 72,
+        "Italy": 53,
+        "Azerbaijan": 51,
+        "Singapore": 62,
+        "United States": 56,
+        "Mexico": 71,
+        "Brazil": 71,
+        "Las Vegas": 50,
+        "Qatar": 57,
+        "Abu Dhabi": 58,
+    }
+
+    # Input checking
+    if grand_prix not in race_laps.keys():
+        raise ValueError(f"Invalid Grand Prix: {grand_prix}")
+    if not 0 < distance <= 1:
+        raise ValueError("Race distance must be between 0 and 1.")
+
+    return max(round(race_laps[grand_prix] * distance), 1)
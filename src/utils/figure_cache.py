@@ -0,0 +1,324 @@
+# Serialised Plotly figures, shared between reruns and sessions until their data changes
+
+# Imports
+import hashlib
+import threading
+from typing import Any, Callable
+
+import orjson
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+from cachetools import LRUCache
+from loguru import logger
+
+# Memory budget (bytes of JSON) of the serialised figures, least recently used first out
+FIGURE_CACHE_BYTES: int = 64 * 1024**2
+
+# Height (px) of figures without an explicit one, as drawn by Plotly.js
+DEFAULT_HEIGHT: int = 450
+
+# Registered chart builders: name -> build(version, options, palette) -> go.Figure
+FIGURE_BUILDERS: dict[str, Callable[[Any, dict, dict], go.Figure]] = {}
+
+_lock: threading.Lock = threading.Lock()
+_specs: LRUCache = LRUCache(
+    maxsize=FIGURE_CACHE_BYTES, getsizeof=lambda entry: len(entry["spec"])
+)
+_stats: dict[str, int] = {"hits": 0, "misses": 0}
+
+
+def register_figure(name: str) -> Callable:
+    """
+    Decorator adding a chart builder to the figure cache.
+
+    The decorated function is called as `build(version, options, palette)` and returns
+    a `go.Figure`. It must only depend on its arguments: `version` changes whenever the
+    data behind the chart does (e.g. `table_version`), `options` holds the user's
+    selections and `palette` the colours of the current theme.
+
+    Args:
+        name (str): Unique chart name.
+
+    Returns:
+        (Callable): Decorator registering the function and returning it unchanged.
+    """
+
+    def decorator(build: Callable) -> Callable:
+        with _lock:
+            if name in FIGURE_BUILDERS:
+                raise ValueError(f"Figure {name} is already registered.")
+            FIGURE_BUILDERS[name] = build
+        return build
+
+    return decorator
+
+
+def _digest(value: Any) -> str:
+    return hashlib.blake2b(
+        orjson.dumps(
+            value,
+            option=orjson.OPT_SORT_KEYS
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_SERIALIZE_NUMPY,
+            default=str,
+        ),
+        digest_size=16,
+    ).hexdigest()
+
+
+def encode_figure(figure: go.Figure) -> str:
+    """
+    Serialise a figure as Streamlit sends it to the browser: JSON encoded with orjson,
+    with NumPy arrays as base64 typed arrays rather than lists of numbers.
+
+    Args:
+        figure (go.Figure): Figure to encode.
+
+    Returns:
+        (str): Plotly JSON spec.
+    """
+    return pio.to_json(figure, validate=False, engine="orjson")
+
+
+def figure_spec(
+    name: str,
+    version: Any,
+    options: dict | None = None,
+    palette: dict | None = None,
+) -> dict[str, Any]:
+    """
+    Serialised figure of a registered chart, built and encoded only on a cache miss.
+
+    Args:
+        name (str): Chart name, see `register_figure`.
+        version (Any): Version of the chart's data. Any JSON-serialisable value.
+        options (dict | None, optional): Options of the chart. Defaults to none.
+        palette (dict | None, optional): Colour palette. Defaults to none.
+
+    Returns:
+        (dict[str, Any]): `spec` (JSON), `height` (px) and `digest`, a short hash of the
+            cache key. Shared between sessions, do not modify.
+    """
+    # Input checking
+    if name not in FIGURE_BUILDERS:
+        raise ValueError(
+            f"Unknown figure: {name}. Please choose from {list(FIGURE_BUILDERS)}."
+        )
+
+    options, palette = options or {}, palette or {}
+    key: str = _digest([name, version, options, palette])
+
+    with _lock:
+        entry: dict[str, Any] | None = _specs.get(key)
+        _stats["hits" if entry is not None else "misses"] += 1
+    if entry is not None:
+        return entry
+
+    figure: go.Figure = FIGURE_BUILDERS[name](version, options, palette)
+    entry = {
+        "spec": encode_figure(figure),
+        "height": figure.layout.height or DEFAULT_HEIGHT,
+        "digest": key,
+    }
+    if len(entry["spec"]) > FIGURE_CACHE_BYTES:
+        logger.warning(f"Figure {name} is larger than the figure cache, not cached")
+        return entry
+
+    with _lock:
+        _specs[key] = entry
+    return entry
+
+
+def plotly_chart_cached(
+    name: str,
+    version: Any,
+    options: dict | None = None,
+    palette: dict | None = None,
+    config: dict | None = None,
+    key: str | None = None,
+) -> None:
+    """
+    Display a registered chart like `st.plotly_chart(..., use_container_width=True)`,
+    sending the cached spec as is instead of rebuilding and re-encoding the figure.
+
+    Args:
+        name (str): Chart name, see `register_figure`.
+        version (Any): Version of the chart's data.
+        options (dict | None, optional): Options of the chart. Defaults to none.
+        palette (dict | None, optional): Colour palette. Defaults to none.
+        config (dict | None, optional): Plotly config, e.g. `plotly_config()`. Defaults to none.
+        key (str | None, optional): Element key, for several charts with the same spec. Defaults to None.
+    """
+    entry: dict[str, Any] = figure_spec(name, version, options, palette)
+
+    try:
+        _enqueue_spec(entry, config, key)
+    except (ImportError, AttributeError, TypeError) as e:
+        # Streamlit internals moved (the version is pinned in requirements.txt). Errors
+        # of the Streamlit API itself, like a duplicate key, are raised as usual.
+        logger.warning(f"Cannot send cached figures with this Streamlit version: {e}")
+        st.plotly_chart(
+            orjson.loads(entry["spec"]),
+            config=config,
+            use_container_width=True,
+            key=key,
+        )
+
+
+def _enqueue_spec(entry: dict[str, Any], config: dict | None, key: str | None) -> None:
+    # st.plotly_chart only takes figures, which it validates and encodes on every run,
+    # so the element is assembled here from the encoded spec. Relies on private
+    # Streamlit modules, everything else that can fail runs before the element id is
+    # registered, so the fallback in `plotly_chart_cached` can register it again.
+    from streamlit.elements.lib.form_utils import current_form_id
+    from streamlit.elements.lib.layout_utils import LayoutConfig
+    from streamlit.elements.lib.utils import compute_and_register_element_id
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+
+    dg = st._main
+    proto: PlotlyChartProto = PlotlyChartProto()
+    proto.theme = "streamlit"
+    proto.form_id = current_form_id(dg)
+    proto.spec = entry["spec"]
+    proto.config = orjson.dumps(config or {}).decode()
+    layout_config: LayoutConfig = LayoutConfig(width="stretch", height=entry["height"])
+    # The digest identifies the spec, so hashing the whole spec is not needed
+    proto.id = compute_and_register_element_id(
+        "plotly_chart",
+        user_key=key,
+        key_as_main_identity=False,
+        dg=dg,
+        plotly_spec=entry["digest"],
+        plotly_config=proto.config,
+        selection_mode=None,
+        is_selection_activated=False,
+        theme="streamlit",
+        width="stretch",
+        height=entry["height"],
+        alt=None,
+    )
+    dg._enqueue("plotly_chart", proto, layout_config=layout_config)
+
+
+def figure_cache_stats() -> dict[str, int]:
+    """
+    Usage of the figure cache.
+
+    Returns:
+        (dict[str, int]): `entries`, `bytes`, `budget` (bytes), `hits` and `misses`.
+    """
+    with _lock:
+        return {
+            "entries": len(_specs),
+            "bytes": int(_specs.currsize),
+            "budget": FIGURE_CACHE_BYTES,
+            **_stats,
+        }
+
+
+def clear_figure_cache() -> None:
+    """
+    Drop every cached figure and reset the hit counters.
+    """
+    with _lock:
+        _specs.clear()
+        _stats.update(hits=0, misses=0)
+
+
+# ----------------------------------------------------------------------------------
+
+# Built-in charts of the pages. Data is read through the cached page loaders.
+
+
+def _layout(figure: go.Figure, palette: dict, x_title: str, y_title: str) -> None:
+    figure.update_layout(
+        paper_bgcolor=palette.get("bg-color"),
+        plot_bgcolor=palette.get("bg-color"),
+        font={"color": palette.get("text-color")},
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        margin={"t": 20},
+    )
+
+
+@register_figure("pit_stops")
+def _pit_stops(version: float, options: dict, palette: dict) -> go.Figure:
+    # A team's pit stops against the benchmark: P10-P90 band, median and rolling form.
+    # Options: `season` and `team`.
+    from .f1_utils import get_team_colours
+    from .pit_index import BENCHMARK, load_pit_index
+
+    pit_index: pd.DataFrame = load_pit_index(options["season"])
+    team: str = options["team"]
+    team_colour: str = (
+        get_team_colours(team)["primary"]
+        if team in get_team_colours("all")
+        else palette.get("primary-color")
+    )
+
+    figure: go.Figure = go.Figure()
+    for name, colour in [(team, team_colour), (BENCHMARK, palette.get("line-color"))]:
+        rows: pd.DataFrame = pit_index[pit_index["team"] == name]
+        figure.add_trace(
+            go.Scatter(
+                x=pd.concat([rows["round"], rows["round"][::-1]]),
+                y=pd.concat([rows["p90"], rows["p10"][::-1]]),
+                fill="toself",
+                fillcolor=colour,
+                opacity=0.15,
+                line={"width": 0},
+                hoverinfo="skip",
+                showlegend=False,
+            )
+        )
+        figure.add_trace(
+            go.Scatter(
+                x=rows["round"],
+                y=rows["median"],
+                name=f"{name} median",
+                mode="lines+markers",
+                line={"color": colour},
+            )
+        )
+        figure.add_trace(
+            go.Scatter(
+                x=rows["round"],
+                y=rows["form"],
+                name=f"{name} form",
+                mode="lines",
+                line={"color": colour, "dash": "dot"},
+            )
+        )
+
+    _layout(figure, palette, "Round", "Pit stop time (s)")
+    return figure
+
+
+@register_figure("lap_times")
+def _lap_times(version: int, options: dict, palette: dict) -> go.Figure:
+    # Every driver's race laps over the selected rounds, side by side on a fractional
+    # round axis. Options: `season`, `rounds` (empty for all) and `drivers` (empty for all).
+    from .charts import line_figure
+    from .race_store import load_table
+
+    laps: pd.DataFrame = load_table(
+        "laps",
+        columns=["round", "driver", "lap", "lap_time"],
+        season=options["season"],
+        round_no=options.get("rounds") or None,
+        session="race",
+    )
+    if options.get("drivers"):
+        laps = laps[laps["driver"].astype(str).isin(options["drivers"])]
+
+    laps = laps.assign(
+        race_progress=laps["round"]
+        + (laps["lap"] - 1) / laps.groupby("round")["lap"].transform("max")
+    )
+    figure: go.Figure = line_figure(
+        laps, x="race_progress", y="lap_time", group="driver"
+    )
+    _layout(figure, palette, "Round", "Lap time (s)")
+    return figure
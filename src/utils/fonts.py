@@ -0,0 +1,121 @@
+# Process-wide font registry shared by every chart renderer
+
+# Imports
+import os
+import threading
+from typing import TYPE_CHECKING
+
+from .paths import ASSETS_DIR
+
+# matplotlib is only loaded once a chart asks for a font
+if TYPE_CHECKING:
+    import matplotlib.font_manager as fm
+
+FONTS_DIR: str = os.path.join(ASSETS_DIR, "fonts")
+
+# Font file of every face, per family and weight
+FONT_FAMILIES: dict[str, dict[str, str]] = {
+    "roboto": {
+        "regular": "Roboto-Regular.ttf",
+        "light": "Roboto-Light.ttf",
+        "bold": "Roboto-Bold.ttf",
+    },
+    "f1": {
+        "regular": "Formula1-Regular.ttf",
+        "wide": "Formula1-Wide.ttf",
+        "bold": "Formula1-Bold.ttf",
+    },
+}
+
+# Families used by the page CSS, shipped to browsers as subsets
+WEB_FONT_FAMILIES: list[str] = ["f1"]
+
+# Code points kept in the web-font subsets: Basic Latin, Latin-1 (accented driver
+# names), dashes, quotes, ellipsis, the euro sign and arrows
+WEB_FONT_UNICODES: list[tuple[int, int]] = [
+    (0x0020, 0x007E),
+    (0x00A0, 0x00FF),
+    (0x2013, 0x2026),
+    (0x20AC, 0x20AC),
+    (0x2190, 0x2193),
+]
+
+_lock: threading.Lock = threading.Lock()
+_registry: dict[str, "fm.FontProperties"] = {}
+
+
+def font_path(which: str, weight: str) -> str:
+    """
+    Path of a font face under `src/assets/fonts`.
+
+    Args:
+        which (str): Font family, one of `FONT_FAMILIES`.
+        weight (str): Face within the family, e.g. "regular" or "bold".
+
+    Returns:
+        (str): Absolute path to the TTF file.
+    """
+    # Inputs checking
+    family: dict[str, str] | None = FONT_FAMILIES.get(which.lower())
+    if family is None:
+        raise ValueError(
+            f"Unknown font type. Please choose from {list(FONT_FAMILIES.keys())}."
+        )
+    if weight not in family:
+        raise ValueError(
+            f"Unknown font weight. Please choose from {list(family.keys())}, or 'all' to get all fonts."
+        )
+
+    return os.path.join(FONTS_DIR, family[weight])
+
+
+def get_font(which: str, weight: str) -> "fm.FontProperties":
+    """
+    Font properties of a face. Each face is resolved and registered with matplotlib's
+    font manager once per process, so charts can also refer to it by family name.
+
+    Args:
+        which (str): Font family, one of `FONT_FAMILIES`.
+        weight (str): Face within the family, e.g. "regular" or "bold".
+
+    Returns:
+        (fm.FontProperties): Shared font properties of the face.
+    """
+    path: str = font_path(which, weight)
+
+    font: "fm.FontProperties | None" = _registry.get(path)
+    if font is not None:
+        return font
+
+    import matplotlib.font_manager as fm
+
+    with _lock:
+        if path not in _registry:
+            fm.fontManager.addfont(path)
+            _registry[path] = fm.FontProperties(fname=path)
+
+        return _registry[path]
+
+
+def registered_fonts() -> list[str]:
+    """
+    Font files resolved so far in this process.
+
+    Returns:
+        (list[str]): Paths of the registered faces.
+    """
+    with _lock:
+        return sorted(_registry.keys())
+
+
+def web_font_unicode_range() -> str:
+    """
+    `unicode-range` descriptor matching the web-font subsets.
+
+    Returns:
+        (str): E.g. "U+0020-007E, U+00A0-00FF, ...".
+    """
+    return ", ".join(
+        f"U+{first:04X}" if first == last else f"U+{first:04X}-{last:04X}"
+        for first, last in WEB_FONT_UNICODES
+    )
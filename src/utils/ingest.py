@@ -0,0 +1,473 @@
+# Ingestion layer: parse each CSV once and reuse it across reruns and sessions
+
+# Imports
+import hashlib
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+import pyarrow.feather as feather
+from cachetools import LRUCache
+from loguru import logger
+
+from .paths import DATA_DIR
+
+# Parsed frames are persisted here as Arrow IPC files named after their content hash
+INGEST_CACHE_DIR: str = os.path.join(DATA_DIR, "cache", "ingest")
+
+# Disk budget of the cached Arrow files, least recently used files are deleted first
+DISK_CACHE_BYTES: int = 1 << 30
+
+# Bump whenever `normalise_frame` changes so stale cache files are ignored
+CACHE_VERSION: int = 3
+
+# Object columns of chunked imports with fewer unique values than this share are
+# parsed as categoricals
+CATEGORY_RATIO: float = 0.5
+
+# Files larger than this are parsed with the chunked importer
+STREAM_THRESHOLD: int = 16 << 20
+
+# Compact dtypes for the columns of lap-by-lap and telemetry exports (matched on the
+# lower-cased column name). Integers are nullable so gaps in later chunks still fit.
+# Columns that may hold text ("+1 Lap", "DNF"), like gap or position, are left out;
+# a hinted column that turns out to hold text is read as strings instead.
+DTYPE_HINTS: dict[str, str] = {
+    "lap_time": "float32",
+    "sector_1": "float32",
+    "sector_2": "float32",
+    "sector_3": "float32",
+    "pit_time": "float32",
+    "lap": "Int16",
+    "laps": "Int16",
+    "grid": "Int16",
+    "tyre_age": "Int16",
+    "stint": "Int16",
+    "driver": "category",
+    "team": "category",
+    "track": "category",
+    "compound": "category",
+    "session": "category",
+}
+
+# Trace Python allocations of every import (slow, for profiling), with F1M_TRACE_MEMORY=1
+TRACE_MEMORY: bool = os.environ.get("F1M_TRACE_MEMORY") == "1"
+
+# Reports of the latest parsed files kept for `import_reports`
+IMPORT_REPORTS: int = 64
+
+_lock: threading.Lock = threading.Lock()
+_frames: LRUCache = LRUCache(maxsize=32)
+_digests: dict[str, tuple[int, int, str]] = {}
+_stats: dict[str, int] = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+_reports: list[dict] = []
+
+
+def file_digest(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Fast content hash of a file.
+
+    Args:
+        file_path (str): Path to the file.
+        chunk_size (int, optional): Bytes read per iteration. Defaults to 1 MiB.
+
+    Returns:
+        (str): Hex digest (BLAKE2b, 16 bytes).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def file_key(file_path: str) -> str:
+    """
+    Cache key of a file. The content is only re-hashed when its size or mtime changed.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        (str): Content digest of the file.
+    """
+    path: str = os.path.abspath(file_path)
+    stat: os.stat_result = os.stat(path)
+
+    with _lock:
+        known: tuple[int, int, str] | None = _digests.get(path)
+    if known is not None and known[:2] == (stat.st_size, stat.st_mtime_ns):
+        return known[2]
+
+    digest: str = file_digest(path)
+    with _lock:
+        _digests[path] = (stat.st_size, stat.st_mtime_ns, digest)
+
+    return digest
+
+
+def normalise_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalise a freshly parsed frame. Dtypes are left as parsed: the race store
+    stores every column with a fixed type, so files of one table always match.
+
+    Args:
+        df (pd.DataFrame): Raw frame from `pd.read_csv`.
+
+    Returns:
+        (pd.DataFrame): Frame with stripped column names and text values.
+    """
+    df = df.rename(columns=lambda column: str(column).strip())
+
+    for column in df.columns:
+        series: pd.Series = df[column]
+        if pd.api.types.infer_dtype(series, skipna=True) == "string":
+            df[column] = series.str.strip()
+
+    return df
+
+
+def infer_dtypes(sample: pd.DataFrame) -> dict[str, str]:
+    """
+    Pick compact dtypes for every column from a sample of the file.
+
+    Args:
+        sample (pd.DataFrame): First chunk of the file, parsed with default dtypes.
+
+    Returns:
+        (dict[str, str]): Dtype per column name, usable as `pd.read_csv(dtype=...)`.
+    """
+    dtypes: dict[str, str] = {}
+    for column in sample.columns:
+        hint: str | None = DTYPE_HINTS.get(str(column).strip().lower())
+        series: pd.Series = sample[column]
+        if hint is not None:
+            dtypes[column] = hint
+        elif pd.api.types.is_float_dtype(series):
+            dtypes[column] = "float32"
+        elif pd.api.types.is_integer_dtype(series):
+            dtypes[column] = "Int32"
+        elif pd.api.types.is_bool_dtype(series):
+            dtypes[column] = "boolean"
+        elif len(series) and series.nunique() / len(series) < CATEGORY_RATIO:
+            dtypes[column] = "category"
+        else:
+            dtypes[column] = "object"
+
+    return dtypes
+
+
+def stream_csv(
+    file_path: str,
+    chunk_size: int = 100_000,
+    measure_memory: bool | None = None,
+) -> tuple[pd.DataFrame, dict[str, float]]:
+    """
+    Import a large CSV in chunks with compact dtypes.
+
+    Dtypes are inferred once from the first chunk and enforced on the rest, so every chunk
+    is already small when it is parsed. The final frame is assembled column by column,
+    releasing the chunks as it goes instead of holding a second full copy.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        chunk_size (int, optional): Rows per chunk. Defaults to 100,000.
+        measure_memory (bool | None, optional): Track peak memory with `tracemalloc`. This
+            slows the import down considerably, so only use it when profiling. Defaults to
+            `TRACE_MEMORY`.
+
+    Returns:
+        (tuple[pd.DataFrame, dict[str, float]]): The frame and the import report, see
+            `import_reports`.
+    """
+    measure_memory = TRACE_MEMORY if measure_memory is None else measure_memory
+    tracing: bool = measure_memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    started: float = time.perf_counter()
+
+    try:
+        sample: pd.DataFrame = pd.read_csv(
+            file_path, delimiter=",", encoding="utf-8", nrows=chunk_size
+        )
+        dtypes: dict[str, str] = infer_dtypes(sample)
+        del sample
+
+        # Numeric dtypes are applied per chunk, so a column holding text somewhere
+        # ("DNF", "+1 Lap") can fall back to strings instead of failing the import
+        numeric: dict[str, str] = {
+            column: dtype
+            for column, dtype in dtypes.items()
+            if dtype not in ["category", "object"]
+        }
+        text: list[str] = []
+        chunks: list[pd.DataFrame] = []
+        for chunk in pd.read_csv(
+            file_path,
+            delimiter=",",
+            encoding="utf-8",
+            dtype={c: d for c, d in dtypes.items() if c not in numeric},
+            chunksize=chunk_size,
+        ):
+            for column, dtype in list(numeric.items()):
+                try:
+                    chunk[column] = chunk[column].astype(dtype)
+                except (ValueError, TypeError):
+                    logger.debug(f"{file_path}: {column} holds text, read as strings")
+                    del numeric[column]
+                    text.append(column)
+            chunks.append(chunk.drop(columns=text))
+
+        # Re-read the columns with text in one pass, as strings
+        strings: pd.DataFrame = (
+            pd.read_csv(
+                file_path,
+                delimiter=",",
+                encoding="utf-8",
+                usecols=text,
+                dtype="string",
+            )
+            if text
+            else pd.DataFrame()
+        )
+
+        # Assemble column by column, dropping each column from the chunks once copied
+        columns: dict[str, pd.Series] = {}
+        for column in dtypes:
+            if column in text:
+                columns[column] = strings.pop(column)
+                continue
+            parts: list[pd.Series] = [chunk.pop(column) for chunk in chunks]
+            if dtypes[column] == "category":
+                columns[column] = pd.Series(
+                    union_categoricals(parts, ignore_order=True), name=column
+                )
+            else:
+                columns[column] = pd.concat(parts, ignore_index=True)
+            del parts
+        del chunks
+        df: pd.DataFrame = pd.DataFrame(columns, copy=False)
+        del columns
+
+        seconds: float = time.perf_counter() - started
+        peak: int = tracemalloc.get_traced_memory()[1] if tracing else 0
+    finally:
+        if tracing:
+            tracemalloc.stop()
+
+    return df, _record_import(file_path, len(df), seconds, peak)
+
+
+def _peak_rss() -> int:
+    # High-water mark (bytes) of the process memory, 0 where `resource` is missing
+    try:
+        import resource
+    except ImportError:
+        return 0
+
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _record_import(
+    file_path: str, rows: int, seconds: float, traced: int
+) -> dict[str, Any]:
+    report: dict[str, Any] = {
+        "file": file_path,
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds) if seconds else 0,
+        "peak_memory_mb": round(traced / (1 << 20), 1),
+        "peak_rss_mb": round(_peak_rss() / (1 << 20), 1),
+    }
+    memory: str = (
+        f"traced peak {report['peak_memory_mb']} MiB"
+        if traced
+        else f"process peak {report['peak_rss_mb']} MiB"
+    )
+    logger.info(
+        f"Imported {file_path}: {rows} rows in {report['seconds']}s "
+        f"({report['rows_per_second']} rows/s, {memory})"
+    )
+    with _lock:
+        _reports.append(report)
+        del _reports[:-IMPORT_REPORTS]
+    return report
+
+
+def _cache_path(digest: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, f"{digest}-v{CACHE_VERSION}.arrow")
+
+
+def evict_disk_cache(
+    cache_dir: str, budget: int, keep: str | None = None, suffix: str = ".arrow"
+) -> int:
+    """
+    Trim a cache folder to a size budget, deleting the least recently used files first.
+    Files are touched on every cache hit, so the oldest mtime is the least recently used.
+
+    Args:
+        cache_dir (str): Cache folder.
+        budget (int): Maximum total size (bytes) of the cached files.
+        keep (str | None, optional): File never deleted, e.g. the one just written. Defaults to None.
+        suffix (str, optional): Only files with this suffix are cache entries. Defaults to ".arrow".
+
+    Returns:
+        (int): Number of deleted files.
+    """
+    entries: list[tuple[float, int, str]] = []
+    for name in os.listdir(cache_dir):
+        path: str = os.path.join(cache_dir, name)
+        if not name.endswith(suffix):
+            continue
+        try:
+            stat: os.stat_result = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total: int = sum(size for _, size, _ in entries)
+    removed: int = 0
+    for _, size, path in sorted(entries):
+        if total <= budget:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+
+    if removed:
+        logger.debug(f"Evicted {removed} files from {cache_dir}")
+    return removed
+
+
+def read_csv_cached(
+    file_path: str,
+    cache_dir: str = INGEST_CACHE_DIR,
+) -> pd.DataFrame:
+    """
+    Read a CSV through the ingestion cache (memory first, then disk, then parse). Both
+    levels are LRU: the disk cache is trimmed to `DISK_CACHE_BYTES` after each write.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        cache_dir (str, optional): Folder of the on-disk cache. Defaults to `INGEST_CACHE_DIR`.
+
+    Returns:
+        (pd.DataFrame): Normalised frame. It is a copy, so callers are free to modify it.
+    """
+    digest: str = file_key(file_path)
+
+    with _lock:
+        df: pd.DataFrame | None = _frames.get(digest)
+        if df is not None:
+            _stats["memory_hits"] += 1
+            return df.copy()
+
+    cache_path: str = _cache_path(digest, cache_dir)
+    if os.path.exists(cache_path):
+        df = feather.read_feather(cache_path)
+        # Mark the file as recently used for the disk eviction
+        os.utime(cache_path)
+        stat: str = "disk_hits"
+    else:
+        if os.path.getsize(file_path) > STREAM_THRESHOLD:
+            df = stream_csv(file_path)[0]
+        else:
+            started: float = time.perf_counter()
+            df = pd.read_csv(file_path, delimiter=",", encoding="utf-8")
+            _record_import(file_path, len(df), time.perf_counter() - started, 0)
+        df = normalise_frame(df)
+
+        # Write to a temporary name first so concurrent readers never see partial files
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path: str = f"{cache_path}.{threading.get_ident()}.tmp"
+        feather.write_feather(df, tmp_path, compression="lz4")
+        os.replace(tmp_path, cache_path)
+        evict_disk_cache(cache_dir, DISK_CACHE_BYTES, keep=cache_path)
+        stat = "misses"
+
+    with _lock:
+        _frames[digest] = df
+        _stats[stat] += 1
+
+    return df.copy()
+
+
+def ingest_folder(
+    folder: str,
+    extension: str = ".csv",
+    cache_dir: str = INGEST_CACHE_DIR,
+) -> dict[str, pd.DataFrame]:
+    """
+    Read every CSV of a folder (e.g. a season export). Only new or changed files are parsed.
+
+    Args:
+        folder (str): Folder to scan (not recursive).
+        extension (str, optional): File extension to pick up. Defaults to ".csv".
+        cache_dir (str, optional): Folder of the on-disk cache. Defaults to `INGEST_CACHE_DIR`.
+
+    Returns:
+        (dict[str, pd.DataFrame]): Frames keyed by file path, in file name order.
+    """
+    file_paths: list[str] = sorted(
+        os.path.join(folder, name)
+        for name in os.listdir(folder)
+        if name.lower().endswith(extension)
+    )
+
+    return {path: read_csv_cached(path, cache_dir) for path in file_paths}
+
+
+def import_reports() -> list[dict]:
+    """
+    Reports of the latest parsed files (cache hits are not parsed), oldest first.
+
+    Returns:
+        (list[dict]): `file`, `rows`, `seconds`, `rows_per_second`, `peak_memory_mb`
+            (traced Python allocations, 0 unless `TRACE_MEMORY` or `measure_memory`) and
+            `peak_rss_mb` (high-water mark of the process memory after the import).
+    """
+    with _lock:
+        return [dict(report) for report in _reports]
+
+
+def cache_stats() -> dict[str, int]:
+    """
+    Hit/miss counters of the ingestion cache since the process started.
+
+    Returns:
+        (dict[str, int]): `memory_hits`, `disk_hits`, `misses` and the current `memory_entries`.
+    """
+    with _lock:
+        return {**_stats, "memory_entries": len(_frames)}
+
+
+def clear_cache(disk: bool = False, cache_dir: str = INGEST_CACHE_DIR) -> None:
+    """
+    Drop the in-memory cache and optionally the on-disk cache too.
+
+    Args:
+        disk (bool, optional): Also delete the cached Arrow files. Defaults to False.
+        cache_dir (str, optional): Folder of the on-disk cache. Defaults to `INGEST_CACHE_DIR`.
+    """
+    with _lock:
+        _frames.clear()
+        _digests.clear()
+        for key in _stats:
+            _stats[key] = 0
+
+    if disk and os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            os.remove(os.path.join(cache_dir, name))
@@ -0,0 +1,15 @@
+# Shared filesystem locations used by the data utilities
+
+# Imports
+import os
+
+# Repository root (the dashboard is always launched from here through `main.py`)
+ROOT_DIR: str = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+# Generated data (race store, caches, indices) lives outside of `src`
+DATA_DIR: str = os.path.join(ROOT_DIR, "data")
+
+# Bundled assets (logos and fonts)
+ASSETS_DIR: str = os.path.join(ROOT_DIR, "src", "assets")
@@ -0,0 +1,248 @@
+# Precomputed pit stop benchmarks: every team against the 10 fastest stops
+
+# Imports
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .paths import DATA_DIR
+from .race_store import STORE_DIR, read_table
+
+# One Parquet file per season, so reads and updates never touch other seasons
+INDEX_DIR: str = os.path.join(DATA_DIR, "index", "pit_stops")
+
+# Pseudo-team holding the fastest stops of every round
+BENCHMARK: str = "Top 10"
+BENCHMARK_STOPS: int = 10
+
+# Number of rounds in the rolling form trend
+FORM_WINDOW: int = 3
+
+INDEX_COLUMNS: list[str] = [
+    "scope",
+    "round",
+    "team",
+    "stops",
+    "median",
+    "p10",
+    "p90",
+    "form",
+    "times",
+]
+
+
+def _index_path(season: int, index_dir: str) -> str:
+    return os.path.join(index_dir, f"season={season}.parquet")
+
+
+def _summary_rows(
+    times: dict[str, np.ndarray], scope: str, round_no: int
+) -> pd.DataFrame:
+    # Median and p10/p90 of the stop times of every team
+    return pd.DataFrame(
+        [
+            {
+                "scope": scope,
+                "round": round_no,
+                "team": team,
+                "stops": len(values),
+                "median": float(np.median(values)),
+                "p10": float(np.percentile(values, 10)),
+                "p90": float(np.percentile(values, 90)),
+                "form": np.nan,
+                "times": np.sort(values),
+            }
+            for team, values in times.items()
+            if len(values)
+        ],
+        columns=INDEX_COLUMNS,
+    )
+
+
+def update_pit_index(
+    stops: pd.DataFrame,
+    season: int,
+    round_no: int,
+    time_column: str = "pit_time",
+    index_dir: str = INDEX_DIR,
+) -> pd.DataFrame:
+    """
+    Add (or replace) one round in the pit stop index of its season.
+
+    Only the stops of that round are grouped. Season-to-date figures are rebuilt from the
+    sorted stop times already kept per round, so the cost of an update depends on the
+    length of a season and never on how many seasons are stored.
+
+    Args:
+        stops (pd.DataFrame): Pit stops of the round with a `team` and a stop time column.
+        season (int): Season of the round.
+        round_no (int): Round number.
+        time_column (str, optional): Stop time column (s). Defaults to "pit_time".
+        index_dir (str, optional): Folder of the index. Defaults to `INDEX_DIR`.
+
+    Returns:
+        (pd.DataFrame): The updated index of the season.
+    """
+    # Input checking
+    if not {"team", time_column} <= set(stops.columns):
+        raise ValueError(f"Pit stop data needs `team` and `{time_column}` columns.")
+
+    path: str = _index_path(season, index_dir)
+    index: pd.DataFrame = (
+        pd.read_parquet(path)
+        if os.path.exists(path)
+        else pd.DataFrame(columns=INDEX_COLUMNS)
+    )
+    rounds: pd.DataFrame = index[
+        (index["scope"] == "round") & (index["round"] != round_no)
+    ]
+
+    # Summaries of the new round, plus the benchmark of its fastest stops
+    valid: pd.DataFrame = stops.dropna(subset=[time_column])
+    times: dict[str, np.ndarray] = {
+        str(team): group.to_numpy(dtype=float)
+        for team, group in valid.groupby("team", observed=True)[time_column]
+    }
+    times[BENCHMARK] = np.sort(valid[time_column].to_numpy(dtype=float))[
+        :BENCHMARK_STOPS
+    ]
+    frames: list[pd.DataFrame] = [
+        frame
+        for frame in (rounds, _summary_rows(times, "round", round_no))
+        if not frame.empty
+    ]
+    if not frames:
+        # No stop times left in the season: drop its index rather than keep stale rows
+        if os.path.exists(path):
+            os.remove(path)
+        return pd.DataFrame(columns=INDEX_COLUMNS)
+    rounds = pd.concat(frames, ignore_index=True).sort_values(
+        ["round", "team"], ignore_index=True
+    )
+
+    # Rolling form: mean of the last few round medians of every team
+    rounds["form"] = (
+        rounds.groupby("team")["median"]
+        .rolling(FORM_WINDOW, min_periods=1)
+        .mean()
+        .reset_index(level=0, drop=True)
+    )
+
+    # Season to date, from the stored stop times of every round
+    season_times: dict[str, np.ndarray] = {
+        team: np.concatenate(group.to_list())
+        for team, group in rounds.groupby("team")["times"]
+    }
+    season_rows: pd.DataFrame = _summary_rows(
+        season_times, "season", int(rounds["round"].max())
+    )
+    season_rows["form"] = season_rows["team"].map(rounds.groupby("team")["form"].last())
+
+    index = pd.concat([rounds, season_rows], ignore_index=True)
+    os.makedirs(index_dir, exist_ok=True)
+    index.to_parquet(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+
+    return index
+
+
+def update_pit_index_from_store(
+    season: int,
+    round_no: int,
+    time_column: str = "pit_time",
+    index_dir: str = INDEX_DIR,
+    store_dir: str = STORE_DIR,
+) -> pd.DataFrame:
+    """
+    Refresh one round of the index from the `pit_stops` table of the race store.
+
+    Args:
+        season (int): Season of the round.
+        round_no (int): Round number.
+        time_column (str, optional): Stop time column (s). Defaults to "pit_time".
+        index_dir (str, optional): Folder of the index. Defaults to `INDEX_DIR`.
+        store_dir (str, optional): Root folder of the store. Defaults to `STORE_DIR`.
+
+    Returns:
+        (pd.DataFrame): The updated index of the season.
+    """
+    stops: pd.DataFrame = read_table(
+        "pit_stops",
+        columns=["team", time_column],
+        season=season,
+        round_no=round_no,
+        session="race",
+        store_dir=store_dir,
+    )
+    return update_pit_index(stops, season, round_no, time_column, index_dir)
+
+
+def pit_index_seasons(index_dir: str = INDEX_DIR) -> list[int]:
+    """
+    Seasons that have a pit stop index.
+
+    Args:
+        index_dir (str, optional): Folder of the index. Defaults to `INDEX_DIR`.
+
+    Returns:
+        (list[int]): Seasons in ascending order.
+    """
+    if not os.path.isdir(index_dir):
+        return []
+
+    return sorted(
+        int(name[len("season=") : -len(".parquet")])
+        for name in os.listdir(index_dir)
+        if name.startswith("season=") and name.endswith(".parquet")
+    )
+
+
+def pit_index_version(season: int, index_dir: str = INDEX_DIR) -> float:
+    """
+    Version of a season's pit stop index, which changes every time it is updated.
+
+    Args:
+        season (int): Season.
+        index_dir (str, optional): Folder of the index. Defaults to `INDEX_DIR`.
+
+    Returns:
+        (float): Modification time of the index, 0 if the season has none.
+    """
+    path: str = _index_path(season, index_dir)
+    return os.path.getmtime(path) if os.path.exists(path) else 0.0
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _load_index(path: str, version: float) -> pd.DataFrame:
+    return pd.read_parquet(path).drop(columns="times")
+
+
+def load_pit_index(
+    season: int,
+    scope: str = "round",
+    index_dir: str = INDEX_DIR,
+) -> pd.DataFrame:
+    """
+    Read the pit stop index of a season. Cached until the season is updated again.
+
+    Args:
+        season (int): Season to read.
+        scope (str, optional): "round" for per-round figures or "season" for season to date. Defaults to "round".
+        index_dir (str, optional): Folder of the index. Defaults to `INDEX_DIR`.
+
+    Returns:
+        (pd.DataFrame): `round`, `team`, `stops`, `median`, `p10`, `p90` and `form` rows,
+            empty if the season has no pit stops yet.
+    """
+    # Input checking
+    if scope not in ["round", "season"]:
+        raise ValueError("Unknown scope. Please choose between 'round' or 'season'.")
+
+    path: str = _index_path(season, index_dir)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=[c for c in INDEX_COLUMNS if c != "times"])
+
+    index: pd.DataFrame = _load_index(path, pit_index_version(season, index_dir))
+    return index[index["scope"] == scope].drop(columns="scope").reset_index(drop=True)
@@ -0,0 +1,438 @@
+# Columnar race data store backed by Parquet datasets
+
+# Imports
+import os
+import shutil
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import streamlit as st
+
+from .ingest import DTYPE_HINTS, read_csv_cached
+from .paths import DATA_DIR
+
+# Every table (results, laps, pit stops, ...) is its own Parquet dataset under here
+STORE_DIR: str = os.path.join(DATA_DIR, "store")
+
+# Marker file touched on every write (ignored by the dataset reader)
+VERSION_FILE: str = "_version"
+
+# Session types a race weekend can produce
+SESSION_TYPES: list[str] = ["qualifying", "sprint_qualifying", "sprint", "race"]
+
+# Hive-style partition keys: <table>/season=2024/round=3/session=race/part-0.parquet
+PARTITION_SCHEMA: pa.Schema = pa.schema(
+    [
+        ("season", pa.int16()),
+        ("round", pa.int16()),
+        ("session", pa.string()),
+    ]
+)
+
+
+# Stored type of the hinted columns of `ingest.DTYPE_HINTS`, so they stay compact
+HINT_TYPES: dict[str, pa.DataType] = {
+    "float32": pa.float32(),
+    "Int16": pa.int16(),
+    "category": pa.dictionary(pa.int32(), pa.string()),
+}
+
+_lock: threading.Lock = threading.Lock()
+# Table path -> (version stamp, unified schema of its files)
+_schemas: dict[str, tuple[int, pa.Schema]] = {}
+
+
+def _store_type(data_type: pa.DataType) -> pa.DataType:
+    # One type per kind of column, whatever the size of the values of a single file
+    if pa.types.is_integer(data_type):
+        return pa.int64()
+    if pa.types.is_floating(data_type):
+        return pa.float64()
+    if (
+        pa.types.is_string(data_type)
+        or pa.types.is_large_string(data_type)
+        or pa.types.is_dictionary(data_type)
+        or pa.types.is_null(data_type)
+    ):
+        return pa.string()
+    return data_type
+
+
+def _store_column(name: str, column: pa.ChunkedArray) -> pa.ChunkedArray:
+    # Hinted columns keep their compact type whenever the values fit it (the cast is
+    # safe: text, fractions and overflows fail), the others get one type per kind
+    hint: pa.DataType | None = HINT_TYPES.get(DTYPE_HINTS.get(name.lower(), ""))
+    if hint is not None:
+        try:
+            return column.cast(hint)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
+    return column.cast(_store_type(column.type))
+
+
+def _unify_schemas(schemas: list[pa.Schema]) -> pa.Schema:
+    # Widen numeric types across files (int8 + int16 -> int16, int + float -> float);
+    # columns whose types cannot be reconciled (e.g. numbers and "DNF") become text
+    try:
+        return pa.unify_schemas(schemas, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        pass
+
+    fields: dict[str, list[pa.Field]] = {}
+    for schema in schemas:
+        for field in schema:
+            fields.setdefault(field.name, []).append(field)
+
+    unified: list[pa.Field] = []
+    for name, candidates in fields.items():
+        try:
+            unified.append(
+                pa.unify_schemas(
+                    [pa.schema([field]) for field in candidates],
+                    promote_options="permissive",
+                ).field(0)
+            )
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            unified.append(pa.field(name, pa.string()))
+
+    return pa.schema(unified)
+
+
+def table_schema(table: str, store_dir: str = STORE_DIR) -> pa.Schema | None:
+    """
+    Schema shared by every file of a table, so rounds stored with different column
+    types (int8 and int16, or numbers and text) are still read together. Cached until
+    the table is written again.
+
+    Args:
+        table (str): Name of the dataset.
+        store_dir (str, optional): Root folder of the store. Defaults to `STORE_DIR`.
+
+    Returns:
+        (pa.Schema | None): Data columns (without the partition keys), None if the table
+            does not exist yet.
+    """
+    path: str = os.path.join(store_dir, table)
+    if not os.path.isdir(path):
+        return None
+
+    marker: str = os.path.join(path, VERSION_FILE)
+    version: int = os.stat(marker).st_mtime_ns if os.path.exists(marker) else 0
+    with _lock:
+        cached: tuple[int, pa.Schema] | None = _schemas.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    fragments: list[ds.Fragment] = list(
+        ds.dataset(
+            path,
+            format="parquet",
+            partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+            ignore_prefixes=[".", "_"],
+        ).get_fragments()
+    )
+    schema: pa.Schema = _unify_schemas(
+        [fragment.physical_schema for fragment in fragments]
+    )
+    with _lock:
+        _schemas[path] = (version, schema)
+
+    return schema
+
+
+def _partition_dir(
+    table: str, season: int, round_no: int, session: str, store_dir: str
+) -> str:
+    return os.path.join(
+        store_dir,
+        table,
+        f"season={season}",
+        f"round={round_no}",
+        f"session={session}",
+    )
+
+
+def write_session(
+    df: pd.DataFrame | pa.Table,
+    table: str,
+    season: int,
+    round_no: int,
+    session: str,
+    store_dir: str = STORE_DIR,
+) -> str:
+    """
+    Write the data of a single session into the store, replacing whatever was there before.
+
+    Args:
+        df (pd.DataFrame | pa.Table): Session data. Partition columns are dropped if present.
+        table (str): Name of the dataset, e.g. "results", "laps" or "pit_stops".
+        season (int): Season of the session.
+        round_no (int): Round number within the season (1-based).
+        session (str): One of `SESSION_TYPES`.
+        store_dir (str, optional): Root folder of the store. Defaults to `STORE_DIR`.
+
+    Returns:
+        (str): Path of the written Parquet file.
+    """
+    # Input checking
+    if session not in SESSION_TYPES:
+        raise ValueError(
+            f"Unknown session type: {session}. Please choose from {SESSION_TYPES}."
+        )
+    if round_no < 1:
+        raise ValueError("Round numbers start at 1.")
+
+    arrow_table: pa.Table = (
+        df
+        if isinstance(df, pa.Table)
+        else pa.Table.from_pandas(df, preserve_index=False)
+    )
+    # The partition values live in the folder names, not in the files
+    arrow_table = arrow_table.drop_columns(
+        [name for name in PARTITION_SCHEMA.names if name in arrow_table.column_names]
+    )
+
+    # Store the columns with fixed types (the hinted compact type, else int64, float64
+    # or string), widened to the table's types if an earlier session needed more room
+    arrow_table = pa.table(
+        {
+            name: _store_column(name, arrow_table.column(name))
+            for name in arrow_table.column_names
+        }
+    )
+    stored: pa.Schema | None = table_schema(table, store_dir)
+    if stored is not None:
+        schema: pa.Schema = _unify_schemas([stored, arrow_table.schema])
+        arrow_table = arrow_table.cast(
+            pa.schema([schema.field(name) for name in arrow_table.column_names])
+        )
+
+    # Write next to the partition first so readers never see a half-written file
+    partition: str = _partition_dir(table, season, round_no, session, store_dir)
+    tmp_partition: str = os.path.join(
+        os.path.dirname(partition), "." + os.path.basename(partition) + ".tmp"
+    )
+    shutil.rmtree(tmp_partition, ignore_errors=True)
+    os.makedirs(tmp_partition)
+    pq.write_table(
+        arrow_table,
+        os.path.join(tmp_partition, "part-0.parquet"),
+        compression="zstd",
+    )
+    shutil.rmtree(partition, ignore_errors=True)
+    os.replace(tmp_partition, partition)
+
+    # Bump the table version so cached reads get invalidated
+    with open(os.path.join(store_dir, table, VERSION_FILE), "w") as file:
+        file.write(partition)
+
+    return os.path.join(partition, "part-0.parquet")
+
+
+def import_csv(
+    file_path: str,
+    table: str,
+    season: int,
+    round_no: int,
+    session: str,
+    store_dir: str = STORE_DIR,
+) -> str:
+    """
+    Parse an exported CSV once and persist it into the store.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        table (str): Name of the dataset to write into.
+        season (int): Season of the session.
+        round_no (int): Round number within the season.
+        session (str): One of `SESSION_TYPES`.
+        store_dir (str, optional): Root folder of the store. Defaults to `STORE_DIR`.
+
+    Returns:
+        (str): Path of the written Parquet file.
+    """
+    df: pd.DataFrame = read_csv_cached(file_path)
+    return write_session(df, table, season, round_no, session, store_dir)
+
+
+def _as_list(value) -> list | None:
+    if value is None:
+        return None
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def _filter_expression(
+    season: int | list[int] | None = None,
+    round_no: int | list[int] | None = None,
+    session: str | list[str] | None = None,
+) -> ds.Expression | None:
+    expression: ds.Expression | None = None
+    for field, value in (("season", season), ("round", round_no), ("session", session)):
+        values: list | None = _as_list(value)
+        if values is None:
+            continue
+        condition: ds.Expression = ds.field(field).isin(values)
+        expression = condition if expression is None else expression & condition
+
+    return expression
+
+
+def open_table(table: str, store_dir: str = STORE_DIR) -> ds.Dataset | None:
+    """
+    Open a dataset of the store. No data is read, only the file footers for
+    `table_schema`, once per table version.
+
+    Args:
+        table (str): Name of the dataset.
+        store_dir (str, optional): Root folder of the store. Defaults to `STORE_DIR`.
+
+    Returns:
+        (ds.Dataset | None): The dataset, or None if nothing has been imported yet.
+    """
+    schema: pa.Schema | None = table_schema(table, store_dir)
+    if schema is None:
+        return None
+
+    # One schema for all files, each file is cast to it while it is read
+    return ds.dataset(
+        os.path.join(store_dir, table),
+        format="parquet",
+        schema=pa.unify_schemas([schema, PARTITION_SCHEMA]),
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+        # Skip partitions that are still being written and the version marker
+        ignore_prefixes=[".", "_"],
+    )
+
+
+def read_table(
+    table: str,
+    columns: list[str] | None = None,
+    season: int | list[int] | None = None,
+    round_no: int | list[int] | None = None,
+    session: str | list[str] | None = None,
+    filter: ds.Expression | None = None,
+    store_dir: str = STORE_DIR,
+) -> pd.DataFrame:
+    """
+    Read rows and columns from the store. Only the requested columns are decoded and
+    partitions that do not match the season/round/session filters are never opened.
+
+    Args:
+        table (str): Name of the dataset.
+        columns (list[str] | None, optional): Columns to load. Defaults to all columns.
+        season (int | list[int] | None, optional): Season(s) to keep. Defaults to all.
+        round_no (int | list[int] | None, optional): Round(s) to keep. Defaults to all.
+        session (str | list[str] | None, optional): Session type(s) to keep. Defaults to all.
+        filter (ds.Expression | None, optional): Extra row filter pushed down to the Parquet reader.
+        store_dir (str, optional): Root folder of the store. Defaults to `STORE_DIR`.
+
+    Returns:
+        (pd.DataFrame): The matching rows, empty if the table does not exist yet.
+    """
+    dataset: ds.Dataset | None = open_table(table, store_dir)
+    if dataset is None:
+        return pd.DataFrame(columns=columns)
+
+    expression: ds.Expression | None = _filter_expression(season, round_no, session)
+    if filter is not None:
+        expression = filter if expression is None else expression & filter
+
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+def list_partitions(table: str, store_dir: str = STORE_DIR) -> pd.DataFrame:
+    """
+    List the sessions available in a table from the folder layout alone.
+
+    Args:
+        table (str): Name of the dataset.
+        store_dir (str, optional): Root folder of the store. Defaults to `STORE_DIR`.
+
+    Returns:
+        (pd.DataFrame): One row per stored session with `season`, `round` and `session` columns.
+    """
+    dataset: ds.Dataset | None = open_table(table, store_dir)
+    if dataset is None:
+        return pd.DataFrame(columns=PARTITION_SCHEMA.names)
+
+    partitions: list[dict] = [
+        ds.get_partition_keys(fragment.partition_expression)
+        for fragment in dataset.get_fragments()
+    ]
+    return (
+        pd.DataFrame(partitions, columns=PARTITION_SCHEMA.names)
+        .drop_duplicates()
+        .sort_values(PARTITION_SCHEMA.names)
+        .reset_index(drop=True)
+    )
+
+
+def table_version(table: str, store_dir: str = STORE_DIR) -> float:
+    """
+    Cheap version stamp of a table, used to invalidate cached reads after an import.
+
+    Args:
+        table (str): Name of the dataset.
+        store_dir (str, optional): Root folder of the store. Defaults to `STORE_DIR`.
+
+    Returns:
+        (float): Modification time of the table's version marker, 0 if the table does not exist.
+    """
+    marker: str = os.path.join(store_dir, table, VERSION_FILE)
+    return os.stat(marker).st_mtime if os.path.exists(marker) else 0.0
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _load_table_cached(
+    table: str,
+    columns: tuple[str, ...] | None,
+    season: tuple | None,
+    round_no: tuple | None,
+    session: tuple | None,
+    version: float,
+) -> pd.DataFrame:
+    return read_table(
+        table,
+        columns=list(columns) if columns is not None else None,
+        season=season,
+        round_no=round_no,
+        session=session,
+    )
+
+
+def load_table(
+    table: str,
+    columns: list[str] | None = None,
+    season: int | list[int] | None = None,
+    round_no: int | list[int] | None = None,
+    session: str | list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Page-facing wrapper of `read_table`, cached across reruns until the table is re-imported.
+
+    Args:
+        table (str): Name of the dataset.
+        columns (list[str] | None, optional): Columns to load. Defaults to all columns.
+        season (int | list[int] | None, optional): Season(s) to keep. Defaults to all.
+        round_no (int | list[int] | None, optional): Round(s) to keep. Defaults to all.
+        session (str | list[str] | None, optional): Session type(s) to keep. Defaults to all.
+
+    Returns:
+        (pd.DataFrame): The matching rows.
+    """
+
+    def _key(value) -> tuple | None:
+        values: list | None = _as_list(value)
+        return tuple(values) if values is not None else None
+
+    return _load_table_cached(
+        table,
+        _key(columns),
+        _key(season),
+        _key(round_no),
+        _key(session),
+        table_version(table),
+    )
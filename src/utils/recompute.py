@@ -0,0 +1,373 @@
+# Dependency graph from the imported race data to the derived tables and figures
+
+# Imports
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+import pandas as pd
+from loguru import logger
+
+# Registered nodes, in registration order. A node may only use nodes registered
+# before it, so this order is also a valid recompute order.
+NODES: dict[str, dict[str, Any]] = {}
+
+# Node scopes, narrowest first: "round" nodes hold one value per (season, round),
+# "season" nodes one value per season and "global" nodes a single value
+SCOPES: list[str] = ["round", "season", "global"]
+
+# Recompute records kept for `recompute_trace`
+TRACE_LENGTH: int = 500
+
+_lock: threading.RLock = threading.RLock()
+# (node, season or None, round or None) -> value
+_values: dict[tuple[str, int | None, int | None], Any] = {}
+_trace: deque = deque(maxlen=TRACE_LENGTH)
+_computed: int = 0
+_missing = object()
+
+
+def register_node(
+    name: str, inputs: list[str] | None = None, scope: str = "round"
+) -> Callable:
+    """
+    Decorator adding a derived dataset or figure to the graph.
+
+    The decorated function is called as `compute(season, round_no, **inputs)`, with the
+    values of its inputs for the same round (`round_no` is None for season nodes, and
+    `season` too for global nodes). A node only receives the values of its inputs of
+    the same scope: its narrower inputs are dependencies, so editing any round of the
+    season (or of any season, for a global node) invalidates it, but it reads the data
+    itself (typically from the race store).
+
+    Args:
+        name (str): Unique node name.
+        inputs (list[str] | None, optional): Names of the nodes it is derived from. Defaults to none (a source).
+        scope (str, optional): "round", "season" or "global". Defaults to "round".
+
+    Returns:
+        (Callable): Decorator registering the function and returning it unchanged.
+    """
+    inputs = list(inputs or [])
+
+    # Input checking
+    if scope not in SCOPES:
+        raise ValueError(f"Unknown scope. Please choose from {SCOPES}.")
+    unknown: list[str] = [node for node in inputs if node not in NODES]
+    if unknown:
+        raise ValueError(f"Unknown inputs: {unknown}. Please register them first.")
+    if any(SCOPES.index(NODES[node]["scope"]) > SCOPES.index(scope) for node in inputs):
+        raise ValueError(f"{scope.capitalize()} nodes cannot depend on wider nodes.")
+
+    def decorator(compute: Callable) -> Callable:
+        with _lock:
+            if name in NODES:
+                raise ValueError(f"Node {name} is already registered.")
+            NODES[name] = {"inputs": inputs, "scope": scope, "compute": compute}
+        return compute
+
+    return decorator
+
+
+def downstream(name: str) -> list[str]:
+    """
+    Nodes derived, directly or not, from a node.
+
+    Args:
+        name (str): Node name.
+
+    Returns:
+        (list[str]): Descendants in recompute order.
+    """
+    # Input checking
+    if name not in NODES:
+        raise ValueError(f"Unknown node: {name}.")
+
+    reached: set[str] = {name}
+    for node, spec in NODES.items():
+        if any(parent in reached for parent in spec["inputs"]):
+            reached.add(node)
+
+    return [node for node in NODES if node in reached and node != name]
+
+
+def _key(name: str, season: int | None, round_no: int | None) -> tuple:
+    scope: str = NODES[name]["scope"]
+    return (
+        name,
+        season if scope != "global" else None,
+        round_no if scope == "round" else None,
+    )
+
+
+def _compute(name: str, season: int | None, round_no: int | None, reason: str) -> Any:
+    # Caller holds the lock
+    global _computed
+    spec: dict[str, Any] = NODES[name]
+    _, season, round_no = _key(name, season, round_no)
+    inputs: dict[str, Any] = {
+        node: get_node(node, season, round_no)
+        for node in spec["inputs"]
+        if NODES[node]["scope"] == spec["scope"]
+    }
+
+    start: float = time.perf_counter()
+    value: Any = spec["compute"](season, round_no, **inputs)
+    seconds: float = time.perf_counter() - start
+
+    _values[(name, season, round_no)] = value
+    _trace.append(
+        {
+            "node": name,
+            "season": season,
+            "round": round_no,
+            "reason": reason,
+            "seconds": seconds,
+            "at": time.time(),
+        }
+    )
+    _computed += 1
+    logger.debug(f"Recomputed {name} ({season}, {round_no}) in {seconds:.3f}s")
+    return value
+
+
+def get_node(name: str, season: int | None, round_no: int | None = None) -> Any:
+    """
+    Value of a node, computed (with whatever it depends on) if it is missing or stale.
+
+    Args:
+        name (str): Node name.
+        season (int | None): Season, ignored for global nodes.
+        round_no (int | None, optional): Round, required for round nodes. Defaults to None.
+
+    Returns:
+        (Any): The node's value. Shared between sessions, do not modify.
+    """
+    # Input checking
+    if name not in NODES:
+        raise ValueError(f"Unknown node: {name}.")
+    if NODES[name]["scope"] == "round" and round_no is None:
+        raise ValueError(f"Node {name} is computed per round. Please give a round.")
+
+    with _lock:
+        key: tuple = _key(name, season, round_no)
+        if key in _values:
+            return _values[key]
+        return _compute(name, season, round_no, "requested")
+
+
+def invalidate(name: str, season: int, round_no: int | None = None) -> list[tuple]:
+    """
+    Drop the values derived from one round (or season) of a node. The node itself is
+    kept, so a source can be invalidated after its new value has been set.
+
+    Args:
+        name (str): Node whose data changed.
+        season (int): Season of the change.
+        round_no (int | None, optional): Round of the change, None for a season node. Defaults to None.
+
+    Returns:
+        (list[tuple]): (node, season, round) of the values that had been computed and were dropped.
+    """
+    dropped: list[tuple] = []
+    with _lock:
+        for node in downstream(name):
+            key: tuple = _key(node, season, round_no)
+            if _values.pop(key, _missing) is not _missing:
+                dropped.append(key)
+
+    return dropped
+
+
+def set_input(name: str, season: int, round_no: int | None, value: Any) -> list[dict]:
+    """
+    Replace the value of a node for one round (e.g. after the user edited that round)
+    and recompute only the nodes derived from it for that round and its season.
+
+    Nodes that had never been computed for that round stay lazy: they are computed on
+    their next `get_node`.
+
+    Args:
+        name (str): Node to set, usually a source.
+        season (int): Season of the change.
+        round_no (int | None): Round of the change, None for a season node.
+        value (Any): New value.
+
+    Returns:
+        (list[dict]): Trace records of the nodes recomputed by this change.
+    """
+    # Input checking
+    if name not in NODES:
+        raise ValueError(f"Unknown node: {name}.")
+
+    with _lock:
+        _values[_key(name, season, round_no)] = value
+        dropped: list[tuple] = invalidate(name, season, round_no)
+
+        # Recompute what was materialised, in graph order
+        start: int = _computed
+        for node, node_season, node_round in dropped:
+            if (node, node_season, node_round) not in _values:
+                _compute(node, node_season, node_round, f"{name} changed")
+
+        records: list[dict] = list(_trace)[len(_trace) - (_computed - start) :]
+
+    logger.info(
+        f"{name} ({season}, {round_no}) changed: recomputed {len(records)} nodes"
+    )
+    return records
+
+
+def reset_graph() -> None:
+    """
+    Forget every computed value, e.g. after a bulk import.
+    """
+    with _lock:
+        _values.clear()
+
+
+def recompute_trace(limit: int | None = None) -> pd.DataFrame:
+    """
+    Latest recomputes, most recent first.
+
+    Args:
+        limit (int | None, optional): Most records to return. Defaults to all kept records.
+
+    Returns:
+        (pd.DataFrame): `node`, `season`, `round`, `reason`, `seconds` and `at` (timestamp).
+    """
+    with _lock:
+        records: list[dict] = list(_trace)[::-1][:limit]
+
+    trace: pd.DataFrame = pd.DataFrame(
+        records, columns=["node", "season", "round", "reason", "seconds", "at"]
+    )
+    trace["at"] = pd.to_datetime(trace["at"], unit="s")
+    return trace
+
+
+# ----------------------------------------------------------------------------------
+
+# Built-in graph: race store tables -> stints, aggregates, pit index, degradation ->
+# figures. Heavy modules are imported inside the nodes so importing the graph is cheap.
+
+
+def _race_table(table: str, season: int, round_no: int) -> pd.DataFrame:
+    from .race_store import read_table
+
+    return read_table(table, season=season, round_no=round_no, session="race")
+
+
+@register_node("results")
+def _results(season: int, round_no: int) -> pd.DataFrame:
+    return _race_table("results", season, round_no)
+
+
+@register_node("laps")
+def _laps(season: int, round_no: int) -> pd.DataFrame:
+    return _race_table("laps", season, round_no)
+
+
+@register_node("pit_stops")
+def _pit_stops(season: int, round_no: int) -> pd.DataFrame:
+    return _race_table("pit_stops", season, round_no)
+
+
+def stint_table(laps: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per driver stint: compound, first/last lap and mean lap time.
+
+    Args:
+        laps (pd.DataFrame): Laps with `driver`, `stint`, `lap`, `lap_time` and
+            optionally `compound`.
+
+    Returns:
+        (pd.DataFrame): Stints, empty if a column is missing.
+    """
+    if not {"driver", "stint", "lap", "lap_time"} <= set(laps.columns):
+        return pd.DataFrame(
+            columns=["driver", "stint", "first_lap", "last_lap", "laps", "mean_lap"]
+        )
+
+    return (
+        laps.groupby(["driver", "stint"], observed=True)
+        .agg(
+            **({"compound": ("compound", "first")} if "compound" in laps else {}),
+            first_lap=("lap", "min"),
+            last_lap=("lap", "max"),
+            laps=("lap", "count"),
+            mean_lap=("lap_time", "mean"),
+        )
+        .reset_index()
+    )
+
+
+@register_node("stints", inputs=["laps"])
+def _stints(season: int, round_no: int, laps: pd.DataFrame) -> pd.DataFrame:
+    return stint_table(laps)
+
+
+@register_node("aggregates", inputs=["results", "laps"])
+def _aggregates(
+    season: int, round_no: int, results: pd.DataFrame, laps: pd.DataFrame
+) -> pd.DataFrame:
+    from .aggregates import update_aggregates
+
+    if not {"driver", "team", "position"} <= set(results.columns):
+        return pd.DataFrame()
+
+    aggregates: pd.DataFrame = update_aggregates(
+        results,
+        laps if {"driver", "lap_time"} <= set(laps.columns) else None,
+        season,
+        round_no,
+        "race",
+    )
+    return aggregates[
+        (aggregates["scope"] == "round") & (aggregates["round"] == round_no)
+    ].reset_index(drop=True)
+
+
+@register_node("pit_index", inputs=["pit_stops"])
+def _pit_index(season: int, round_no: int, pit_stops: pd.DataFrame) -> pd.DataFrame:
+    from .pit_index import update_pit_index
+
+    if not {"team", "pit_time"} <= set(pit_stops.columns):
+        return pd.DataFrame()
+
+    index: pd.DataFrame = update_pit_index(pit_stops, season, round_no)
+    return index[(index["scope"] == "round") & (index["round"] == round_no)]
+
+
+# The models pool every season of a track, so one value serves all of them
+@register_node("degradation", inputs=["laps"], scope="global")
+def _degradation(season: None, round_no: None) -> pd.DataFrame:
+    from .degradation import GROUP_COLUMNS, STINT_COLUMNS, update_models_from_store
+    from .race_store import open_table
+
+    dataset = open_table("laps")
+    needed: list[str] = GROUP_COLUMNS + STINT_COLUMNS + ["tyre_age", "lap_time"]
+    if dataset is None or not set(needed) <= set(dataset.schema.names):
+        return pd.DataFrame()
+
+    # Only the (track, compound) curves whose stints changed are refitted
+    return update_models_from_store()
+
+
+@register_node("points_figure", inputs=["aggregates"], scope="season")
+def _points_figure(season: int, round_no: None):
+    from .aggregates import load_aggregates
+    from .charts import line_figure
+
+    rounds: pd.DataFrame = load_aggregates(season, "round", "driver")
+    if rounds.empty:
+        return line_figure(
+            pd.DataFrame(columns=["round", "points", "name"]), "round", "points", "name"
+        )
+
+    rounds = rounds[rounds["session"] == "race"].sort_values("round")
+    rounds["points"] = rounds.groupby("name")["points"].cumsum()
+    figure = line_figure(rounds, x="round", y="points", group="name")
+    figure.update_traces(mode="lines+markers")
+    return figure
@@ -0,0 +1,360 @@
+# Extract race data straight from an F1 Manager save file into the race store
+
+# Imports
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+import numpy as np
+import pyarrow as pa
+from loguru import logger
+
+from .race_store import STORE_DIR, write_session
+
+# F1 Manager saves are an Unreal GVAS container. The property list ends with a `None`
+# terminator and is followed by a zlib stream that holds the career's SQLite database.
+GVAS_MAGIC: bytes = b"GVAS"
+GVAS_TERMINATOR: bytes = b"\x05\x00\x00\x00None\x00"
+ZLIB_HEADERS: tuple[bytes, ...] = (b"\x78\x9c", b"\x78\xda", b"\x78\x01", b"\x78\x5e")
+SQLITE_MAGIC: bytes = b"SQLite format 3\x00"
+
+# Which tables of the save database feed which tables of the store. Table and column
+# names follow the save schema of F1 Manager 2024; adjust them here for other editions.
+SAVE_TABLES: list[dict[str, str]] = [
+    {
+        "table": "results",
+        "session": "race",
+        "source": "Races_Results",
+        "season_column": "Season",
+        "race_column": "RaceID",
+    },
+    {
+        "table": "results",
+        "session": "sprint",
+        "source": "Races_SprintResults",
+        "season_column": "SeasonID",
+        "race_column": "RaceID",
+    },
+    {
+        "table": "results",
+        "session": "qualifying",
+        "source": "Races_QualifyingResults",
+        "season_column": "SeasonID",
+        "race_column": "RaceID",
+    },
+    {
+        "table": "laps",
+        "session": "race",
+        "source": "Races_LapTimes",
+        "season_column": "SeasonID",
+        "race_column": "RaceID",
+    },
+    {
+        "table": "pit_stops",
+        "session": "race",
+        "source": "Races_PitStopResults",
+        "season_column": "SeasonID",
+        "race_column": "RaceID",
+    },
+    {
+        "table": "tyres",
+        "session": "race",
+        "source": "Races_TyreStints",
+        "season_column": "SeasonID",
+        "race_column": "RaceID",
+    },
+]
+
+# Digest of every extracted partition, used to skip rounds that did not change
+MANIFEST_FILE: str = "_save_manifest.json"
+
+
+def read_save_database(save_path: str, chunk_size: int = 1 << 20) -> bytes:
+    """
+    Decompress the SQLite database embedded in a save file. The zlib stream is read in
+    chunks and decompression stops as soon as the whole database has been produced.
+
+    Args:
+        save_path (str): Path to the `.sav` file.
+        chunk_size (int, optional): Compressed bytes read per iteration. Defaults to 1 MiB.
+
+    Returns:
+        (bytes): Raw SQLite database image.
+    """
+    with open(save_path, "rb") as file:
+        # Input checking
+        header: bytes = file.read(chunk_size)
+        if not header.startswith(GVAS_MAGIC):
+            raise ValueError(f"{save_path} is not an F1 Manager save file.")
+
+        # The compressed payload starts right after the property list
+        start: int = header.find(GVAS_TERMINATOR)
+        start = start + len(GVAS_TERMINATOR) if start >= 0 else len(GVAS_MAGIC)
+        offsets: list[int] = [
+            offset
+            for offset in (header.find(magic, start) for magic in ZLIB_HEADERS)
+            if offset >= 0
+        ]
+        if not offsets:
+            raise ValueError(f"Could not find the compressed database in {save_path}.")
+        file.seek(min(offsets))
+
+        decompressor = zlib.decompressobj()
+        database: bytearray = bytearray()
+        db_start: int = -1
+        db_size: int = 0
+        while True:
+            chunk: bytes = file.read(chunk_size)
+            if chunk:
+                database += decompressor.decompress(chunk)
+            else:
+                database += decompressor.flush()
+
+            # Locate the database header, then its size (page size * page count)
+            if db_start < 0:
+                db_start = database.find(SQLITE_MAGIC)
+                if db_start > 0:
+                    del database[:db_start]
+                    db_start = 0
+            if db_start == 0 and not db_size and len(database) >= 32:
+                page_size: int = int.from_bytes(database[16:18], "big")
+                page_size = 65536 if page_size == 1 else page_size
+                db_size = page_size * int.from_bytes(database[28:32], "big")
+            if db_size and len(database) >= db_size:
+                return bytes(database[:db_size])
+            if not chunk or decompressor.eof:
+                break
+
+    raise ValueError(f"The database in {save_path} is truncated or missing.")
+
+
+def open_save(save_path: str) -> sqlite3.Connection:
+    """
+    Open the database of a save file in memory, without writing anything to disk.
+
+    Args:
+        save_path (str): Path to the `.sav` file.
+
+    Returns:
+        (sqlite3.Connection): Read-only in-memory connection to the save database.
+    """
+    connection: sqlite3.Connection = sqlite3.connect(":memory:")
+    connection.deserialize(read_save_database(save_path))
+    connection.execute("PRAGMA query_only = ON")
+    return connection
+
+
+def iter_batches(
+    connection: sqlite3.Connection,
+    query: str,
+    params: tuple = (),
+    batch_size: int = 10_000,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Stream the result of a query as Arrow record batches.
+
+    Args:
+        connection (sqlite3.Connection): Database connection.
+        query (str): SQL query.
+        params (tuple, optional): Query parameters. Defaults to ().
+        batch_size (int, optional): Rows per batch. Defaults to 10,000.
+
+    Yields:
+        (pa.RecordBatch): Consecutive batches of the result set.
+    """
+    cursor: sqlite3.Cursor = connection.execute(query, params)
+    names: list[str] = [column[0] for column in cursor.description]
+
+    while rows := cursor.fetchmany(batch_size):
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(values) for values in zip(*rows)], names=names
+        )
+
+
+def _race_rounds(connection: sqlite3.Connection) -> dict[int, int]:
+    # Rounds are the order of the races within their season
+    rows: list[tuple[int, int]] = connection.execute(
+        """
+        SELECT RaceID, ROW_NUMBER() OVER (PARTITION BY SeasonID ORDER BY Day, RaceID)
+        FROM Races
+        """
+    ).fetchall()
+    return dict(rows)
+
+
+def _existing_tables(connection: sqlite3.Connection) -> set[str]:
+    return {
+        row[0]
+        for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+
+
+def _load_manifest(store_dir: str) -> dict[str, str]:
+    path: str = os.path.join(store_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+@contextmanager
+def _manifest_lock(store_dir: str) -> Iterator[None]:
+    # Exclusive between processes (batch workers, the watcher). The lock belongs to the
+    # open file, so the OS releases it if its holder dies.
+    os.makedirs(store_dir, exist_ok=True)
+    with open(os.path.join(store_dir, MANIFEST_FILE + ".lock"), "a+b") as file:
+        if os.name == "nt":
+            import msvcrt
+
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def _save_manifest(manifest: dict[str, str], store_dir: str) -> None:
+    path: str = os.path.join(store_dir, MANIFEST_FILE)
+    # Merge with what other extractions saved since, under the lock so none is lost
+    with _manifest_lock(store_dir):
+        merged: dict[str, str] = {**_load_manifest(store_dir), **manifest}
+        tmp_path: str = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(merged, file, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+
+def extract_save(
+    save_path: str,
+    season: int | list[int] | None = None,
+    from_round: int = 1,
+    force: bool = False,
+    store_dir: str = STORE_DIR,
+) -> dict[str, Any]:
+    """
+    Extract the results, lap, pit stop and tyre tables of a save into the race store.
+    Partitions whose content did not change since the previous extraction are skipped.
+
+    Args:
+        save_path (str): Path to the `.sav` file.
+        season (int | list[int] | None, optional): Only extract this season or these
+            seasons. Defaults to all seasons.
+        from_round (int, optional): Only extract this round onwards. Defaults to 1.
+        force (bool, optional): Rewrite partitions even if they did not change. Defaults to False.
+        store_dir (str, optional): Root folder of the store. Defaults to `STORE_DIR`.
+
+    Returns:
+        (dict[str, Any]): Number of `written` and `unchanged` partitions, and the
+            `partitions` written: `table`, `season`, `round_no` and `session` each.
+    """
+    only: list[int] | None = [season] if isinstance(season, int) else season
+    connection: sqlite3.Connection = open_save(save_path)
+    summary: dict[str, Any] = {"written": 0, "unchanged": 0, "partitions": []}
+
+    try:
+        rounds: dict[int, int] = _race_rounds(connection)
+        race_ids: list[int] = [
+            race_id for race_id, round_no in rounds.items() if round_no >= from_round
+        ]
+        tables: set[str] = _existing_tables(connection)
+        manifest: dict[str, str] = _load_manifest(store_dir)
+
+        for spec in SAVE_TABLES:
+            if spec["source"] not in tables:
+                logger.warning(f"{spec['source']} is not in this save, skipping it.")
+                continue
+
+            season_column: str = spec["season_column"]
+            race_column: str = spec["race_column"]
+            query: str = (
+                f"SELECT * FROM {spec['source']} "
+                f"WHERE {race_column} IN (SELECT value FROM json_each(?))"
+            )
+            params: tuple = (json.dumps(race_ids),)
+            if only is not None:
+                query += f" AND {season_column} IN (SELECT value FROM json_each(?))"
+                params += (json.dumps(only),)
+            query += f" ORDER BY {season_column}, {race_column}"
+
+            # Rows arrive sorted, so each partition is complete once the key changes
+            def flush(key: tuple[int, int], batches: list[pa.RecordBatch]) -> None:
+                # Columns that were all NULL in one batch are typed `null`, so promote
+                table: pa.Table = pa.concat_tables(
+                    [pa.Table.from_batches([batch]) for batch in batches],
+                    promote_options="default",
+                ).combine_chunks()
+                digest = hashlib.blake2b(digest_size=16)
+                for batch in table.to_batches():
+                    sink = pa.BufferOutputStream()
+                    with pa.ipc.new_stream(sink, batch.schema) as writer:
+                        writer.write_batch(batch)
+                    digest.update(sink.getvalue())
+
+                partition: str = (
+                    f"{spec['table']}/{key[0]}/{rounds[key[1]]}/{spec['session']}"
+                )
+                if not force and manifest.get(partition) == digest.hexdigest():
+                    summary["unchanged"] += 1
+                    return
+
+                write_session(
+                    table.drop_columns([season_column, race_column]),
+                    spec["table"],
+                    key[0],
+                    rounds[key[1]],
+                    spec["session"],
+                    store_dir,
+                )
+                manifest[partition] = digest.hexdigest()
+                summary["written"] += 1
+                summary["partitions"].append(
+                    {
+                        "table": spec["table"],
+                        "season": key[0],
+                        "round_no": rounds[key[1]],
+                        "session": spec["session"],
+                    }
+                )
+
+            current: tuple[int, int] | None = None
+            pending: list[pa.RecordBatch] = []
+            for batch in iter_batches(connection, query, params):
+                seasons: np.ndarray = batch.column(season_column).to_numpy()
+                races: np.ndarray = batch.column(race_column).to_numpy()
+                starts: np.ndarray = np.flatnonzero(
+                    (seasons[1:] != seasons[:-1]) | (races[1:] != races[:-1])
+                ) + 1
+                start: int = 0
+                for i in [0, *starts.tolist()]:
+                    key: tuple[int, int] = (int(seasons[i]), int(races[i]))
+                    if key != current:
+                        if current is not None:
+                            pending.append(batch.slice(start, i - start))
+                            flush(current, pending)
+                        current, pending, start = key, [], i
+                pending.append(batch.slice(start))
+            if current is not None:
+                flush(current, pending)
+
+        _save_manifest(manifest, store_dir)
+    finally:
+        connection.close()
+
+    logger.info(
+        f"Extracted {save_path}: {summary['written']} partitions written, "
+        f"{summary['unchanged']} unchanged."
+    )
+    return summary
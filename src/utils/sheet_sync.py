@@ -0,0 +1,452 @@
+# Read-through cache of Google Sheets worksheets, pushing only the rows that changed
+
+# Imports
+import json
+import os
+import re
+import threading
+import time
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+from .paths import DATA_DIR
+
+# Worksheets are cached here as Parquet, one folder per spreadsheet
+SHEET_CACHE_DIR: str = os.path.join(DATA_DIR, "cache", "sheets")
+
+# Google endpoints. Point them at a local fake server to test without Google.
+SHEETS_URL: str = "https://sheets.googleapis.com/v4/spreadsheets"
+DRIVE_URL: str = "https://www.googleapis.com/drive/v3/files"
+SCOPES: list[str] = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive.metadata.readonly",
+]
+
+# Reruns within this many seconds reuse the cache without asking Google at all
+POLL_INTERVAL: float = 30.0
+
+# Rate limits and transient server errors are retried with exponential backoff
+RETRY_STATUS: set[int] = {429, 500, 502, 503, 504}
+RETRY_ATTEMPTS: int = 5
+
+# Column holding the hash of every cached row
+HASH_COLUMN: str = "_row_hash"
+
+_lock: threading.Lock = threading.Lock()
+_last_poll: dict[tuple[str, str], float] = {}
+
+
+class SheetSyncError(RuntimeError):
+    """Raised when the Sheets API rejects a request for good."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Sheets API error {status}: {message}")
+        self.status: int = status
+
+
+def _is_transient(error: BaseException) -> bool:
+    import requests
+
+    if isinstance(error, SheetSyncError):
+        return error.status in RETRY_STATUS
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+@retry(
+    retry=retry_if_exception(_is_transient),
+    wait=wait_exponential_jitter(initial=0.5, max=16),
+    stop=stop_after_attempt(RETRY_ATTEMPTS),
+    reraise=True,
+)
+def _request(session, method: str, url: str, **kwargs) -> dict:
+    response = session.request(method, url, timeout=30, **kwargs)
+    if response.status_code >= 400:
+        raise SheetSyncError(response.status_code, response.text[:200])
+    return response.json() if response.content else {}
+
+
+def sheets_session(secrets: dict | None = None):
+    """
+    Authorised HTTP session for the Sheets and Drive APIs.
+
+    Args:
+        secrets (dict | None, optional): Service account info. Defaults to the
+            `[connections.gsheets]` section of `.streamlit/secrets.toml`, as used by
+            `st-gsheets-connection`.
+
+    Returns:
+        (google.auth.transport.requests.AuthorizedSession): Session that adds the access token.
+    """
+    from google.auth.transport.requests import AuthorizedSession
+    from google.oauth2.service_account import Credentials
+
+    if secrets is None:
+        import streamlit as st
+
+        secrets = dict(st.secrets["connections"]["gsheets"])
+
+    credentials = Credentials.from_service_account_info(
+        {key: value for key, value in secrets.items() if key != "spreadsheet"},
+        scopes=SCOPES,
+    )
+    return AuthorizedSession(credentials)
+
+
+def spreadsheet_id(spreadsheet: str) -> str:
+    """
+    Id of a spreadsheet from its URL (or the id itself).
+
+    Args:
+        spreadsheet (str): Spreadsheet URL or id.
+
+    Returns:
+        (str): Spreadsheet id.
+    """
+    match: re.Match | None = re.search(r"/spreadsheets/d/([\w-]+)", spreadsheet)
+    return match.group(1) if match else spreadsheet
+
+
+def column_letter(index: int) -> str:
+    """
+    A1 column name of a 1-based column index.
+
+    Args:
+        index (int): Column index, 1 for "A".
+
+    Returns:
+        (str): Column letters, e.g. "A", "Z", "AA".
+    """
+    letters: str = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    Hash of every row, used to find the rows that changed.
+
+    Args:
+        df (pd.DataFrame): Worksheet data.
+
+    Returns:
+        (np.ndarray): One uint64 per row.
+    """
+    return pd.util.hash_pandas_object(
+        df.astype(str).replace({"nan": "", "None": "", "<NA>": ""}), index=False
+    ).to_numpy()
+
+
+def changed_ranges(old: np.ndarray, new: np.ndarray) -> list[tuple[int, int]]:
+    """
+    Contiguous runs of rows whose hash differs, including added rows.
+
+    Args:
+        old (np.ndarray): Row hashes of the previous version.
+        new (np.ndarray): Row hashes of the current version.
+
+    Returns:
+        (list[tuple[int, int]]): 0-based (first, last) row positions of each run in `new`.
+    """
+    common: int = min(len(old), len(new))
+    changed: np.ndarray = np.ones(len(new), dtype=bool)
+    changed[:common] = old[:common] != new[:common]
+
+    # Starts and ends of the runs of changed rows
+    edges: np.ndarray = np.diff(np.concatenate([[0], changed.astype(np.int8), [0]]))
+    starts: np.ndarray = np.flatnonzero(edges == 1)
+    ends: np.ndarray = np.flatnonzero(edges == -1) - 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def _frame_from_values(values: list[list[Any]]) -> pd.DataFrame:
+    # First row is the header; the API drops trailing empty cells of every row
+    if not values:
+        return pd.DataFrame()
+    header: list[str] = [str(name) for name in values[0]]
+    rows: list[list[Any]] = [
+        (row + [None] * len(header))[: len(header)] for row in values[1:]
+    ]
+    df: pd.DataFrame = pd.DataFrame(rows, columns=header).replace({"": None})
+
+    # Columns that are entirely numeric become numbers, the rest stays text
+    for column in df.columns:
+        numbers: pd.Series = pd.to_numeric(df[column], errors="coerce")
+        if numbers.notna().sum() == df[column].notna().sum():
+            df[column] = numbers
+        else:
+            df[column] = df[column].astype("string")
+
+    return df
+
+
+def _values_from_frame(df: pd.DataFrame) -> list[list[Any]]:
+    # JSON-friendly cells; missing values are written as empty cells
+    return (
+        df.astype(object)
+        .where(df.notna(), "")
+        .map(lambda value: value.item() if isinstance(value, np.generic) else value)
+        .to_numpy()
+        .tolist()
+    )
+
+
+def _cache_paths(spreadsheet: str, worksheet: str, cache_dir: str) -> tuple[str, str]:
+    folder: str = os.path.join(cache_dir, spreadsheet_id(spreadsheet))
+    name: str = re.sub(r"[^\w-]", "_", worksheet)
+    return (
+        os.path.join(folder, f"{name}.parquet"),
+        os.path.join(folder, f"{name}.json"),
+    )
+
+
+def _read_cache(
+    spreadsheet: str, worksheet: str, cache_dir: str
+) -> tuple[pd.DataFrame | None, dict]:
+    data_path, meta_path = _cache_paths(spreadsheet, worksheet, cache_dir)
+    if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return None, {}
+    with open(meta_path, "r", encoding="utf-8") as file:
+        meta: dict = json.load(file)
+    return pd.read_parquet(data_path), meta
+
+
+def _write_cache(
+    df: pd.DataFrame, meta: dict, spreadsheet: str, worksheet: str, cache_dir: str
+) -> None:
+    data_path, meta_path = _cache_paths(spreadsheet, worksheet, cache_dir)
+    os.makedirs(os.path.dirname(data_path), exist_ok=True)
+    df.to_parquet(data_path + ".tmp", index=False)
+    os.replace(data_path + ".tmp", data_path)
+    with open(meta_path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(meta, file)
+    os.replace(meta_path + ".tmp", meta_path)
+
+
+def _modified_time(session, spreadsheet: str, drive_url: str) -> str:
+    return _request(
+        session,
+        "GET",
+        f"{drive_url}/{spreadsheet_id(spreadsheet)}",
+        params={"fields": "modifiedTime"},
+    ).get("modifiedTime", "")
+
+
+def pull_worksheets(
+    spreadsheet: str,
+    worksheets: list[str],
+    session=None,
+    force: bool = False,
+    cache_dir: str = SHEET_CACHE_DIR,
+    sheets_url: str = SHEETS_URL,
+    drive_url: str = DRIVE_URL,
+) -> dict[str, pd.DataFrame]:
+    """
+    Read worksheets through the local cache. Google is asked at most once per
+    `POLL_INTERVAL`. The spreadsheet's modified time is checked first (one small call)
+    and, only if it changed, every stale worksheet is fetched in one batched call.
+
+    Pulls are not deltas: the modified time covers the whole spreadsheet and the Sheets
+    API cannot list the rows that changed, so any edit downloads every requested
+    worksheet in full. Only `push_worksheet` limits itself to the changed rows.
+
+    Args:
+        spreadsheet (str): Spreadsheet URL or id.
+        worksheets (list[str]): Worksheet (tab) names.
+        session (optional): Authorised session. Defaults to `sheets_session()`.
+        force (bool, optional): Skip the poll interval and modified time checks. Defaults to False.
+        cache_dir (str, optional): Folder of the local cache. Defaults to `SHEET_CACHE_DIR`.
+        sheets_url (str, optional): Sheets API base URL. Defaults to `SHEETS_URL`.
+        drive_url (str, optional): Drive API base URL. Defaults to `DRIVE_URL`.
+
+    Returns:
+        (dict[str, pd.DataFrame]): Data of every worksheet, keyed by name.
+    """
+    cached: dict[str, tuple[pd.DataFrame | None, dict]] = {
+        worksheet: _read_cache(spreadsheet, worksheet, cache_dir)
+        for worksheet in worksheets
+    }
+    now: float = time.time()
+    with _lock:
+        fresh: bool = all(
+            cached[worksheet][0] is not None
+            and now - _last_poll.get((spreadsheet_id(spreadsheet), worksheet), 0.0)
+            < POLL_INTERVAL
+            for worksheet in worksheets
+        )
+    if fresh and not force:
+        return {
+            worksheet: cached[worksheet][0].drop(columns=HASH_COLUMN)
+            for worksheet in worksheets
+        }
+
+    session = session if session is not None else sheets_session()
+    modified: str = _modified_time(session, spreadsheet, drive_url)
+    stale: list[str] = [
+        worksheet
+        for worksheet in worksheets
+        if force
+        or cached[worksheet][0] is None
+        or cached[worksheet][1].get("modified") != modified
+    ]
+
+    if stale:
+        response: dict = _request(
+            session,
+            "GET",
+            f"{sheets_url}/{spreadsheet_id(spreadsheet)}/values:batchGet",
+            params={
+                "ranges": [f"'{worksheet}'" for worksheet in stale],
+                "valueRenderOption": "UNFORMATTED_VALUE",
+            },
+        )
+        for worksheet, value_range in zip(stale, response.get("valueRanges", [])):
+            df: pd.DataFrame = _frame_from_values(value_range.get("values", []))
+            hashes: np.ndarray = row_hashes(df)
+            old: pd.DataFrame | None = cached[worksheet][0]
+            ranges: list[tuple[int, int]] = changed_ranges(
+                old[HASH_COLUMN].to_numpy() if old is not None else np.array([]),
+                hashes,
+            )
+            logger.info(
+                f"Pulled {worksheet} in full: {len(df)} rows, {len(ranges)} changed range(s)."
+            )
+            _write_cache(
+                df.assign(**{HASH_COLUMN: hashes}),
+                {"modified": modified, "columns": list(df.columns)},
+                spreadsheet,
+                worksheet,
+                cache_dir,
+            )
+            cached[worksheet] = (df.assign(**{HASH_COLUMN: hashes}), {})
+
+    with _lock:
+        for worksheet in worksheets:
+            _last_poll[(spreadsheet_id(spreadsheet), worksheet)] = now
+
+    return {
+        worksheet: cached[worksheet][0].drop(columns=HASH_COLUMN)
+        for worksheet in worksheets
+    }
+
+
+def push_worksheet(
+    spreadsheet: str,
+    worksheet: str,
+    df: pd.DataFrame,
+    session=None,
+    cache_dir: str = SHEET_CACHE_DIR,
+    sheets_url: str = SHEETS_URL,
+    drive_url: str = DRIVE_URL,
+) -> list[str]:
+    """
+    Write a worksheet back, sending only the rows that differ from the cached copy.
+    All changed ranges go out in one `batchUpdate`; rows removed locally are cleared
+    in one `batchClear`. If the spreadsheet changed since the cache was pulled, the
+    worksheet is pulled again first, so the diff is taken against the remote content.
+
+    Args:
+        spreadsheet (str): Spreadsheet URL or id.
+        worksheet (str): Worksheet (tab) name.
+        df (pd.DataFrame): New content of the worksheet (header = columns).
+        session (optional): Authorised session. Defaults to `sheets_session()`.
+        cache_dir (str, optional): Folder of the local cache. Defaults to `SHEET_CACHE_DIR`.
+        sheets_url (str, optional): Sheets API base URL. Defaults to `SHEETS_URL`.
+        drive_url (str, optional): Drive API base URL. Defaults to `DRIVE_URL`.
+
+    Returns:
+        (list[str]): A1 ranges that were written or cleared.
+    """
+    session = session if session is not None else sheets_session()
+    old, meta = _read_cache(spreadsheet, worksheet, cache_dir)
+
+    # Edited elsewhere since the last pull: diff against the remote content instead,
+    # otherwise those edits would be hidden behind the modified time recorded below
+    if old is None or meta.get("modified") != _modified_time(
+        session, spreadsheet, drive_url
+    ):
+        pull_worksheets(
+            spreadsheet,
+            [worksheet],
+            session,
+            force=True,
+            cache_dir=cache_dir,
+            sheets_url=sheets_url,
+            drive_url=drive_url,
+        )
+        old, meta = _read_cache(spreadsheet, worksheet, cache_dir)
+
+    df = df.reset_index(drop=True)
+    hashes: np.ndarray = row_hashes(df)
+    last_column: str = column_letter(len(df.columns))
+
+    # A different header means every row moves, so rewrite the whole worksheet
+    same_header: bool = old is not None and meta.get("columns") == list(df.columns)
+    old_hashes: np.ndarray = (
+        old[HASH_COLUMN].to_numpy() if same_header else np.array([], dtype=np.uint64)
+    )
+    data: list[dict] = []
+    if not same_header:
+        data.append(
+            {
+                "range": f"'{worksheet}'!A1:{last_column}1",
+                "values": [list(map(str, df.columns))],
+            }
+        )
+    for first, last in changed_ranges(old_hashes, hashes):
+        data.append(
+            {
+                # Row 1 is the header
+                "range": f"'{worksheet}'!A{first + 2}:{last_column}{last + 2}",
+                "values": _values_from_frame(df.iloc[first : last + 1]),
+            }
+        )
+
+    cleared: list[str] = []
+    if old is not None and len(old) > len(df):
+        old_last: str = column_letter(
+            max(len(meta.get("columns", [])), len(df.columns))
+        )
+        cleared.append(f"'{worksheet}'!A{len(df) + 2}:{old_last}{len(old) + 1}")
+
+    sheet_id: str = spreadsheet_id(spreadsheet)
+    if data:
+        _request(
+            session,
+            "POST",
+            f"{sheets_url}/{sheet_id}/values:batchUpdate",
+            json={"valueInputOption": "RAW", "data": data},
+        )
+    if cleared:
+        _request(
+            session,
+            "POST",
+            f"{sheets_url}/{sheet_id}/values:batchClear",
+            json={"ranges": cleared},
+        )
+
+    # Our own write changes the modified time. The cache matched the remote before it,
+    # so record the new time and the next pull is a no-op.
+    _write_cache(
+        df.assign(**{HASH_COLUMN: hashes}),
+        {
+            "modified": _modified_time(session, spreadsheet, drive_url),
+            "columns": list(df.columns),
+        },
+        spreadsheet,
+        worksheet,
+        cache_dir,
+    )
+    written: list[str] = [entry["range"] for entry in data] + cleared
+    logger.info(f"Pushed {worksheet}: {len(written)} range(s).")
+    return written
@@ -0,0 +1,310 @@
+# Monte Carlo race simulator for comparing pit strategies
+
+# Imports
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .ingest import evict_disk_cache
+from .paths import DATA_DIR
+
+# Simulation results are persisted here, keyed by the hash of their inputs
+SIMULATION_CACHE_DIR: str = os.path.join(DATA_DIR, "cache", "simulations")
+
+# Disk budget of the cached simulations, least recently used files are deleted first
+SIMULATION_CACHE_BYTES: int = 256 * 1024**2
+
+# Races are simulated in fixed-size chunks, each with its own child seed, so results do
+# not depend on how many worker threads picked them up
+CHUNK_SIZE: int = 5_000
+
+# Below this many races the thread pool costs more than it saves. Threads, not
+# processes: the chunks are NumPy work that releases the GIL, and forking the Streamlit
+# server (with its watcher, API and flusher threads) could deadlock the children.
+POOL_THRESHOLD: int = 20_000
+
+# Points for P1 to P10
+POINTS: list[int] = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
+
+# Chance of at least one safety car / virtual safety car per race
+DEFAULT_NEUTRALISATION: dict[str, float] = {"safety_car": 0.35, "vsc": 0.3}
+CIRCUIT_NEUTRALISATION: dict[str, dict[str, float]] = {
+    "Australia": {"safety_car": 0.6, "vsc": 0.35},
+    "Saudi Arabia": {"safety_car": 0.65, "vsc": 0.3},
+    "Monaco": {"safety_car": 0.6, "vsc": 0.4},
+    "Canada": {"safety_car": 0.6, "vsc": 0.3},
+    "Azerbaijan": {"safety_car": 0.7, "vsc": 0.3},
+    "Singapore": {"safety_car": 0.9, "vsc": 0.3},
+    "Las Vegas": {"safety_car": 0.55, "vsc": 0.3},
+    "Brazil": {"safety_car": 0.6, "vsc": 0.35},
+    "Bahrain": {"safety_car": 0.25, "vsc": 0.25},
+    "Spain": {"safety_car": 0.2, "vsc": 0.25},
+    "Austria": {"safety_car": 0.25, "vsc": 0.45},
+    "Hungary": {"safety_car": 0.25, "vsc": 0.3},
+    "Netherlands": {"safety_car": 0.4, "vsc": 0.35},
+    "Abu Dhabi": {"safety_car": 0.3, "vsc": 0.3},
+}
+
+# Share of the pit lane loss still paid when stopping under a safety car / VSC
+SC_PIT_FACTOR: float = 0.45
+VSC_PIT_FACTOR: float = 0.6
+SC_LAPS: int = 4
+VSC_LAPS: int = 2
+
+
+def parse_strategy(compounds: str, stints: str) -> dict[str, list]:
+    """
+    Turn a row of `solve_strategies` back into compounds and stint lengths.
+
+    Args:
+        compounds (str): E.g. "Soft → Medium".
+        stints (str): E.g. "1-27, 28-57".
+
+    Returns:
+        (dict[str, list]): `compounds` and `lengths` of every stint.
+    """
+    lengths: list[int] = []
+    for stint in stints.split(","):
+        first, last = stint.strip().split("-")
+        lengths.append(int(last) - int(first) + 1)
+
+    return {
+        "compounds": [name.strip() for name in compounds.split("→")],
+        "lengths": lengths,
+    }
+
+
+def _simulate_chunk(
+    seed: np.random.SeedSequence,
+    n_races: int,
+    strategies: list[dict[str, list]],
+    compounds: dict[str, dict[str, float]],
+    params: dict,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Race times of every strategy and finishing positions against the field, shape
+    # (n_strategies, n_races). All strategies share the same random race conditions.
+    rng: np.random.Generator = np.random.default_rng(seed)
+    race_laps: int = sum(strategies[0]["lengths"])
+
+    # Race-wide conditions
+    sc_lap: np.ndarray = np.where(
+        rng.random(n_races) < params["safety_car"],
+        rng.integers(1, race_laps, n_races),
+        -100,
+    )
+    vsc_lap: np.ndarray = np.where(
+        rng.random(n_races) < params["vsc"], rng.integers(1, race_laps, n_races), -100
+    )
+    deg_factor: np.ndarray = rng.lognormal(0.0, params["degradation_noise"], n_races)
+
+    # Rival race times relative to a clean run of the reference strategy; a neutralised
+    # race compresses the gaps of the field
+    compression: np.ndarray = np.where(sc_lap > 0, params["sc_compression"], 1.0)
+    field: np.ndarray = (
+        np.asarray(params["field_gaps"])[:, None]
+        + rng.normal(0.0, params["field_noise"], (len(params["field_gaps"]), n_races))
+    ) * compression
+
+    times: np.ndarray = np.zeros((len(strategies), n_races))
+    for s, strategy in enumerate(strategies):
+        lap: int = 0
+        for stint, (compound, length) in enumerate(
+            zip(strategy["compounds"], strategy["lengths"])
+        ):
+            pace: float = compounds[compound]["pace"]
+            degradation: float = compounds[compound]["degradation"]
+            times[s] += (
+                length * pace
+                + deg_factor * degradation * length * (length - 1) / 2
+                + rng.normal(0.0, params["lap_noise"] * np.sqrt(length), n_races)
+            )
+            lap += length
+
+            # Pit stop at the end of every stint but the last
+            if stint < len(strategy["lengths"]) - 1:
+                stop: np.ndarray = params["pit_loss"] + np.abs(
+                    rng.normal(0.0, params["pit_noise"], n_races)
+                )
+                factor: np.ndarray = np.where(
+                    (lap >= sc_lap) & (lap < sc_lap + SC_LAPS),
+                    SC_PIT_FACTOR,
+                    np.where(
+                        (lap >= vsc_lap) & (lap < vsc_lap + VSC_LAPS),
+                        VSC_PIT_FACTOR,
+                        1.0,
+                    ),
+                )
+                times[s] += stop * factor
+
+    # Clean race time of the first strategy, the zero point of the field gaps
+    reference: float = (
+        sum(
+            length * compounds[compound]["pace"]
+            + compounds[compound]["degradation"] * length * (length - 1) / 2
+            for compound, length in zip(
+                strategies[0]["compounds"], strategies[0]["lengths"]
+            )
+        )
+        + (len(strategies[0]["lengths"]) - 1) * params["pit_loss"]
+    )
+    positions: np.ndarray = 1 + (
+        (times - reference)[:, None, :] > field[None, :, :]
+    ).sum(axis=1)
+
+    return times, positions
+
+
+def simulation_key(
+    strategies: list[dict[str, list]],
+    compounds: dict[str, dict[str, float]],
+    params: dict,
+    n_races: int,
+    seed: int,
+) -> str:
+    """
+    Hash of every input of a simulation.
+
+    Returns:
+        (str): Hex digest used to cache the results.
+    """
+    payload: str = json.dumps(
+        [strategies, compounds, params, n_races, seed], sort_keys=True, default=float
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def simulate_races(
+    strategies: list[dict[str, list]],
+    compounds: dict[str, dict[str, float]],
+    grand_prix: str | None = None,
+    pit_loss: float = 21.0,
+    n_races: int = 50_000,
+    seed: int = 2024,
+    field_gaps: list[float] | None = None,
+    max_workers: int | None = None,
+    cache_dir: str = SIMULATION_CACHE_DIR,
+) -> pd.DataFrame:
+    """
+    Simulate many races for each strategy and summarise the outcomes.
+
+    Every race draws safety car and VSC periods (circuit-specific odds), pit stop time
+    variance and tyre degradation noise. Results are deterministic for a given seed and
+    are cached on disk by the hash of all inputs.
+
+    Args:
+        strategies (list[dict[str, list]]): `compounds` and `lengths` of each strategy (see `parse_strategy`).
+        compounds (dict[str, dict[str, float]]): `pace` and `degradation` per compound.
+        grand_prix (str | None, optional): Circuit, for the neutralisation odds. Defaults to generic odds.
+        pit_loss (float, optional): Mean pit lane loss (s). Defaults to 21.0.
+        n_races (int, optional): Number of races to simulate. Defaults to 50,000.
+        seed (int, optional): Random seed. Defaults to 2024.
+        field_gaps (list[float] | None, optional): Expected race time of each rival relative to
+            the first strategy (s). Defaults to 19 rivals spread from -20 s to +70 s.
+        max_workers (int | None, optional): Worker threads. Defaults to the pool's default.
+        cache_dir (str, optional): Folder of the on-disk cache. Defaults to `SIMULATION_CACHE_DIR`.
+
+    Returns:
+        (pd.DataFrame): One row per strategy with win/podium/points odds, expected points,
+            race time percentiles and the probability of every finishing position.
+    """
+    # Input checking
+    if not strategies:
+        raise ValueError("Please provide at least one strategy to simulate.")
+    if len({sum(strategy["lengths"]) for strategy in strategies}) != 1:
+        raise ValueError("All strategies must cover the same number of laps.")
+
+    params: dict = {
+        **CIRCUIT_NEUTRALISATION.get(grand_prix, DEFAULT_NEUTRALISATION),
+        "pit_loss": pit_loss,
+        "pit_noise": 0.8,
+        "lap_noise": 0.35,
+        "degradation_noise": 0.15,
+        "sc_compression": 0.4,
+        "field_noise": 6.0,
+        "field_gaps": (
+            field_gaps
+            if field_gaps is not None
+            else np.linspace(-20.0, 70.0, 19).round(1).tolist()
+        ),
+    }
+    key: str = simulation_key(strategies, compounds, params, n_races, seed)
+    cache_path: str = os.path.join(cache_dir, f"{key}.parquet")
+    if os.path.exists(cache_path):
+        # Mark the file as recently used for the disk eviction
+        os.utime(cache_path)
+        return pd.read_parquet(cache_path)
+
+    sizes: list[int] = [CHUNK_SIZE] * (n_races // CHUNK_SIZE)
+    if n_races % CHUNK_SIZE:
+        sizes.append(n_races % CHUNK_SIZE)
+    seeds: list[np.random.SeedSequence] = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs: list[tuple] = [
+        (child, size, strategies, compounds, params)
+        for child, size in zip(seeds, sizes)
+    ]
+
+    if n_races >= POOL_THRESHOLD and len(jobs) > 1 and max_workers != 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            chunks: list[tuple[np.ndarray, np.ndarray]] = list(
+                pool.map(_simulate_chunk, *zip(*jobs))
+            )
+    else:
+        chunks = [_simulate_chunk(*job) for job in jobs]
+    times: np.ndarray = np.hstack([chunk[0] for chunk in chunks])
+    positions: np.ndarray = np.hstack([chunk[1] for chunk in chunks])
+
+    field_size: int = len(params["field_gaps"]) + 1
+    points: np.ndarray = np.array(POINTS + [0] * max(field_size - len(POINTS), 0))
+    results: pd.DataFrame = pd.DataFrame(
+        {
+            "strategy": [
+                " → ".join(strategy["compounds"])
+                + " ("
+                + ", ".join(map(str, strategy["lengths"]))
+                + ")"
+                for strategy in strategies
+            ],
+            "win": (positions == 1).mean(axis=1),
+            "podium": (positions <= 3).mean(axis=1),
+            "points_finish": (positions <= len(POINTS)).mean(axis=1),
+            "expected_points": points[positions - 1].mean(axis=1),
+            "mean_position": positions.mean(axis=1),
+            "p10_time": np.percentile(times, 10, axis=1),
+            "median_time": np.median(times, axis=1),
+            "p90_time": np.percentile(times, 90, axis=1),
+        }
+    )
+    for position in range(1, field_size + 1):
+        results[f"P{position}"] = (positions == position).mean(axis=1)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    results.to_parquet(cache_path + ".tmp", index=False)
+    os.replace(cache_path + ".tmp", cache_path)
+    evict_disk_cache(
+        cache_dir, SIMULATION_CACHE_BYTES, keep=cache_path, suffix=".parquet"
+    )
+
+    return results
+
+
+@st.cache_data(show_spinner="Simulating races...", max_entries=16)
+def simulate_races_cached(
+    strategies: list[dict[str, list]],
+    compounds: dict[str, dict[str, float]],
+    grand_prix: str | None = None,
+    pit_loss: float = 21.0,
+    n_races: int = 50_000,
+    seed: int = 2024,
+) -> pd.DataFrame:
+    """
+    Page-facing wrapper of `simulate_races`, so reruns and re-opened pages reuse results.
+
+    Returns:
+        (pd.DataFrame): See `simulate_races`.
+    """
+    return simulate_races(strategies, compounds, grand_prix, pit_loss, n_races, seed)
@@ -0,0 +1,128 @@
+# Session state shared between pages and between the fragments of a page
+
+# Imports
+import copy
+from typing import Any
+
+import streamlit as st
+
+# Every key a page may read from `st.session_state`, with its default value and the
+# section that owns (writes) it. Fragments only write their own keys and read the
+# others, so a fragment rerun never has to re-execute another section. Keys marked
+# `persist` are saved to the career database and restored in the next session.
+STATE_KEYS: dict[str, dict[str, Any]] = {
+    "theme": {"default": "dark", "owner": "index", "persist": True},
+    "career_id": {"default": None, "owner": "index", "persist": False},
+    "data_version": {"default": None, "owner": "index", "persist": False},
+    "selected_year": {
+        "default": "2024",
+        "owner": "data_inputs.schedule",
+        "persist": True,
+    },
+    "custom_schedule": {
+        "default": {},
+        "owner": "data_inputs.schedule",
+        "persist": True,
+    },
+    "selected_team": {
+        "default": "Alpine",
+        "owner": "data_inputs.team_colours",
+        "persist": True,
+    },
+    "team_colours": {
+        "default": {"primary": "#0078c9", "secondary": "#ff87bc"},
+        "owner": "data_inputs.team_colours",
+        "persist": True,
+    },
+}
+
+# Career opened when the user has not picked one
+DEFAULT_CAREER: str = "My career"
+
+
+def init_state() -> None:
+    """
+    Fill in every shared key that is not in the session yet. On the first run of a
+    session the saved settings of the career are loaded (one indexed query); later
+    runs only touch `st.session_state`.
+    """
+    saved: dict[str, Any] = {}
+    if st.session_state.get("career_id") is None:
+        from .career_db import get_or_create_career, load_settings
+
+        st.session_state["career_id"] = get_or_create_career(DEFAULT_CAREER)
+        saved = load_settings(st.session_state["career_id"])
+
+    for key, spec in STATE_KEYS.items():
+        if key not in st.session_state:
+            st.session_state[key] = (
+                saved[key]
+                if spec["persist"] and key in saved
+                else copy.deepcopy(spec["default"])
+            )
+
+
+def get_state(key: str) -> Any:
+    """
+    Read a shared key, falling back to its default.
+
+    Args:
+        key (str): One of `STATE_KEYS`.
+
+    Returns:
+        (Any): Current value of the key.
+    """
+    # Input checking
+    if key not in STATE_KEYS:
+        raise ValueError(f"Unknown state key: {key}. Please add it to `STATE_KEYS`.")
+
+    if key not in st.session_state:
+        st.session_state[key] = copy.deepcopy(STATE_KEYS[key]["default"])
+
+    return st.session_state[key]
+
+
+def set_state(key: str, value: Any) -> bool:
+    """
+    Write a shared key. Persisted keys are queued for saving to the career database.
+
+    Args:
+        key (str): One of `STATE_KEYS`.
+        value (Any): New value.
+
+    Returns:
+        (bool): Whether the value changed.
+    """
+    # Input checking
+    if key not in STATE_KEYS:
+        raise ValueError(f"Unknown state key: {key}. Please add it to `STATE_KEYS`.")
+
+    changed: bool = st.session_state.get(key) != value
+    if changed:
+        st.session_state[key] = value
+
+        # Saved behind the UI by the career database's write-behind queue
+        career_id: int | None = st.session_state.get("career_id")
+        if STATE_KEYS[key]["persist"] and career_id is not None:
+            from .career_db import save_setting
+
+            save_setting(career_id, key, value)
+
+    return changed
+
+
+def active_schedule() -> dict[str, bool]:
+    """
+    Schedule chosen on the Data Input page: a preset season or the custom calendar.
+
+    Returns:
+        (dict[str, bool]): Grand Prix -> sprint weekend, in calendar order.
+    """
+    from .f1_utils import get_schedule
+
+    year: str = get_state("selected_year")
+    if year == "Custom":
+        # Same starting point as the editor until a custom calendar is saved
+        return get_state("custom_schedule") or get_schedule(2025)
+
+    return get_schedule(int(year))
@@ -0,0 +1,382 @@
+# Pit strategy search for the Strategy Hub
+
+# Imports
+import itertools
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Default dry compounds: base pace (s/lap on fresh tyres) and degradation (s/lap lost per lap of tyre age)
+DEFAULT_COMPOUNDS: dict[str, dict[str, float]] = {
+    "Soft": {"pace": 90.0, "degradation": 0.06},
+    "Medium": {"pace": 90.6, "degradation": 0.035},
+    "Hard": {"pace": 91.1, "degradation": 0.02},
+}
+
+
+@lru_cache(maxsize=32)
+def stint_lengths(race_laps: int, stints: int, min_stint: int = 1) -> np.ndarray:
+    """
+    Every way of splitting a race into consecutive stints.
+
+    Args:
+        race_laps (int): Number of laps in the race.
+        stints (int): Number of stints (stops + 1).
+        min_stint (int, optional): Shortest allowed stint. Defaults to 1.
+
+    Returns:
+        (np.ndarray): Array of shape (n, stints) with the length of each stint. Read-only.
+    """
+    spare: int = race_laps - stints * min_stint
+    if spare < 0:
+        return np.empty((0, stints), dtype=np.int16)
+
+    # Stars and bars: choose where the (stints - 1) bars go among spare + stints - 1 slots
+    bars: np.ndarray = np.fromiter(
+        itertools.chain.from_iterable(
+            itertools.combinations(range(spare + stints - 1), stints - 1)
+        ),
+        dtype=np.int16,
+    ).reshape(-1, stints - 1)
+    edges: np.ndarray = np.hstack(
+        [
+            np.full((len(bars), 1), -1, dtype=np.int16),
+            bars,
+            np.full((len(bars), 1), spare + stints - 1, dtype=np.int16),
+        ]
+    )
+    lengths: np.ndarray = np.diff(edges, axis=1) - 1 + min_stint
+    lengths.setflags(write=False)
+
+    return lengths
+
+
+def _lower_bound(
+    race_laps: int,
+    stints: int,
+    pit_loss: float,
+    pace: np.ndarray,
+    degradation: np.ndarray,
+) -> float:
+    # Fastest base pace for every lap plus the least degradation possible, which is an
+    # even split on the least degrading compound of the set
+    even: float = race_laps / stints
+    return (
+        (stints - 1) * pit_loss
+        + race_laps * pace.min()
+        + degradation.min() * stints * even * (even - 1) / 2
+    )
+
+
+def enumerate_strategies(
+    race_laps: int,
+    pit_loss: float,
+    compounds: dict[str, dict[str, float]] = DEFAULT_COMPOUNDS,
+    min_compounds: int = 2,
+    min_stops: int = 1,
+    max_stops: int = 3,
+    min_stint: int = 1,
+    top_k: int = 10,
+) -> pd.DataFrame:
+    """
+    Find the fastest pit strategies of a race.
+
+    Stint times are `laps * pace + degradation * laps * (laps - 1) / 2`, scored for every
+    stint split of a compound set at once with NumPy. Compound sets are visited from the
+    most to the least promising lower bound and skipped once they cannot beat the current
+    top-k, so most of the search space is never evaluated.
+
+    Args:
+        race_laps (int): Number of laps in the race.
+        pit_loss (float): Time lost in the pit lane per stop (s).
+        compounds (dict[str, dict[str, float]], optional): `pace` and `degradation` per compound,
+            plus an optional `max_laps` tyre life. Defaults to `DEFAULT_COMPOUNDS`.
+        min_compounds (int, optional): Distinct compounds that must be used. Defaults to 2.
+        min_stops (int, optional): Fewest stops to consider. Defaults to 1.
+        max_stops (int, optional): Most stops to consider. Defaults to 3.
+        min_stint (int, optional): Shortest allowed stint. Defaults to 1.
+        top_k (int, optional): Number of strategies to return. Defaults to 10.
+
+    Returns:
+        (pd.DataFrame): The best strategies, fastest first, with `stops`, `compounds`, `stints`,
+            `total_time` and `gap` (to the fastest strategy) columns.
+    """
+    # Input checking
+    if race_laps < 1:
+        raise ValueError("A race needs at least one lap.")
+    if not 0 <= min_stops <= max_stops:
+        raise ValueError("Please make sure that 0 <= min_stops <= max_stops.")
+    if top_k < 1:
+        raise ValueError(
+            "Cannot return fewer than one strategy. Please choose a positive top_k."
+        )
+    if min_compounds > len(compounds):
+        raise ValueError(
+            f"Cannot use {min_compounds} different compounds out of {len(compounds)}."
+        )
+
+    names: list[str] = list(compounds.keys())
+    pace: np.ndarray = np.array([compounds[name]["pace"] for name in names])
+    degradation: np.ndarray = np.array(
+        [compounds[name]["degradation"] for name in names]
+    )
+    max_laps: np.ndarray = np.array(
+        [compounds[name].get("max_laps", race_laps) for name in names]
+    )
+
+    # Candidate compound sets. Stint order does not change the total time, so each
+    # multiset is only scored once (every stint split is still enumerated).
+    candidates: list[tuple[float, tuple[int, ...]]] = []
+    for stops in range(min_stops, max_stops + 1):
+        for combo in itertools.combinations_with_replacement(
+            range(len(names)), stops + 1
+        ):
+            if len(set(combo)) < min_compounds:
+                continue
+            index: np.ndarray = np.array(combo)
+            bound: float = _lower_bound(
+                race_laps, stops + 1, pit_loss, pace[index], degradation[index]
+            )
+            candidates.append((bound, combo))
+    candidates.sort()
+
+    best_times: np.ndarray = np.empty(0)
+    best_rows: list[tuple[float, tuple[int, ...], np.ndarray]] = []
+    for bound, combo in candidates:
+        # Branch and bound: nothing in this set can enter the top-k anymore
+        if len(best_times) >= top_k and bound >= best_times[top_k - 1]:
+            break
+
+        index = np.array(combo)
+        lengths: np.ndarray = stint_lengths(race_laps, len(combo), min_stint)
+        valid: np.ndarray = (lengths <= max_laps[index]).all(axis=1)
+        # Stints on the same compound are interchangeable, keep one ordering of them
+        for j in range(len(combo) - 1):
+            if combo[j] == combo[j + 1]:
+                valid &= lengths[:, j] >= lengths[:, j + 1]
+        lengths = lengths[valid]
+        if not len(lengths):
+            continue
+
+        times: np.ndarray = (
+            lengths @ pace[index]
+            + (lengths * (lengths - 1) / 2) @ degradation[index]
+            + (len(combo) - 1) * pit_loss
+        )
+        keep: np.ndarray = (
+            np.argpartition(times, top_k - 1)[:top_k]
+            if len(times) > top_k
+            else np.arange(len(times))
+        )
+        best_rows += [(times[i], combo, lengths[i]) for i in keep]
+        best_rows.sort(key=lambda row: row[0])
+        best_rows = best_rows[:top_k]
+        best_times = np.array([row[0] for row in best_rows])
+
+    rows: list[dict] = []
+    for total_time, combo, lengths in best_rows:
+        ends: np.ndarray = np.cumsum(lengths)
+        rows.append(
+            {
+                "stops": len(combo) - 1,
+                "compounds": " → ".join(names[i] for i in combo),
+                "stints": ", ".join(
+                    f"{end - length + 1}-{end}" for end, length in zip(ends, lengths)
+                ),
+                "total_time": round(float(total_time), 3),
+            }
+        )
+
+    strategies: pd.DataFrame = pd.DataFrame(
+        rows, columns=["stops", "compounds", "stints", "total_time"]
+    )
+    strategies["gap"] = (
+        strategies["total_time"] - strategies["total_time"].min()
+    ).round(3)
+
+    return strategies
+
+
+def _stint_costs(
+    compounds: dict[str, dict[str, float]], race_laps: int
+) -> tuple[np.ndarray, np.ndarray]:
+    # Cumulative cost of a stint of each length on fresh tyres, shape (compounds, laps + 1),
+    # and the longest stint each compound can do
+    age: np.ndarray = np.arange(race_laps)
+    lap_costs: list[np.ndarray] = []
+    for values in compounds.values():
+        cliff: float = values.get("cliff_lap", race_laps)
+        lap_costs.append(
+            values["pace"]
+            + values["degradation"] * age
+            + values.get("cliff_penalty", 0.0) * np.clip(age - cliff, 0, None)
+        )
+    costs: np.ndarray = np.hstack(
+        [np.zeros((len(compounds), 1)), np.cumsum(lap_costs, axis=1)]
+    )
+    max_laps: np.ndarray = np.array(
+        [
+            min(values.get("max_laps", race_laps), race_laps)
+            for values in compounds.values()
+        ],
+        dtype=int,
+    )
+
+    return costs, max_laps
+
+
+def solve_strategies(
+    race_laps: int,
+    pit_loss: float,
+    compounds: dict[str, dict[str, float]] = DEFAULT_COMPOUNDS,
+    min_compounds: int = 2,
+    max_stops: int = 4,
+    min_stint: int = 1,
+    fuel_effect: float = 0.0,
+    top_k: int = 10,
+) -> pd.DataFrame:
+    """
+    Find the fastest pit strategies with dynamic programming.
+
+    The state is (lap, stops used, compounds used) at the start of a stint. Every stop
+    fits fresh tyres, so the current compound and tyre age of the lap-by-lap state are
+    fully described by the stint being chosen from there. Each state keeps its `top_k`
+    best costs-to-go, which gives the optimum and the k-best alternatives in
+    O(laps² · stops · 2^compounds · k) instead of enumerating every split.
+
+    Unlike `enumerate_strategies`, lap costs can be non-linear: a compound may define a
+    `cliff_lap` after which it loses an extra `cliff_penalty` per lap, and a `max_laps`
+    tyre life. Fuel burn makes each lap `fuel_effect` seconds faster than the previous one.
+
+    Args:
+        race_laps (int): Number of laps in the race.
+        pit_loss (float): Time lost in the pit lane per stop (s).
+        compounds (dict[str, dict[str, float]], optional): `pace` and `degradation` per compound,
+            plus optional `max_laps`, `cliff_lap` and `cliff_penalty`. Defaults to `DEFAULT_COMPOUNDS`.
+        min_compounds (int, optional): Distinct compounds that must be used. Defaults to 2.
+        max_stops (int, optional): Most stops to consider. Defaults to 4.
+        min_stint (int, optional): Shortest allowed stint. Defaults to 1.
+        fuel_effect (float, optional): Lap time gained per lap of fuel burnt (s). Defaults to 0.
+        top_k (int, optional): Number of strategies to return. Defaults to 10.
+
+    Returns:
+        (pd.DataFrame): Same columns as `enumerate_strategies`, fastest first.
+    """
+    # Input checking
+    if race_laps < 1:
+        raise ValueError("A race needs at least one lap.")
+    if max_stops < 0:
+        raise ValueError("max_stops cannot be negative.")
+    if top_k < 1:
+        raise ValueError(
+            "Cannot return fewer than one strategy. Please choose a positive top_k."
+        )
+    if min_compounds > len(compounds):
+        raise ValueError(
+            f"Cannot use {min_compounds} different compounds out of {len(compounds)}."
+        )
+
+    names: list[str] = list(compounds.keys())
+    costs, max_laps = _stint_costs(compounds, race_laps)
+    n_masks: int = 1 << len(names)
+    popcount: np.ndarray = np.array([bin(mask).count("1") for mask in range(n_masks)])
+
+    # best[lap, stops, mask, rank]: k best times from the start of a stint at `lap` to the
+    # flag, with the compound, stint length and rank in the next state that produced them
+    shape: tuple[int, ...] = (race_laps + 1, max_stops + 2, n_masks, top_k)
+    best: np.ndarray = np.full(shape, np.inf)
+    choice: np.ndarray = np.zeros(shape + (3,), dtype=np.int32)
+
+    # At the flag, the race is valid if enough compounds were used
+    best[race_laps, :, popcount >= min_compounds, 0] = 0.0
+
+    masks: np.ndarray = np.arange(n_masks)
+    for lap in range(race_laps - min_stint, -1, -1):
+        remaining: int = race_laps - lap
+        for stops in range(min(max_stops, lap // max(min_stint, 1)), -1, -1):
+            # Candidates of every compounds-used mask at once, shape (masks, options)
+            candidates: list[np.ndarray] = []
+            pointers: list[np.ndarray] = []
+            for c in range(len(names)):
+                lengths: np.ndarray = np.arange(
+                    min_stint, min(max_laps[c], remaining) + 1
+                )
+                if not len(lengths):
+                    continue
+                ends: np.ndarray = lap + lengths
+                finish: np.ndarray = ends == race_laps
+
+                # Stopping again needs a spare stop and room for another stint
+                to_go: np.ndarray = best[
+                    ends[:, None],
+                    np.where(finish, stops, stops + 1)[:, None],
+                    (masks | (1 << c))[None, :],
+                ]
+                to_go[~finish & (race_laps - ends < min_stint)] = np.inf
+                total: np.ndarray = (
+                    costs[c, lengths] + np.where(finish, 0.0, pit_loss)
+                )[:, None, None] + to_go
+
+                candidates.append(total.transpose(1, 0, 2).reshape(n_masks, -1))
+                pointers.append(
+                    np.stack(
+                        [
+                            np.full(len(lengths) * top_k, c),
+                            np.repeat(lengths, top_k),
+                            np.tile(np.arange(top_k), len(lengths)),
+                        ],
+                        axis=1,
+                    )
+                )
+            if not candidates:
+                continue
+
+            totals: np.ndarray = np.hstack(candidates)
+            n_keep: int = min(top_k, totals.shape[1])
+            keep: np.ndarray = np.argpartition(totals, n_keep - 1, axis=1)[:, :n_keep]
+            keep = np.take_along_axis(
+                keep,
+                np.argsort(
+                    np.take_along_axis(totals, keep, axis=1), axis=1, kind="stable"
+                ),
+                axis=1,
+            )
+            best[lap, stops, :, :n_keep] = np.take_along_axis(totals, keep, axis=1)
+            choice[lap, stops, :, :n_keep] = np.concatenate(pointers)[keep]
+
+    # Walk the pointers back from the start of the race
+    fuel: float = fuel_effect * race_laps * (race_laps - 1) / 2
+    rows: list[dict] = []
+    for rank in range(top_k):
+        total_time: float = best[0, 0, 0, rank]
+        if not np.isfinite(total_time):
+            break
+
+        lap, stops, mask, position = 0, 0, 0, rank
+        stint_compounds: list[str] = []
+        stints: list[str] = []
+        while lap < race_laps:
+            c, length, position = choice[lap, stops, mask, position]
+            stint_compounds.append(names[c])
+            stints.append(f"{lap + 1}-{lap + length}")
+            lap, mask = lap + length, mask | (1 << c)
+            stops += lap < race_laps
+
+        rows.append(
+            {
+                "stops": len(stints) - 1,
+                "compounds": " → ".join(stint_compounds),
+                "stints": ", ".join(stints),
+                "total_time": round(float(total_time - fuel), 3),
+            }
+        )
+
+    strategies: pd.DataFrame = pd.DataFrame(
+        rows, columns=["stops", "compounds", "stints", "total_time"]
+    )
+    strategies["gap"] = (
+        strategies["total_time"] - strategies["total_time"].min()
+    ).round(3)
+
+    return strategies
@@ -1,11 +1,13 @@
 # Utility functions
 
 # Imports
-import pandas as pd
+from typing import TYPE_CHECKING
+
 import streamlit as st
-import matplotlib.font_manager as fm  # Import fonts
 
-from PIL import Image
+# matplotlib is only loaded once a chart asks for fonts (see `fonts.py`)
+if TYPE_CHECKING:
+    import matplotlib.font_manager as fm
 
 
 def load_csv(
@@ -16,7 +18,7 @@ def load_csv(
     Load a CSV file, return its content as a DataFrame, and display on the app.
 
     Args:
-        file_path (str): Name of the worksheet on the Google Sheet file.
+        file_path (str): Path to the CSV file. Unchanged files are served from the ingestion cache.
         display (bool, optional): Whether to display the DataFrame in the app. Defaults to True.
 
     Returns:
@@ -24,9 +26,11 @@ def load_csv(
             DataFrame containing the CSV file content.
     """
 
+    from .ingest import read_csv_cached
+
     # Load the CSV file
     with st.spinner("Grabbing data...Remember to hydrate while waiting!"):
-        df = pd.read_csv(file_path, delimiter=",", encoding="utf-8")
+        df = read_csv_cached(file_path)
 
     # Display the DataFrame in the app
     if display:
@@ -59,60 +63,33 @@ def display_markdown(file_path: str):
     st.markdown(content)
 
 
-@st.cache_resource
 def import_fonts(
     which: str = "roboto",
     weight: str = "regular",
-) -> fm.FontProperties | list[fm.FontProperties, fm.FontProperties, fm.FontProperties]:
+) -> "fm.FontProperties | list[fm.FontProperties, fm.FontProperties, fm.FontProperties]":
     """
-    This function imports the Roboto Regular and/or Roboto Bold fonts from the same folder as this code.
+    Get the Roboto or Formula1 fonts from the font registry. Each face is only loaded
+    once per process and shared by every chart.
 
     Args:
         which (str): Which font to import? Options are "f1" and "roboto". Default is "roboto".
-        weight (str): Single font weight ('regular', 'light', 'bold'). Use 'all' to get all fonts.
+        weight (str): Single font weight ('regular', 'light'/'wide', 'bold'). Use 'all' to get all fonts.
 
     Returns:
         Single font properties or tuple containing the fonts.
     """
+    from .fonts import FONT_FAMILIES, get_font
+
     # Inputs checking
     if which.lower() not in ["f1", "roboto"]:
         raise ValueError("Unknown font type. Please choose between 'f1' or 'roboto'.")
 
-    # Import the fonts from the same folder as this code
-    robotoRegular = fm.FontProperties(fname="src/assets/fonts/Roboto-Regular.ttf")
-    robotoLight = fm.FontProperties(fname="src/assets/fonts/Roboto-Light.ttf")
-    robotoBold = fm.FontProperties(fname="src/assets/fonts/Roboto-Bold.ttf")
-
-    f1Regular = fm.FontProperties(fname="src/assets/fonts/Formula1-Regular.ttf")
-    f1Wide = fm.FontProperties(fname="src/assets/fonts/Formula1-Wide.ttf")
-    f1Bold = fm.FontProperties(fname="src/assets/fonts/Formula1-Bold.ttf")
-
-    if which == "roboto":
-        if weight == "all":
-            return robotoRegular, robotoLight, robotoBold
-        elif weight == "regular":
-            return robotoRegular
-        elif weight == "light":
-            return robotoLight
-        elif weight == "bold":
-            return robotoBold
-        else:
-            raise ValueError(
-                "Unknown font weight. Please choose from 'regular', 'light', 'bold', or 'all' to get all fonts."
-            )
-    elif which == "f1":
-        if weight == "all":
-            return f1Regular, f1Wide, f1Bold
-        elif weight == "regular":
-            return f1Regular
-        elif weight == "wide":
-            return f1Wide
-        elif weight == "bold":
-            return f1Bold
-        else:
-            raise ValueError(
-                "Unknown font weight. Please choose from 'regular', 'wide', 'bold', or 'all' to get all fonts."
-            )
+    if weight == "all":
+        return tuple(
+            get_font(which.lower(), face) for face in FONT_FAMILIES[which.lower()]
+        )
+
+    return get_font(which.lower(), weight)
 
 
 @st.cache_resource
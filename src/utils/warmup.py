@@ -0,0 +1,217 @@
+# Warm the shared caches at server start, so the first visitor does not pay for them
+
+# Imports
+import importlib
+import threading
+import time
+from typing import Any, Callable
+
+from loguru import logger
+
+# Modules the pages import, loaded once so the first script run finds them in memory
+PRELOAD_MODULES: list[str] = [
+    "pandas",
+    "numpy",
+    "pyarrow.dataset",
+    "pyarrow.parquet",
+    "plotly.graph_objects",
+    "styles",
+    "components",
+    "utils.f1_utils",
+    "utils.race_store",
+    "utils.aggregates",
+    "utils.pit_index",
+    "utils.degradation",
+    "utils.charts",
+    "utils.strategy",
+    "utils.simulator",
+    "utils.recompute",
+]
+
+# Longest wait (s) for the Streamlit runtime before warming anyway
+RUNTIME_TIMEOUT: float = 60.0
+
+_lock: threading.Lock = threading.Lock()
+_status: dict[str, Any] = {
+    "ready": False,
+    "started": None,
+    "finished": None,
+    "seconds": None,
+    "steps": {},
+}
+
+
+def _modules() -> int:
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+    return len(PRELOAD_MODULES)
+
+
+def _reference() -> int:
+    from .f1_utils import get_schedule, get_team_colours
+    from .utils import plotly_config
+
+    plotly_config()
+    schedules: list = [get_schedule(year) for year in [0, 2024, 2025]]
+    return len(get_team_colours("all")) + sum(len(s) for s in schedules)
+
+
+def _styles() -> int:
+    from styles import PALETTES, Styles
+
+    styles: Styles = Styles()
+    for palette in PALETTES.values():
+        styles.compile_css(palette)
+    return len(PALETTES)
+
+
+def _fonts() -> int:
+    from .fonts import FONT_FAMILIES, get_font
+
+    for family, faces in FONT_FAMILIES.items():
+        for face in faces:
+            get_font(family, face)
+    return sum(len(faces) for faces in FONT_FAMILIES.values())
+
+
+def _assets() -> int:
+    from .assets import asset_manifest
+
+    return len(asset_manifest())
+
+
+def _season_data() -> int:
+    from .aggregates import aggregate_lookup, aggregate_seasons
+    from .degradation import get_degradation
+    from .pit_index import load_pit_index, pit_index_seasons
+    from .race_store import list_partitions, load_table
+
+    loaded: int = 0
+    for season in aggregate_seasons():
+        loaded += len(aggregate_lookup(season))
+    for season in pit_index_seasons():
+        loaded += len(load_pit_index(season)) + len(load_pit_index(season, "season"))
+
+    # Same call as the Race Data page makes for its default (latest) season
+    lap_sessions = list_partitions("laps")
+    lap_sessions = lap_sessions[lap_sessions["session"] == "race"]
+    if not lap_sessions.empty:
+        loaded += len(
+            load_table(
+                "laps",
+                columns=["round", "driver", "lap", "lap_time"],
+                season=int(lap_sessions["season"].max()),
+                round_no=None,
+                session="race",
+            )
+        )
+
+    return loaded + len(get_degradation())
+
+
+# Warm-up steps, in order: step name -> function returning how many items it loaded
+WARMUP_STEPS: dict[str, Callable[[], int]] = {
+    "modules": _modules,
+    "reference": _reference,
+    "styles": _styles,
+    "fonts": _fonts,
+    "assets": _assets,
+    "season_data": _season_data,
+}
+
+
+def _wait_for_runtime(timeout: float) -> bool:
+    # Streamlit caches only land in the server's storage once its runtime exists
+    from streamlit.runtime import Runtime
+
+    deadline: float = time.monotonic() + timeout
+    while not Runtime.exists():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def warm_caches(
+    steps: list[str] | None = None, runtime_timeout: float | None = RUNTIME_TIMEOUT
+) -> dict[str, Any]:
+    """
+    Populate the process-wide caches used by the pages: modules, schedules and team
+    colours, compiled CSS of every palette, fonts, built assets and the season data.
+    A failing step is logged and skipped, the others still run.
+
+    Args:
+        steps (list[str] | None, optional): Steps of `WARMUP_STEPS` to run. Defaults to all.
+        runtime_timeout (float | None, optional): Seconds to wait for the Streamlit runtime
+            first, None not to wait (e.g. outside a server). Defaults to `RUNTIME_TIMEOUT`.
+
+    Returns:
+        (dict[str, Any]): Readiness report, see `warmup_status`.
+    """
+    steps = list(WARMUP_STEPS) if steps is None else steps
+
+    # Input checking
+    unknown: list[str] = [step for step in steps if step not in WARMUP_STEPS]
+    if unknown:
+        raise ValueError(
+            f"Unknown warm-up steps: {unknown}. Please choose from {list(WARMUP_STEPS)}."
+        )
+
+    with _lock:
+        _status.update(ready=False, started=time.time(), finished=None, seconds=None)
+        _status["steps"] = {}
+
+    if runtime_timeout is not None and not _wait_for_runtime(runtime_timeout):
+        logger.warning("Streamlit runtime not started, warming the caches anyway")
+
+    start: float = time.perf_counter()
+    for step in steps:
+        step_start: float = time.perf_counter()
+        record: dict[str, Any] = {"ok": True, "items": 0}
+        try:
+            record["items"] = WARMUP_STEPS[step]()
+        except Exception as e:
+            record.update(ok=False, error=str(e))
+            logger.warning(f"Warm-up step {step} failed: {e}")
+        record["seconds"] = round(time.perf_counter() - step_start, 4)
+        logger.debug(f"Warm-up step {step}: {record}")
+        with _lock:
+            _status["steps"][step] = record
+
+    seconds: float = time.perf_counter() - start
+    with _lock:
+        _status.update(ready=True, finished=time.time(), seconds=round(seconds, 4))
+    logger.info(f"Caches warm in {seconds:.2f}s, ready for visitors")
+    return warmup_status()
+
+
+def start_warmup(steps: list[str] | None = None) -> threading.Thread:
+    """
+    Warm the caches in a background thread, e.g. while the Streamlit server starts.
+
+    Args:
+        steps (list[str] | None, optional): Steps of `WARMUP_STEPS` to run. Defaults to all.
+
+    Returns:
+        (threading.Thread): The started (daemon) thread.
+    """
+    thread: threading.Thread = threading.Thread(
+        target=warm_caches, args=(steps,), name="cache-warmup", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def warmup_status() -> dict[str, Any]:
+    """
+    Readiness of the server caches.
+
+    Returns:
+        (dict[str, Any]): `ready`, `started` and `finished` (timestamps), `seconds` and, per
+            step, `ok`, `items`, `seconds` and the `error` of failed steps.
+    """
+    with _lock:
+        return {
+            **_status,
+            "steps": {step: dict(record) for step, record in _status["steps"].items()},
+        }
@@ -0,0 +1,373 @@
+# Watch the exports folder and ingest new or changed files as they land
+
+# Imports
+import json
+import os
+import re
+import threading
+import time
+from typing import Any
+
+from loguru import logger
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+
+from .ingest import file_key
+from .paths import DATA_DIR
+from .race_store import SESSION_TYPES, STORE_DIR
+
+# Folder watched for exports and saves, overridable with the F1M_EXPORTS_DIR variable
+EXPORTS_DIR: str = os.environ.get("F1M_EXPORTS_DIR", os.path.join(DATA_DIR, "exports"))
+
+# Quiet time (s) after the last write before a burst of files is ingested
+DEBOUNCE_SECONDS: float = 2.0
+
+# CSV exports are named <table>_<season>_<round>_<session>.csv, e.g.
+# laps_2025_03_race.csv or results_2025_r3_sprint.csv. Saves (.sav) hold every table.
+EXPORT_PATTERN: re.Pattern = re.compile(
+    r"^(?P<table>[a-z_]+?)_(?P<season>\d{4})_r?(?P<round>\d{1,2})_"
+    rf"(?P<session>{'|'.join(sorted(SESSION_TYPES, key=len, reverse=True))})\.csv$",
+    re.IGNORECASE,
+)
+SAVE_EXTENSION: str = ".sav"
+
+# Content digest of every ingested file, so restarts and duplicate events are skipped
+MANIFEST_FILE: str = "_export_manifest.json"
+
+# Imported tables the materialised aggregates and pit stop index are derived from
+AGGREGATE_TABLES: set[str] = {"results", "laps"}
+AGGREGATE_SESSIONS: set[str] = {"sprint", "race"}
+PIT_INDEX_TABLES: set[str] = {"pit_stops"}
+
+_lock: threading.RLock = threading.RLock()
+_observer: Observer | None = None
+_store_dir: str = STORE_DIR
+_pending: dict[str, float] = {}
+_timer: threading.Timer | None = None
+# Bumped after every ingest that wrote something, read by the pages
+_version: int = 0
+_latest: list[dict] = []
+
+
+def parse_export_name(file_path: str) -> dict | None:
+    """
+    Store partition of a CSV export, from its file name.
+
+    Args:
+        file_path (str): Path to the export.
+
+    Returns:
+        (dict | None): `table`, `season`, `round_no` and `session`, or None if the name
+            does not follow `EXPORT_PATTERN`.
+    """
+    match: re.Match | None = EXPORT_PATTERN.match(os.path.basename(file_path))
+    if match is None:
+        return None
+
+    return {
+        "table": match["table"].lower(),
+        "season": int(match["season"]),
+        "round_no": int(match["round"]),
+        "session": match["session"].lower(),
+    }
+
+
+def _load_manifest(store_dir: str) -> dict[str, str]:
+    path: str = os.path.join(store_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _save_manifest(manifest: dict[str, str], store_dir: str) -> None:
+    os.makedirs(store_dir, exist_ok=True)
+    path: str = os.path.join(store_dir, MANIFEST_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def _is_export(file_path: str) -> bool:
+    return file_path.lower().endswith(SAVE_EXTENSION) or (
+        parse_export_name(file_path) is not None
+    )
+
+
+def _refresh_derived(partitions: list[dict], store_dir: str) -> None:
+    # Materialised aggregates and pit stop index of the written sessions, which the
+    # pages read directly whether or not the recompute graph has computed them
+    from .aggregates import update_aggregates_from_store
+    from .pit_index import update_pit_index_from_store
+    from .race_store import list_partitions
+
+    sessions: set[tuple[int, int, str]] = {
+        (record["season"], record["round_no"], record["session"])
+        for record in partitions
+        if record["table"] in AGGREGATE_TABLES
+        and record["session"] in AGGREGATE_SESSIONS
+    }
+    rounds: set[tuple[int, int]] = {
+        (record["season"], record["round_no"])
+        for record in partitions
+        if record["table"] in PIT_INDEX_TABLES and record["session"] == "race"
+    }
+
+    # Laps can land before the classification, the aggregates wait for the results
+    stored: set[tuple[int, int, str]] = set()
+    if sessions:
+        results = list_partitions("results", store_dir)
+        stored = set(zip(results["season"], results["round"], results["session"]))
+    for season, round_no, session in sorted(sessions & stored):
+        try:
+            update_aggregates_from_store(season, round_no, session, store_dir=store_dir)
+        except Exception as e:
+            logger.error(
+                f"Could not update the aggregates of {season} R{round_no}: {e}"
+            )
+
+    for season, round_no in sorted(rounds):
+        try:
+            update_pit_index_from_store(season, round_no, store_dir=store_dir)
+        except Exception as e:
+            logger.error(
+                f"Could not update the pit stop index of {season} R{round_no}: {e}"
+            )
+
+
+def ingest_exports(file_paths: list[str], store_dir: str = STORE_DIR) -> list[dict]:
+    """
+    Import the new or changed exports among a list of files into the race store, then
+    refresh what is derived from them (aggregates, pit stop index and the recompute
+    graph) and notify the open sessions.
+
+    Args:
+        file_paths (list[str]): Candidate files. Unknown names and unchanged files are skipped.
+        store_dir (str, optional): Root folder of the store. Defaults to `STORE_DIR`.
+
+    Returns:
+        (list[dict]): One record per imported file: `file`, and the `table`, `season`,
+            `round_no` and `session` of CSV exports.
+    """
+    from .race_store import import_csv, read_table
+    from .recompute import NODES, reset_graph, set_input
+    from .save_extractor import extract_save
+
+    global _version
+    imported: list[dict] = []
+    # Store partitions written, CSV exports and the rounds saves touched alike
+    partitions: list[dict] = []
+
+    with _lock:
+        manifest: dict[str, str] = _load_manifest(store_dir)
+        for file_path in sorted(set(file_paths)):
+            if not os.path.isfile(file_path) or not _is_export(file_path):
+                continue
+            path: str = os.path.abspath(file_path)
+            digest: str = file_key(path)
+            if manifest.get(path) == digest:
+                continue
+
+            try:
+                if path.lower().endswith(SAVE_EXTENSION):
+                    summary: dict[str, Any] = extract_save(path, store_dir=store_dir)
+                    if summary["written"]:
+                        # A save can touch any round, start the graph afresh
+                        reset_graph()
+                        imported.append({"file": path})
+                        partitions += summary["partitions"]
+                else:
+                    partition: dict = parse_export_name(path)
+                    import_csv(path, store_dir=store_dir, **partition)
+                    imported.append({"file": path, **partition})
+                    partitions.append(partition)
+            except Exception as e:
+                # Half-written or malformed files are retried on their next change
+                logger.error(f"Could not ingest {path}: {e}")
+                continue
+
+            manifest[path] = digest
+        _save_manifest(manifest, store_dir)
+        _refresh_derived(partitions, store_dir)
+
+        # Push the new rounds through the derived data that was already computed
+        for record in imported:
+            if record.get("table") in NODES and record["session"] == "race":
+                set_input(
+                    record["table"],
+                    record["season"],
+                    record["round_no"],
+                    read_table(
+                        record["table"],
+                        season=record["season"],
+                        round_no=record["round_no"],
+                        session="race",
+                        store_dir=store_dir,
+                    ),
+                )
+
+        if imported:
+            _version += 1
+            _latest[:] = imported
+
+    if imported:
+        logger.info(f"Ingested {len(imported)} exports")
+        _notify_sessions()
+
+    return imported
+
+
+def scan_exports(folder: str = EXPORTS_DIR, store_dir: str = STORE_DIR) -> list[dict]:
+    """
+    Ingest whatever landed in the exports folder while nothing was watching it.
+
+    Args:
+        folder (str, optional): Exports folder. Defaults to `EXPORTS_DIR`.
+        store_dir (str, optional): Root folder of the store. Defaults to `STORE_DIR`.
+
+    Returns:
+        (list[dict]): Imported files, see `ingest_exports`.
+    """
+    if not os.path.isdir(folder):
+        return []
+
+    return ingest_exports(
+        [
+            os.path.join(root, name)
+            for root, _, names in os.walk(folder)
+            for name in names
+        ],
+        store_dir,
+    )
+
+
+def _notify_sessions() -> int:
+    # Rerun every open session, as Streamlit does when a source file changes, so pages
+    # pick up the new data without polling. Not available outside a running server.
+    try:
+        from streamlit.runtime import Runtime
+
+        if not Runtime.exists():
+            return 0
+        sessions = Runtime.instance()._session_mgr.list_active_sessions()
+        for info in sessions:
+            info.session.request_rerun(info.session._client_state)
+    except Exception as e:
+        logger.warning(f"Could not notify the open sessions: {e}")
+        return 0
+
+    return len(sessions)
+
+
+def _drain(store_dir: str) -> None:
+    global _timer
+    with _lock:
+        paths: list[str] = list(_pending)
+        _pending.clear()
+        _timer = None
+
+    ingest_exports(paths, store_dir)
+
+
+class _ExportHandler(FileSystemEventHandler):
+    # Collects the files touched by a burst of events and ingests them once it settles
+    def __init__(self, store_dir: str, debounce: float) -> None:
+        self.store_dir: str = store_dir
+        self.debounce: float = debounce
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        global _timer
+        if event.is_directory or event.event_type not in [
+            "created",
+            "modified",
+            "moved",
+            "closed",
+        ]:
+            return
+
+        path: str = os.fsdecode(getattr(event, "dest_path", "") or event.src_path)
+        if not _is_export(path):
+            return
+
+        with _lock:
+            _pending[path] = time.monotonic()
+            if _timer is not None:
+                _timer.cancel()
+            _timer = threading.Timer(self.debounce, _drain, args=(self.store_dir,))
+            _timer.daemon = True
+            _timer.start()
+
+
+def start_watcher(
+    folder: str = EXPORTS_DIR,
+    store_dir: str = STORE_DIR,
+    debounce: float = DEBOUNCE_SECONDS,
+) -> bool:
+    """
+    Start the background watcher of the exports folder, once per process. Files that
+    arrived while it was stopped are ingested first.
+
+    Args:
+        folder (str, optional): Folder to watch, recursively. Defaults to `EXPORTS_DIR`.
+        store_dir (str, optional): Root folder of the store. Defaults to `STORE_DIR`.
+        debounce (float, optional): Quiet time (s) before ingesting. Defaults to `DEBOUNCE_SECONDS`.
+
+    Returns:
+        (bool): Whether this call started the watcher.
+    """
+    global _observer, _store_dir
+    with _lock:
+        if _observer is not None:
+            return False
+
+        _store_dir = store_dir
+        os.makedirs(folder, exist_ok=True)
+        _observer = Observer()
+        _observer.schedule(_ExportHandler(store_dir, debounce), folder, recursive=True)
+        _observer.daemon = True
+        _observer.start()
+
+    logger.info(f"Watching {folder} for exports")
+    threading.Thread(
+        target=scan_exports, args=(folder, store_dir), name="exports-scan", daemon=True
+    ).start()
+    return True
+
+
+def stop_watcher() -> None:
+    """
+    Stop the watcher. Files still in the debounce window are ingested first.
+    """
+    global _observer, _timer
+    with _lock:
+        observer, _observer = _observer, None
+        timer, _timer = _timer, None
+    if observer is None:
+        return
+
+    observer.stop()
+    observer.join()
+    if timer is not None:
+        timer.cancel()
+        _drain(_store_dir)
+
+
+def data_version() -> int:
+    """
+    Counter bumped every time the watcher imported new data.
+
+    Returns:
+        (int): Current version, 0 until something was imported.
+    """
+    return _version
+
+
+def latest_imports() -> list[dict]:
+    """
+    Files of the latest import.
+
+    Returns:
+        (list[dict]): See `ingest_exports`.
+    """
+    with _lock:
+        return list(_latest)